@@ -0,0 +1,57 @@
+"""agents and tasks tables
+
+Replaces the CREATE TABLE IF NOT EXISTS statements that used to live in
+seed.py. Databases that were already initialised by the old seeder keep
+their tables; only missing tables are created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    existing = sa.inspect(op.get_bind()).get_table_names()
+
+    if "agents" not in existing:
+        op.create_table(
+            "agents",
+            sa.Column("id", sa.String(50), primary_key=True),
+            sa.Column("name", sa.String(100), nullable=False),
+            sa.Column("emoji", sa.String(10)),
+            sa.Column("role", sa.String(100)),
+            sa.Column("description", sa.Text()),
+            sa.Column("capabilities", JSONType),
+            sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        )
+
+    if "tasks" not in existing:
+        op.create_table(
+            "tasks",
+            sa.Column("task_id", sa.String(100), primary_key=True),
+            sa.Column("agent_id", sa.String(50), sa.ForeignKey("agents.id"), nullable=False),
+            sa.Column("action", sa.String(100), nullable=False),
+            sa.Column("status", sa.String(50), nullable=False, server_default="pending"),
+            sa.Column("payload", JSONType),
+            sa.Column("result", JSONType),
+            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column("completed_at", sa.DateTime()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    op.drop_table("agents")
@@ -0,0 +1,52 @@
+"""performance indexes on tasks
+
+On Postgres the indexes are built with CREATE INDEX CONCURRENTLY outside
+the migration transaction, so existing task tables stay writable while
+they build. If a concurrent build fails, Postgres leaves an INVALID index
+behind; drop it manually before re-running the migration.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+ACTIVE_WHERE = sa.text("status IN ('pending', 'in_progress', 'running')")
+
+INDEXES = [
+    ("ix_tasks_agent_id_created_at", ["agent_id", "created_at"], None),
+    ("ix_tasks_status_created_at", ["status", "created_at"], None),
+    ("ix_tasks_created_at", ["created_at"], None),
+    ("ix_tasks_active_agent_id", ["agent_id", "created_at"], ACTIVE_WHERE),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, columns, where in INDEXES:
+                op.create_index(name, "tasks", columns, postgresql_where=where,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, columns, where in INDEXES:
+            op.create_index(name, "tasks", columns, sqlite_where=where, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, _, _ in reversed(INDEXES):
+                op.drop_index(name, table_name="tasks", postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="tasks", if_exists=True)
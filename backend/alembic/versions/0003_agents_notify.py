@@ -0,0 +1,44 @@
+"""notify agent registry caches on agents changes
+
+Every statement touching the agents table sends NOTIFY agents_changed, so
+the in-process agent registry of every worker reloads on its next request.
+Postgres only; other databases rely on the registry TTL.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+CHANNEL = "agents_changed"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_agents_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{CHANNEL}', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS agents_changed ON agents")
+    op.execute("""
+        CREATE TRIGGER agents_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON agents
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_agents_changed()
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS agents_changed ON agents")
+    op.execute("DROP FUNCTION IF EXISTS notify_agents_changed()")
@@ -0,0 +1,45 @@
+"""notify ETag version counters on tasks changes
+
+Every statement touching the tasks table sends NOTIFY tasks_changed, so
+each worker bumps its task list version and stops answering 304 for
+data changed elsewhere (other workers, seeder, manual SQL).
+Postgres only.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+CHANNEL = "tasks_changed"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_tasks_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{CHANNEL}', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS tasks_changed ON tasks")
+    op.execute("""
+        CREATE TRIGGER tasks_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_tasks_changed()
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS tasks_changed ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS notify_tasks_changed()")
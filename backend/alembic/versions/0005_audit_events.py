@@ -0,0 +1,42 @@
+"""audit_events table
+
+Append-only trail of API mutations, filled in batches by the in-process
+audit writer. occurred_at gets a BRIN index on Postgres: rows arrive in
+time order, so a block-range index serves time-range scans at a fraction
+of a B-tree's size and write cost.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+IdType = sa.BigInteger().with_variant(sa.Integer(), "sqlite")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_events",
+        sa.Column("id", IdType, primary_key=True, autoincrement=True),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("action", sa.String(100), nullable=False),
+        sa.Column("resource_type", sa.String(50), nullable=False),
+        sa.Column("resource_id", sa.String(100)),
+        sa.Column("actor", sa.String(100)),
+        sa.Column("details", JSONType),
+    )
+    op.create_index("ix_audit_events_occurred_at", "audit_events", ["occurred_at"], postgresql_using="brin")
+    op.create_index("ix_audit_events_action_occurred_at", "audit_events", ["action", "occurred_at"])
+    op.create_index("ix_audit_events_resource", "audit_events", ["resource_type", "resource_id", "occurred_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("audit_events")
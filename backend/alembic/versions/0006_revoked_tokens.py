@@ -0,0 +1,54 @@
+"""revoked_tokens table
+
+Revocation list for JWT access tokens. Workers keep the active entries in
+memory; on Postgres every insert sends NOTIFY tokens_revoked with the jti
+as payload so all workers reject the token immediately, even when its
+claims are already in their verified-token cache.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+CHANNEL = "tokens_revoked"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(64), primary_key=True),
+        sa.Column("subject", sa.String(100)),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_tokens_revoked() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{CHANNEL}', NEW.jti);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tokens_revoked
+        AFTER INSERT ON revoked_tokens
+        FOR EACH ROW EXECUTE FUNCTION notify_tokens_revoked()
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS tokens_revoked ON revoked_tokens")
+        op.execute("DROP FUNCTION IF EXISTS notify_tokens_revoked()")
+    op.drop_table("revoked_tokens")
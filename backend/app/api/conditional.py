@@ -0,0 +1,42 @@
+"""
+NOVA v3 - Conditional Requests
+ETag / If-None-Match Helfer für die Leseendpunkte des Dashboards
+"""
+from typing import Dict
+
+from fastapi import Request, Response
+
+from app.services.versions import content_etag
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    # no-cache: Browser speichern die Antwort, fragen aber jedes Mal per If-None-Match nach
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+def content_response(request: Request, body: bytes, media_type: str = "application/json") -> Response:
+    """
+    200 or 304 for a rendered body, with an ETag derived from the body itself.
+
+    For data read from a replica or changed by other workers: the tag always
+    describes exactly what this response contains.
+    """
+    etag = content_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type=media_type, headers=etag_headers(etag))
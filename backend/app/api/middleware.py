@@ -0,0 +1,144 @@
+"""
+NOVA v3 - HTTP Middleware
+"""
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..services.admission import AdmissionController, Rejected, classify, is_stream
+from ..services.auth import InvalidToken, TokenService, is_public
+from ..services.request_metrics import RequestMetrics
+from .security import bearer_token
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and response size per route template.
+
+    The route template comes from scope["route"], which FastAPI's router sets on
+    the shared scope while dispatching, so /tasks/{task_id} is one series no
+    matter how many ids are requested.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        record = self.metrics.begin(scope["method"], scope["path"])
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.metrics.end(record, getattr(route, "path", None), status, size)
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI middleware holding a concurrency slot for the whole request.
+
+    Health checks, metrics, admin and PHOENIX routes are never limited, and
+    event streams do not hold a slot for their lifetime. Above the
+    adaptive limit, normal requests queue briefly and low-priority dashboard
+    polling is shed first; rejected requests get 503 with Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or is_stream(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        priority = classify(scope["method"], scope["path"])
+        try:
+            started = await self.controller.acquire(priority)
+        except Rejected as e:
+            await self._reject(send, e)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(priority, started)
+
+    async def _reject(self, send: Send, rejected: Rejected) -> None:
+        body = orjson.dumps({"detail": "Service overloaded, retry later", "reason": rejected.reason})
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(rejected.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class AuthenticationMiddleware:
+    """
+    Pure ASGI middleware verifying bearer JWTs before routing.
+
+    A request without a token costs one header scan; a token seen before is a
+    hash and a dict lookup in the verified-token cache. Verified claims go to
+    scope["state"]["principal"] (request.state.principal). Probes, metrics,
+    docs and /admin (own guard) are skipped; WebSockets authenticate in the
+    endpoint, since browsers can only pass the token as a query parameter.
+    """
+
+    def __init__(self, app: ASGIApp, tokens: TokenService):
+        self.app = app
+        self.tokens = tokens
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or is_public(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                token = bearer_token(value.decode("latin-1"))
+                break
+
+        if token is not None:
+            await self.tokens.ensure_revocations()
+            try:
+                scope.setdefault("state", {})["principal"] = self.tokens.verify(token)
+            except InvalidToken as e:
+                await self._reject(send, str(e))
+                return
+        elif self.tokens.required:
+            await self._reject(send, "Not authenticated")
+            return
+        await self.app(scope, receive, send)
+
+    async def _reject(self, send: Send, detail: str) -> None:
+        body = orjson.dumps({"detail": detail})
+        await send({
+            "type": "http.response.start",
+            "status": 401,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"www-authenticate", b"Bearer"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
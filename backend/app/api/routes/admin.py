@@ -0,0 +1,189 @@
+"""
+NOVA v3 - Admin Endpoints
+Laufzeit-Diagnose für Betrieb und Tuning
+"""
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Literal, Optional
+from app.api.security import require_admin
+from app.database import get_read_db, replica_router
+from app.repositories import AuditRepository
+from app.services.audit import audit_log
+from app.services.auth import InvalidToken, token_service
+from app.services.admission import admission_controller
+from app.services.db_pool import pool_monitor
+from app.services.guardian import guardian
+from app.services.live import live_broadcaster
+from app.services.profiler import ProfilerBusy, profiler_service
+from app.services.request_metrics import request_metrics
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+class TokenRequest(BaseModel):
+    """Neues Access-Token für einen Benutzer oder Dienst"""
+    subject: str = Field(..., min_length=1, max_length=100)
+    scopes: List[str] = []
+    expires_minutes: Optional[int] = Field(None, ge=1, le=60 * 24 * 30)
+
+
+class RevokeRequest(BaseModel):
+    token: str
+
+
+def _client(request: Request) -> Optional[str]:
+    return request.client.host if request.client else None
+
+
+@router.post("/tokens")
+async def issue_token(payload: TokenRequest, request: Request) -> Dict:
+    """Stellt ein JWT aus (Standard-Laufzeit ACCESS_TOKEN_EXPIRE_MINUTES)"""
+    token, principal = token_service.issue(payload.subject, payload.scopes, payload.expires_minutes)
+    await audit_log.record("token.issued", "token", principal.token_id, _client(request),
+                           {"subject": principal.subject, "scopes": sorted(principal.scopes)})
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "jti": principal.token_id,
+        "expires_at": datetime.utcfromtimestamp(principal.expires_at).isoformat(),
+    }
+
+
+@router.post("/tokens/revoke")
+async def revoke_token(payload: RevokeRequest, request: Request) -> Dict:
+    """Widerruft ein Token in allen Workern"""
+    await token_service.ensure_revocations()
+    try:
+        principal = token_service.verify(payload.token)
+    except InvalidToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await token_service.revoke(principal)
+    await audit_log.record("token.revoked", "token", principal.token_id, _client(request),
+                           {"subject": principal.subject})
+    return {"jti": principal.token_id, "revoked": True}
+
+
+@router.get("/auth")
+async def get_auth_stats() -> Dict:
+    """Trefferquote des Token-Caches und Größe der Widerrufsliste"""
+    return token_service.stats()
+
+
+@router.get("/audit")
+async def list_audit_events(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    action: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    resource_id: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+) -> Dict:
+    """
+    Audit-Events im Zeitraum [since, until), neueste zuerst (Standard: letzte 24 Stunden).
+
+    Nächste Seite: until und before_id aus next_cursor übernehmen.
+    """
+    until = until or datetime.utcnow() + timedelta(seconds=1)
+    since = since or until - timedelta(days=1)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="'since' must be before 'until'")
+
+    events = await AuditRepository(db).list_events(
+        since, until, action=action, resource_type=resource_type, resource_id=resource_id,
+        before_id=before_id, limit=limit,
+    )
+    items = [
+        {
+            "id": event.id,
+            "occurred_at": event.occurred_at.isoformat(),
+            "action": event.action,
+            "resource_type": event.resource_type,
+            "resource_id": event.resource_id,
+            "actor": event.actor,
+            "details": event.details,
+        }
+        for event in events
+    ]
+    next_cursor = None
+    if len(events) == limit:
+        next_cursor = {"until": items[-1]["occurred_at"], "before_id": items[-1]["id"]}
+    return {"since": since.isoformat(), "until": until.isoformat(), "events": items, "next_cursor": next_cursor}
+
+
+@router.get("/audit/stats")
+async def get_audit_stats() -> Dict:
+    """Queue-Füllstand, geschriebene/verworfene Events und Batch-Größen des Audit-Writers"""
+    return audit_log.stats()
+
+
+@router.get("/db/pool")
+async def get_pool_metrics() -> Dict:
+    """Connection-Pool-Metriken (Checkout-Wartezeit, Auslastung, Verbindungsalter)"""
+    return pool_monitor.snapshot()
+
+
+@router.get("/db/replicas")
+async def get_replica_status() -> List[Dict]:
+    """Status der Read-Replicas"""
+    return replica_router.status()
+
+
+@router.get("/admission")
+async def get_admission_status() -> Dict:
+    """Adaptives Limit, belegte Slots, Warteschlangen und abgewiesene Requests pro Klasse"""
+    return admission_controller.status()
+
+
+@router.get("/guardian/shared")
+async def get_guardian_shared_state() -> Dict:
+    """Status des geteilten Guardian-Segments (Leader, Sequenz, Alter des letzten Samples)"""
+    if guardian.shared is None:
+        return {"enabled": False}
+    return {"enabled": True, **guardian.shared.status()}
+
+
+@router.get("/live")
+async def get_live_channel_status() -> Dict:
+    """Verbundene Live-Clients, Sequenz pro Topic und wegen Rückstau getrennte Clients"""
+    return live_broadcaster.status()
+
+
+@router.get("/requests")
+async def get_request_metrics() -> Dict:
+    """Latenz (p50/p95/p99), Statuscodes und Antwortgrößen pro Route"""
+    return request_metrics.snapshot()
+
+
+@router.get("/requests/slow")
+async def get_slow_requests(limit: int = Query(50, ge=0, le=1000)) -> List[Dict]:
+    """Langsamste Requests zuletzt, mit Stack-Snapshot aus dem Sampler"""
+    return request_metrics.slow_requests(limit)
+
+
+@router.post("/profile")
+async def run_profiler(
+    seconds: float = Query(10.0, gt=0, le=60),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    memory: bool = False,
+    memory_top: int = Query(25, ge=1, le=200),
+    format: Literal["json", "collapsed"] = "json",
+):
+    """
+    Sampling-Profiler über alle Threads und asyncio-Tasks für `seconds` Sekunden.
+
+    format=collapsed liefert direkt Text für flamegraph.pl/speedscope;
+    memory=true ergänzt die größten Allokationen aus tracemalloc.
+    """
+    try:
+        result = await profiler_service.profile(seconds, interval_ms=interval_ms, memory=memory, memory_top=memory_top)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "collapsed":
+        return PlainTextResponse("\n".join(result["collapsed"]) + "\n")
+    return result
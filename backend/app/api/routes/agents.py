@@ -2,111 +2,85 @@
 NOVA v3 - Agents API Endpoints
 4-Agenten-Architektur: CORE, FORGE, PHOENIX, GUARDIAN
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from typing import List, Dict
-from ...config import get_settings
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..conditional import etag_headers, etag_matches, not_modified
+from ...database import get_async_db
+from ...repositories import AgentRepository
+from ...services.agent_registry import AgentSnapshot, agent_registry
 
 router = APIRouter()
-settings = get_settings()
-
-# Agent definitions
-AGENTS = {
-    "core": {
-        "id": "core",
-        "name": "CORE",
-        "emoji": "🧠",
-        "role": "Orchestrator",
-        "description": "Der Kopf - orchestriert alle anderen Agenten",
-        "enabled": settings.AGENT_CORE_ENABLED,
-        "capabilities": ["routing", "orchestration", "decision_making"]
-    },
-    "forge": {
-        "id": "forge",
-        "name": "FORGE",
-        "emoji": "⚒️",
-        "role": "Development + Deployment",
-        "description": "Entwicklung und Deployment von Services",
-        "enabled": settings.AGENT_FORGE_ENABLED,
-        "capabilities": ["coding", "deployment", "docker", "ansible"]
-    },
-    "phoenix": {
-        "id": "phoenix",
-        "name": "PHOENIX",
-        "emoji": "🐦‍🔥",
-        "role": "DevOps + Self-Healing",
-        "description": "DevOps-Automatisierung und Selbstheilung",
-        "enabled": settings.AGENT_PHOENIX_ENABLED,
-        "capabilities": ["devops", "backup", "restore", "self_healing"]
-    },
-    "guardian": {
-        "id": "guardian",
-        "name": "GUARDIAN",
-        "emoji": "🛡️",
-        "role": "Monitoring + Security",
-        "description": "System-Monitoring und Sicherheit",
-        "enabled": settings.AGENT_GUARDIAN_ENABLED,
-        "capabilities": ["monitoring", "security", "resource_management"]
-    }
-}
+
+
+class AgentUpdate(BaseModel):
+    """Agent update model"""
+    enabled: bool
+
+
+async def get_agents(db: AsyncSession = Depends(get_async_db)) -> AgentSnapshot:
+    """Current registry snapshot; only touches the database when it is stale"""
+    return await agent_registry.get_snapshot(db)
+
+
+def _get_enabled_or_raise(agents: AgentSnapshot, agent_id: str):
+    agent = agents.get(agent_id)
+    if agent is None:
+        raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
+    if not agent["enabled"]:
+        raise HTTPException(status_code=503, detail=f"Agent '{agent_id}' is disabled")
+    return agent
 
 
 @router.get("/agents", response_model=List[Dict])
-async def list_agents():
+async def list_agents(request: Request, agents: AgentSnapshot = Depends(get_agents)):
     """
     List all available agents (legacy API returns 'name' as id)
     """
-    results = []
-    for a in AGENTS.values():
-        # legacy-friendly: 'name' contains lowercase id, keep 'display_name' for original label
-        results.append({
-            "id": a["id"],
-            "name": a["id"],
-            "display_name": a["name"],
-            "emoji": a["emoji"],
-            "role": a["role"],
-            "description": a["description"],
-            "enabled": a["enabled"],
-            "capabilities": a["capabilities"],
-        })
-    return results
+    if etag_matches(request, agents.list_etag):
+        return not_modified(agents.list_etag)
+    return Response(content=agents.list_body, media_type="application/json", headers=etag_headers(agents.list_etag))
 
 
 @router.get("/agents/{agent_id}", response_model=Dict)
-async def get_agent(agent_id: str):
+async def get_agent(agent_id: str, request: Request, agents: AgentSnapshot = Depends(get_agents)):
     """
     Get specific agent details (legacy: return 'name' as id)
     """
-    if agent_id not in AGENTS:
+    _get_enabled_or_raise(agents, agent_id)
+    etag = agents.detail_etags[agent_id]
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=agents.detail_bodies[agent_id], media_type="application/json",
+                    headers=etag_headers(etag))
+
+
+@router.patch("/agents/{agent_id}", response_model=Dict)
+async def update_agent(agent_id: str, update: AgentUpdate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Enable or disable an agent without a restart
+    """
+    repo = AgentRepository(db)
+    agent = await repo.get(agent_id)
+    if agent is None:
         raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
 
-    agent = AGENTS[agent_id]
-    if not agent["enabled"]:
-        raise HTTPException(status_code=503, detail=f"Agent '{agent_id}' is disabled")
+    agent.enabled = update.enabled
+    await repo.commit()
+    # Other workers are notified by the agents_changed trigger
+    agent_registry.invalidate()
 
-    return {
-        "id": agent["id"],
-        "name": agent["id"],
-        "display_name": agent["name"],
-        "emoji": agent["emoji"],
-        "role": agent["role"],
-        "description": agent["description"],
-        "enabled": agent["enabled"],
-        "status": "active" if agent["enabled"] else "inactive",
-        "capabilities": agent["capabilities"],
-    }
+    agents = await agent_registry.get_snapshot(db)
+    return Response(content=agents.detail_bodies[agent_id], media_type="application/json")
 
 
 @router.post("/agents/{agent_id}/execute")
-async def execute_agent_task(agent_id: str, task: Dict):
+async def execute_agent_task(agent_id: str, task: Dict, agents: AgentSnapshot = Depends(get_agents)):
     """
     Execute a task with specific agent
     """
-    if agent_id not in AGENTS:
-        raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
-
-    agent = AGENTS[agent_id]
-    if not agent["enabled"]:
-        raise HTTPException(status_code=503, detail=f"Agent '{agent_id}' is disabled")
+    agent = _get_enabled_or_raise(agents, agent_id)
 
     # TODO: Implement actual task execution logic
     return {
@@ -119,14 +93,14 @@ async def execute_agent_task(agent_id: str, task: Dict):
 
 
 @router.get("/agents/{agent_id}/status")
-async def get_agent_status(agent_id: str):
+async def get_agent_status(agent_id: str, agents: AgentSnapshot = Depends(get_agents)):
     """
     Get agent status and metrics
     """
-    if agent_id not in AGENTS:
+    agent = agents.get(agent_id)
+    if agent is None:
         raise HTTPException(status_code=404, detail=f"Agent '{agent_id}' not found")
 
-    agent = AGENTS[agent_id]
     # normalize status to active/inactive/error for legacy tests
     status = "active" if agent["enabled"] else "inactive"
     return {
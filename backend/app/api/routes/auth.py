@@ -0,0 +1,31 @@
+"""
+NOVA v3 - Auth Endpoints
+Token introspection and logout for the bearer JWTs issued via /admin/tokens
+"""
+from datetime import datetime
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+
+from ..security import require_principal
+from ...services.auth import Principal, token_service
+
+router = APIRouter()
+
+
+@router.get("/auth/me")
+async def whoami(principal: Principal = Depends(require_principal)) -> Dict:
+    """Subject, scopes and expiry of the presented token"""
+    return {
+        "subject": principal.subject,
+        "scopes": sorted(principal.scopes),
+        "jti": principal.token_id,
+        "expires_at": datetime.utcfromtimestamp(principal.expires_at).isoformat(),
+    }
+
+
+@router.post("/auth/logout")
+async def logout(principal: Principal = Depends(require_principal)) -> Dict:
+    """Revoke the presented token"""
+    await token_service.revoke(principal)
+    return {"jti": principal.token_id, "revoked": True}
@@ -0,0 +1,90 @@
+"""
+NOVA v3 - CORE Orchestrator Endpoints
+Capability-basiertes Routing von Tasks auf Agenten
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...database import get_async_db
+from ...models import Task
+from ...repositories import TaskRepository
+from ...services.agent_load import agent_load
+from ...services.audit import audit_log
+from ...services.agent_registry import AgentSnapshot
+from ...services.core_router import NoAgentAvailable, core_router
+from ...services.versions import resource_versions
+from ..security import request_actor
+from .agents import get_agents
+
+router = APIRouter()
+
+
+class RouteRequest(BaseModel):
+    """Task to route by required capabilities"""
+    capabilities: List[str] = Field(..., min_length=1)
+    action: Optional[str] = None
+    parameters: Dict = {}
+    dispatch: bool = False
+
+
+@router.post("/core/route")
+async def route_task(
+    request: RouteRequest,
+    agents: AgentSnapshot = Depends(get_agents),
+    db: AsyncSession = Depends(get_async_db),
+    actor: Optional[str] = Depends(request_actor),
+):
+    """
+    Pick the best enabled agent for a task; with dispatch=true the task is created for it
+    """
+    if request.dispatch and not request.action:
+        raise HTTPException(status_code=400, detail="'action' is required to dispatch a task")
+    await agent_load.ensure_fresh(db)
+    try:
+        decision = core_router.route(agents, request.capabilities, agent_load)
+    except NoAgentAvailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    agent_id = decision["agent_id"]
+    response = {
+        "decision_id": decision["decision_id"],
+        "agent_id": agent_id,
+        "agent_name": agents.get(agent_id)["name"],
+        "capabilities": decision["capabilities"],
+        "candidates": decision["candidates"],
+        "task_id": None,
+    }
+
+    if request.dispatch:
+        now = datetime.utcnow()
+        repo = TaskRepository(db)
+        task = await repo.add(Task(
+            task_id=str(uuid4()),
+            agent_id=agent_id,
+            action=request.action,
+            payload=request.parameters,
+            status="pending",
+            created_at=now,
+            updated_at=now,
+        ))
+        await repo.commit()
+        resource_versions.bump("tasks")
+        agent_load.task_queued(agent_id)
+        await audit_log.record("task.created", "task", task.task_id, actor,
+                               {"agent_id": agent_id, "action": task.action, "decision_id": decision["decision_id"]})
+        response["task_id"] = task.task_id
+
+    return response
+
+
+@router.get("/core/route/decisions")
+async def get_routing_decisions(limit: int = Query(50, ge=0, le=1000)):
+    """
+    Recent routing decisions and counters for tuning
+    """
+    return {**core_router.stats(limit), "load": agent_load.snapshot()}
@@ -2,18 +2,43 @@
 🛡️ GUARDIAN API Routes
 Endpoints für Monitoring, Predictions und Security-Scans
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict
-from app.services.guardian import guardian
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, Optional
+from app.api.security import request_actor
+from app.services.audit import audit_log
+from app.services.guardian import MetricsUnavailable, guardian
 
 router = APIRouter(prefix="/guardian", tags=["guardian"])
 
 
+async def _metrics_call(func, *args):
+    """Run a metrics read off the event loop; the very first sample may still block for a second."""
+    try:
+        return await asyncio.to_thread(func, *args)
+    except MetricsUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+
 @router.get("/metrics")
 async def get_system_metrics() -> Dict:
     """Aktuelle System-Metriken abrufen"""
     try:
-        return guardian.get_system_metrics()
+        return await _metrics_call(guardian.get_system_metrics)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/containers")
+async def get_container_metrics() -> Dict:
+    """Ressourcen-Verbrauch pro Container (cgroup v2)"""
+    try:
+        containers = await _metrics_call(guardian.get_container_metrics)
+        return {"containers": containers, "count": len(containers)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -35,7 +60,7 @@ async def predict_resource_usage(minutes_ahead: int = 5) -> Dict:
         if minutes_ahead < 1 or minutes_ahead > 60:
             raise HTTPException(status_code=400, detail="minutes_ahead must be between 1 and 60")
 
-        return guardian.predict_resource_usage(minutes_ahead)
+        return await _metrics_call(guardian.predict_resource_usage, minutes_ahead)
     except HTTPException:
         raise
     except Exception as e:
@@ -43,39 +68,46 @@ async def predict_resource_usage(minutes_ahead: int = 5) -> Dict:
 
 
 @router.get("/security/cve")
-async def scan_cve_vulnerabilities() -> Dict:
+async def scan_cve_vulnerabilities(actor: Optional[str] = Depends(request_actor)) -> Dict:
     """CVE-Schwachstellen-Scan durchführen"""
     try:
-        return guardian.scan_cve_vulnerabilities()
+        result = guardian.scan_cve_vulnerabilities()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    await audit_log.record("scan.cve", "scan", None, actor, result["summary"])
+    return result
 
 
 @router.get("/security/docker")
-async def check_docker_security() -> Dict:
+async def check_docker_security(actor: Optional[str] = Depends(request_actor)) -> Dict:
     """Docker-Sicherheitsprüfung durchführen"""
     try:
-        return guardian.check_docker_security()
+        result = guardian.check_docker_security()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    await audit_log.record("scan.docker", "scan", None, actor,
+                           {"containers_checked": result["containers_checked"], "issues": len(result["issues"])})
+    return result
 
 
 @router.post("/scan")
-async def run_security_scan() -> Dict:
+async def run_security_scan(actor: Optional[str] = Depends(request_actor)) -> Dict:
     """Run a combined security scan (legacy /scan endpoint)"""
     try:
         result = guardian.scan_cve_vulnerabilities()
-        return {"scan_id": "scan-1", "status": "completed", "result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    await audit_log.record("scan.cve", "scan", "scan-1", actor, result["summary"])
+    return {"scan_id": "scan-1", "status": "completed", "result": result}
 
 
 @router.get("/alerts")
 async def get_alerts() -> list:
     """Return current alerts (legacy endpoint)"""
     try:
-        # For now return empty list of alerts
-        return []
+        return await _metrics_call(guardian.get_alerts)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -84,6 +116,8 @@ async def get_alerts() -> list:
 async def health_check() -> Dict:
     """Umfassender System-Health-Check"""
     try:
-        return guardian.health_check()
+        return await _metrics_call(guardian.health_check)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,12 +1,13 @@
 """
 NOVA v3 - Health Check Endpoints
 """
+import asyncio
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from ...database import get_db
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...database import get_async_db
 from ...config import get_settings
-import psutil
+from ...services.health import health_service
 from datetime import datetime
 
 router = APIRouter()
@@ -14,51 +15,51 @@ settings = get_settings()
 
 
 @router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """
     Health check endpoint
-    Returns system status and database connectivity
+    Returns system status and dependency connectivity (checked concurrently, cached briefly)
     """
-    try:
-        # Test database connection
-        db.execute(text("SELECT 1"))  # <--- Hier ändern!
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
-
-    # Get system metrics
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
+    checks = await health_service.run_checks(db)
+    db_check = checks["database"]
+    db_status = "healthy" if db_check["status"] == "healthy" else f"unhealthy: {db_check.get('error')}"
+    all_healthy = all(c["status"] == "healthy" for c in checks.values())
 
     return {
-        "status": "healthy" if db_status == "healthy" else "degraded",
+        "status": "healthy" if all_healthy else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
         "version": settings.APP_VERSION,
         "database": db_status,
-        "system": {
-            "cpu_percent": cpu_percent,
-            "memory_percent": memory.percent,
-            "disk_percent": disk.percent,
-        },
+        "system": health_service.system_metrics(),
+        "checks": checks,
         # Backwards-compatible services block expected by tests
-        "services": {
-            "database": "healthy" if db_status == "healthy" else "unhealthy",
-        }
+        "services": {name: check["status"] for name, check in checks.items()},
     }
 
 
 @router.get("/ready")
-async def readiness_check():
+async def readiness_check(db: AsyncSession = Depends(get_async_db)):
     """
     Readiness check for Kubernetes/Docker
+    Ready once the database answers; optional dependencies do not block readiness
     """
-    return {"ready": True}
+    checks = await health_service.run_checks(db)
+    ready = checks["database"]["status"] == "healthy"
+    body = {"ready": ready, "checks": {name: check["status"] for name, check in checks.items()}}
+    return body if ready else JSONResponse(status_code=503, content=body)
 
 
 @router.get("/live")
 async def liveness_check():
     """
     Liveness check for Kubernetes/Docker
+    Reports uptime and how long the event loop took to schedule this handler again
     """
-    return {"alive": True}
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.sleep(0)
+    return {
+        "alive": True,
+        "uptime_seconds": round(health_service.uptime(), 1),
+        "event_loop_lag_ms": round((loop.time() - started) * 1000, 3),
+    }
@@ -0,0 +1,102 @@
+"""
+NOVA v3 - Live Channel
+WebSocket push of Guardian metrics, alerts, task and agent status
+"""
+import asyncio
+from typing import List, Optional
+
+import orjson
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from ..security import bearer_token
+from ...services.auth import InvalidToken, token_service
+from ...services.live import LiveClient, live_broadcaster
+
+router = APIRouter()
+
+# Close code for clients dropped because they could not keep up
+CLOSE_TRY_AGAIN_LATER = 1013
+# Close code for a missing or invalid token
+CLOSE_POLICY_VIOLATION = 1008
+
+
+async def _send_frames(websocket: WebSocket, client: LiveClient) -> None:
+    while True:
+        frame = await client.next_frame()
+        if frame is None:
+            await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason="Client too slow")
+            return
+        await websocket.send_text(frame)
+
+
+def _error(client: LiveClient, detail: str) -> None:
+    client.offer(orjson.dumps({"type": "error", "detail": detail}).decode())
+
+
+def _subscribe(client: LiveClient, topics: List[str]) -> None:
+    unknown = live_broadcaster.subscribe(client, topics)
+    if unknown:
+        _error(client, f"Unknown topics: {unknown}; available: {list(live_broadcaster.topics)}")
+
+
+async def _receive_commands(websocket: WebSocket, client: LiveClient) -> None:
+    while True:
+        try:
+            message = orjson.loads(await websocket.receive_text())
+        except orjson.JSONDecodeError:
+            _error(client, "Invalid JSON")
+            continue
+        topics = message.get("topics") if isinstance(message, dict) else None
+        if not isinstance(topics, list) or not all(isinstance(topic, str) for topic in topics):
+            _error(client, 'Expected {"action": "subscribe" | "unsubscribe", "topics": [...]}')
+        elif message.get("action") == "subscribe":
+            _subscribe(client, topics)
+        elif message.get("action") == "unsubscribe":
+            live_broadcaster.unsubscribe(client, topics)
+        else:
+            _error(client, f"Unknown action: {message.get('action')}")
+
+
+async def _authorized(websocket: WebSocket, token: Optional[str]) -> bool:
+    token = token or bearer_token(websocket.headers.get("authorization"))
+    if token is None:
+        return not token_service.required
+    await token_service.ensure_revocations()
+    try:
+        token_service.verify(token)
+    except InvalidToken:
+        return False
+    return True
+
+
+@router.websocket("/ws/live")
+async def live_channel(websocket: WebSocket, topics: str = "", token: Optional[str] = None):
+    """
+    Live dashboard updates.
+
+    Subscribe with ?topics=guardian,alerts,tasks,agents or by sending
+    {"action": "subscribe", "topics": [...]}. Each topic starts with a "full"
+    frame; later "delta" frames carry a JSON merge patch (RFC 7386) against the
+    previous state. Browsers cannot set headers on WebSockets, so the bearer
+    token may also be passed as ?token=.
+    """
+    if not await _authorized(websocket, token):
+        await websocket.close(code=CLOSE_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    client = live_broadcaster.connect()
+    _subscribe(client, [topic for topic in topics.split(",") if topic])
+
+    tasks = [
+        asyncio.create_task(_send_frames(websocket, client)),
+        asyncio.create_task(_receive_commands(websocket, client)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not isinstance(task.exception(), (WebSocketDisconnect, type(None))):
+                raise task.exception()
+    finally:
+        live_broadcaster.disconnect(client)
+        for task in tasks:
+            task.cancel()
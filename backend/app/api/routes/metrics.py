@@ -0,0 +1,15 @@
+"""
+NOVA v3 - Prometheus Metrics Endpoint
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services.request_metrics import request_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Request metrics in Prometheus text format (scraped by monitoring/prometheus.yml)"""
+    return PlainTextResponse(request_metrics.prometheus(), media_type="text/plain; version=0.0.4")
@@ -1,17 +1,26 @@
 """
 NOVA v3 - Tasks API Endpoints
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from uuid import uuid4
+import orjson
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..conditional import content_response
+from ..security import request_actor
+from ...database import get_async_db, get_read_db
+from ...models import ACTIVE_STATUSES, Task
+from ...repositories import TaskRepository
+from ...services.agent_load import agent_load
+from ...services.audit import audit_log
+from ...services.versions import resource_versions
 
 router = APIRouter()
 
-# In-memory task storage (TODO: Replace with database)
-TASKS = {}
-
 
 class TaskCreate(BaseModel):
     """Task creation model"""
@@ -32,8 +41,55 @@ class TaskResponse(BaseModel):
     result: Optional[Dict] = None
 
 
+def _task_response(task: Task) -> Dict:
+    return {
+        "task_id": task.task_id,
+        "agent_id": task.agent_id,
+        "action": task.action,
+        "parameters": task.payload or {},
+        "status": task.status,
+        "created_at": task.created_at.isoformat(),
+        "updated_at": task.updated_at.isoformat(),
+        "result": task.result,
+    }
+
+
+def _legacy_response(task: Task) -> Dict:
+    """Legacy response shape expected by tests (id/title/agent)"""
+    return {
+        "id": task.task_id,
+        "title": task.action,
+        "agent": task.agent_id,
+        "parameters": task.payload or {},
+        "status": task.status,
+        "created_at": task.created_at.isoformat(),
+        "updated_at": task.updated_at.isoformat(),
+        "result": task.result,
+    }
+
+
+def _track_finished(task: Task, previous_status: str) -> None:
+    """Report a task leaving the queue to the CORE load tracker"""
+    if previous_status in ACTIVE_STATUSES and task.status not in ACTIVE_STATUSES:
+        duration = None
+        if task.status == "completed" and task.completed_at is not None:
+            duration = (task.completed_at - task.created_at).total_seconds()
+        agent_load.task_finished(task.agent_id, duration)
+
+
+async def _get_or_404(repo: TaskRepository, task_id: str) -> Task:
+    task = await repo.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+    return task
+
+
 @router.post("/tasks")
-async def create_task(task: dict):
+async def create_task(
+    task: dict,
+    db: AsyncSession = Depends(get_async_db),
+    actor: Optional[str] = Depends(request_actor),
+):
     """
     Create a new task for an agent
     Supports legacy payloads (title/agent/description) and new schema (agent_id/action/parameters)
@@ -54,119 +110,129 @@ async def create_task(task: dict):
     if "description" in task:
         parameters["description"] = task.get("description")
 
-    task_id = str(uuid4())
-    now = datetime.utcnow().isoformat()
-
-    task_data = {
-        "task_id": task_id,
-        "agent_id": agent_id,
-        "action": action,
-        "parameters": parameters,
-        "status": "pending",
-        "created_at": now,
-        "updated_at": now,
-        "result": None
-    }
-
-    TASKS[task_id] = task_data
-    # Return legacy response shape expected by tests
-    return {
-        "id": task_id,
-        "title": action,
-        "agent": agent_id,
-        "parameters": parameters,
-        "status": "pending",
-        "created_at": now,
-        "updated_at": now,
-        "result": None,
-    }
+    now = datetime.utcnow()
+    repo = TaskRepository(db)
+    try:
+        created = await repo.add(Task(
+            task_id=str(uuid4()),
+            agent_id=agent_id,
+            action=action,
+            payload=parameters,
+            status="pending",
+            created_at=now,
+            updated_at=now,
+        ))
+        await repo.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Unknown agent '{agent_id}' or missing action")
+
+    resource_versions.bump("tasks")
+    agent_load.task_queued(created.agent_id)
+    await audit_log.record("task.created", "task", created.task_id, actor,
+                           {"agent_id": created.agent_id, "action": created.action})
+    return _legacy_response(created)
 
 
 @router.get("/tasks", response_model=List[TaskResponse])
-async def list_tasks(agent_id: Optional[str] = None, status: Optional[str] = None):
+async def list_tasks(
+    request: Request,
+    agent_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
     """
-    List all tasks with optional filters
+    List tasks (newest first) with optional filters
     """
-    tasks = list(TASKS.values())
-
-    if agent_id:
-        tasks = [t for t in tasks if t["agent_id"] == agent_id]
-
-    if status:
-        tasks = [t for t in tasks if t["status"] == status]
-
-    return [TaskResponse(**t) for t in tasks]
+    # ETag from the body: reads may hit a lagging replica, and writes from
+    # other workers only reach this process through LISTEN/NOTIFY (if at all)
+    tasks = await TaskRepository(db).list_tasks(agent_id=agent_id, status=status, limit=limit, offset=offset)
+    # Rows are already in TaskResponse shape; skip response_model re-validation
+    return content_response(request, orjson.dumps([_task_response(t) for t in tasks]))
 
 
 @router.get("/tasks/{task_id}")
-async def get_task(task_id: str):
+async def get_task(task_id: str, request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Get specific task details (legacy response shape)
     """
-    if task_id not in TASKS:
-        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
-    t = TASKS[task_id]
-    return {
-        "id": task_id,
-        "title": t["action"],
-        "agent": t["agent_id"],
-        "parameters": t["parameters"],
-        "status": t["status"],
-        "created_at": t["created_at"],
-        "updated_at": t["updated_at"],
-        "result": t.get("result"),
-    }
+    task = await _get_or_404(TaskRepository(db), task_id)
+    return content_response(request, orjson.dumps(_legacy_response(task)))
 
 
 @router.delete("/tasks/{task_id}")
-async def delete_task(task_id: str):
+async def delete_task(
+    task_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    actor: Optional[str] = Depends(request_actor),
+):
     """
     Delete a task
     """
-    if task_id not in TASKS:
+    repo = TaskRepository(db)
+    task = await _get_or_404(repo, task_id)
+    agent_id, status = task.agent_id, task.status
+    if not await repo.delete(Task.task_id == task_id):
         raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
 
-    del TASKS[task_id]
+    await repo.commit()
+    resource_versions.bump("tasks")
+    if status in ACTIVE_STATUSES:
+        # Deleted while queued or running: release the agent's load like a cancel
+        agent_load.task_finished(agent_id)
+    await audit_log.record("task.deleted", "task", task_id, actor)
     return {"message": f"Task '{task_id}' deleted"}
 
 
 @router.patch("/tasks/{task_id}")
-async def update_task(task_id: str, payload: dict):
+async def update_task(
+    task_id: str,
+    payload: dict,
+    db: AsyncSession = Depends(get_async_db),
+    actor: Optional[str] = Depends(request_actor),
+):
     """Update a task (e.g., status) - legacy support"""
-    if task_id not in TASKS:
-        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
-    task = TASKS[task_id]
+    repo = TaskRepository(db)
+    task = await _get_or_404(repo, task_id)
     if "status" in payload:
-        task["status"] = payload["status"]
-        task["updated_at"] = datetime.utcnow().isoformat()
-    return {
-        "id": task_id,
-        "title": task["action"],
-        "agent": task["agent_id"],
-        "parameters": task["parameters"],
-        "status": task["status"],
-        "created_at": task["created_at"],
-        "updated_at": task["updated_at"],
-        "result": task.get("result"),
-    }
+        previous_status = task.status
+        task.status = payload["status"]
+        task.updated_at = datetime.utcnow()
+        if task.status in ["completed", "failed"]:
+            task.completed_at = task.updated_at
+        await repo.commit()
+        resource_versions.bump("tasks")
+        _track_finished(task, previous_status)
+        await audit_log.record("task.updated", "task", task_id, actor,
+                               {"from": previous_status, "to": task.status})
+    return _legacy_response(task)
 
 
 @router.post("/tasks/{task_id}/cancel")
-async def cancel_task(task_id: str):
+async def cancel_task(
+    task_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    actor: Optional[str] = Depends(request_actor),
+):
     """
     Cancel a running task
     """
-    if task_id not in TASKS:
-        raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
-
-    task = TASKS[task_id]
-    if task["status"] in ["completed", "failed", "cancelled"]:
+    repo = TaskRepository(db)
+    task = await _get_or_404(repo, task_id)
+    if task.status in ["completed", "failed", "cancelled"]:
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot cancel task with status '{task['status']}'"
+            detail=f"Cannot cancel task with status '{task.status}'"
         )
 
-    task["status"] = "cancelled"
-    task["updated_at"] = datetime.utcnow().isoformat()
+    previous_status = task.status
+    task.status = "cancelled"
+    task.updated_at = datetime.utcnow()
+    await repo.commit()
+    resource_versions.bump("tasks")
+    _track_finished(task, previous_status)
+    await audit_log.record("task.cancelled", "task", task_id, actor, {"from": previous_status})
 
-    return TaskResponse(**task)
+    return TaskResponse(**_task_response(task))
@@ -1,20 +1,30 @@
 """
 🧙 NOVA v3 - Wizard API Routes
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List, Optional
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+import orjson
 
-from app.services.wizard import wizard_service
+from app.api.conditional import etag_headers, etag_matches, not_modified
+from app.api.security import request_actor, require_admin
+from app.services.audit import audit_log
+from app.services.wizard import RunQueueFull, WorkflowRun, wizard_service
 
 
 router = APIRouter(prefix="/api/wizard", tags=["wizard"])
 
+# Kommentarzeile im SSE-Stream, damit Proxies eine ruhige Verbindung nicht schließen
+SSE_HEARTBEAT_SECONDS = 15.0
+
 
 class WorkflowCreate(BaseModel):
-    """Workflow creation model."""
+    """Workflow creation model (steps may declare `id` and `depends_on`)."""
     name: str
     steps: List[Dict]
+    max_concurrency: Optional[int] = Field(None, ge=1, le=64)
+    on_error: Literal["fail_fast", "continue"] = "fail_fast"
 
 
 class WorkflowExecute(BaseModel):
@@ -36,37 +46,109 @@ async def get_wizard_status():
 
 
 @router.get("/workflows")
-async def list_workflows():
+async def list_workflows(request: Request):
     """List all registered workflows."""
-    return await wizard_service.list_workflows()
+    etag = wizard_service.workflows_etag()
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=await wizard_service.list_workflows_body(), media_type="application/json",
+                    headers=etag_headers(etag))
 
 
 @router.post("/workflows")
-async def create_workflow(workflow: WorkflowCreate):
-    """Register a new workflow."""
+async def create_workflow(
+    workflow: WorkflowCreate,
+    actor: Optional[str] = Depends(request_actor),
+    authorization: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Register a new workflow.
+
+    Admin credentials are needed for workflows with command steps, and to
+    replace a registered workflow that has them.
+    """
+    if wizard_service.runs_commands(workflow.name) or any(step.get("type") == "command" for step in workflow.steps):
+        await require_admin(authorization, x_admin_token)
     try:
         result = await wizard_service.register_workflow(
             name=workflow.name,
-            steps=workflow.steps
+            steps=workflow.steps,
+            max_concurrency=workflow.max_concurrency,
+            on_error=workflow.on_error,
         )
-        return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await audit_log.record("workflow.registered", "workflow", workflow.name, actor,
+                           {"steps": len(workflow.steps)})
+    return result
 
 
-@router.post("/workflows/execute")
+@router.post("/workflows/execute", status_code=202)
 async def execute_workflow(execution: WorkflowExecute):
-    """Execute a registered workflow."""
+    """Queue a workflow run and return its id immediately."""
     try:
-        result = await wizard_service.execute_workflow(
-            name=execution.name,
-            context=execution.context
-        )
-        return result
+        run = wizard_service.submit_workflow(name=execution.name, context=execution.context)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    except RunQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    location = f"{router.prefix}/runs/{run.id}"
+    return ORJSONResponse(
+        {**run.snapshot(), "status_url": location, "events_url": f"{location}/events"},
+        status_code=202,
+        headers={"Location": location},
+    )
+
+
+def _get_run(run_id: str) -> WorkflowRun:
+    run = wizard_service.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run '{run_id}' not found")
+    return run
+
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: str):
+    """Status, progress and (once finished) the result of a workflow run."""
+    return ORJSONResponse(_get_run(run_id).snapshot())
+
+
+@router.post("/runs/{run_id}/cancel")
+async def cancel_run(run_id: str):
+    """Cancel a queued or running workflow run."""
+    run = _get_run(run_id)
+    if run.finished:
+        raise HTTPException(status_code=409, detail=f"Run already {run.status}")
+    wizard_service.cancel_run(run_id)
+    return ORJSONResponse(run.snapshot())
+
+
+async def _sse(run: WorkflowRun, last_seq: int) -> AsyncIterator[bytes]:
+    while True:
+        for event in run.events_after(last_seq):
+            last_seq = event["seq"]
+            yield b"id: %d\nevent: %s\ndata: %s\n\n" % (last_seq, event["event"].encode(), orjson.dumps(event["data"]))
+        if run.finished and last_seq >= run.seq:
+            return
+        if not await run.wait_for_event(last_seq, SSE_HEARTBEAT_SECONDS):
+            yield b": keepalive\n\n"
+
+
+@router.get("/runs/{run_id}/events")
+async def stream_run_events(run_id: str, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events for a run: run_started, step_started, output, step_finished, run_finished.
+
+    Reconnecting clients send Last-Event-ID and resume after that event; the stream ends after run_finished.
+    """
+    run = _get_run(run_id)
+    last_seq = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+    return StreamingResponse(
+        _sse(run, last_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/assist")
@@ -0,0 +1,85 @@
+"""
+NOVA v3 - API Security
+"""
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException, Request
+
+from ..config import get_settings
+from ..services.auth import InvalidToken, Principal, token_service
+
+settings = get_settings()
+
+ADMIN_SCOPE = "admin"
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+def _admin_disabled() -> HTTPException:
+    return HTTPException(status_code=503, detail="Admin endpoints disabled: ADMIN_TOKEN is not configured")
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if authorization and authorization[:7].lower() == "bearer ":
+        return authorization[7:]
+    return None
+
+
+async def verify_token(token: str) -> Principal:
+    """Verified claims of a JWT; repeated tokens are served from the token cache"""
+    await token_service.ensure_revocations()
+    try:
+        return token_service.verify(token)
+    except InvalidToken as e:
+        raise _unauthorized(str(e))
+
+
+def request_principal(request: Request) -> Optional[Principal]:
+    """Claims verified by AuthenticationMiddleware, None for anonymous requests"""
+    return getattr(request.state, "principal", None)
+
+
+def require_principal(request: Request) -> Principal:
+    """Valid bearer token, regardless of AUTH_REQUIRED"""
+    principal = request_principal(request)
+    if principal is None:
+        raise _unauthorized("Not authenticated")
+    return principal
+
+
+async def require_admin(
+    authorization: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+) -> None:
+    """
+    Guard for /admin endpoints.
+
+    Requests must send ADMIN_TOKEN as 'Authorization: Bearer <token>' or
+    'X-Admin-Token', or send a JWT with the 'admin' scope. Without ADMIN_TOKEN
+    only admin JWTs are accepted; everything else gets 503 instead of open access.
+    """
+    token = x_admin_token or bearer_token(authorization)
+    if token is None:
+        if not settings.ADMIN_TOKEN:
+            raise _admin_disabled()
+        raise _unauthorized("Admin token required")
+    if settings.ADMIN_TOKEN and hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+        return
+    if x_admin_token is not None:
+        if not settings.ADMIN_TOKEN:
+            raise _admin_disabled()
+        raise _unauthorized("Admin token required")
+    principal = await verify_token(token)
+    if ADMIN_SCOPE not in principal.scopes:
+        raise HTTPException(status_code=403, detail="Token lacks the 'admin' scope")
+
+
+def request_actor(request: Request) -> Optional[str]:
+    """Who triggered a mutation, as recorded in the audit log (token subject, else client address)"""
+    principal = request_principal(request)
+    if principal is not None:
+        return principal.subject
+    return request.client.host if request.client else None
@@ -18,11 +18,83 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "postgresql://nova:nova@db:5432/nova_v3"
+    DATABASE_REPLICA_URLS: list = []
+    DATABASE_READ_YOUR_WRITES: bool = True
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5.0  # > erwartete Replikationsverzögerung
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 5.0
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_ADAPTIVE: bool = False  # pool_size anhand der Checkout-Wartezeit anpassen
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 20
+    DB_POOL_TARGET_WAIT_MS: float = 5.0
+    DB_LISTEN_NOTIFY: bool = True  # Cache-Invalidierung per Postgres LISTEN/NOTIFY
+
+    # Dependencies (leer = nicht geprüft)
+    REDIS_URL: str = ""
+    AI_SERVICE_URL: str = ""
+
+    # Health checks
+    HEALTH_CHECK_TIMEOUT: float = 1.0  # Sekunden pro Abhängigkeit
+    HEALTH_CACHE_TTL: float = 2.0  # Sekunden
+
+    # Request metrics
+    SLOW_REQUEST_MS: float = 500.0  # Requests darüber landen im Slow-Request-Log
+    SLOW_REQUEST_LOG_SIZE: int = 100
+
+    # Audit-Log (gebündelte Inserts aus einer begrenzten Queue)
+    AUDIT_ENABLED: bool = True
+    AUDIT_BATCH_SIZE: int = 500  # Events pro INSERT
+    AUDIT_FLUSH_INTERVAL: float = 1.0  # Sekunden bis zum Schreiben eines unvollständigen Batches
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_ENQUEUE_TIMEOUT: float = 1.0  # Sekunden Backpressure, danach wird das Event verworfen
+
+    # Wizard
+    WIZARD_MAX_CONCURRENCY: int = 8  # gleichzeitige Schritte pro Workflow-Ausführung (Standard)
+    WIZARD_MAX_PROCESSES: int = 4  # gleichzeitige command-Subprozesse über alle Workflows
+    WIZARD_COMMAND_TIMEOUT: float = 300.0  # Sekunden, wenn der Schritt kein timeout setzt
+    WIZARD_OUTPUT_LINES: int = 1000  # letzte Ausgabezeilen pro Schritt im Ergebnis
+    WIZARD_COMMANDS_ENABLED: bool = False  # command-Schritte überhaupt zulassen (Registrieren nur als Admin)
+    WIZARD_COMMAND_ALLOWLIST: list = []  # erlaubte Programme (Name oder absoluter Pfad), leer = keine
+    WIZARD_COMMAND_ENV: list = []  # Umgebungsvariablen, die Schritte setzen dürfen
+    WIZARD_COMMAND_WORKDIRS: list = []  # erlaubte cwd-Verzeichnisse, leer = kein cwd
+    WIZARD_HTTP_ALLOWED_HOSTS: list = []  # api_call-Ziele als "host" oder "host:port", leer = nur AI_SERVICE_URL
+    WIZARD_HTTP_MAX_CONNECTIONS: int = 100  # api_call-Schritte: Verbindungen insgesamt
+    WIZARD_HTTP_MAX_PER_HOST: int = 10  # gleichzeitige Anfragen pro Host
+    WIZARD_HTTP_KEEPALIVE: int = 20  # offen gehaltene Leerlauf-Verbindungen
+    WIZARD_HTTP2: bool = False  # HTTP/2, falls das Paket h2 installiert ist
+    WIZARD_HTTP_TIMEOUT: float = 10.0  # Sekunden pro Versuch, wenn der Schritt kein timeout setzt
+    WIZARD_HTTP_MAX_RESPONSE_BYTES: int = 1048576  # größere Antworten lassen den Schritt scheitern
+    WIZARD_HTTP_RETRIES: int = 2  # Wiederholungen für idempotente Methoden
+    WIZARD_RUN_WORKERS: int = 4  # Executor-Tasks für Hintergrund-Ausführungen
+    WIZARD_RUN_QUEUE: int = 100  # wartende Ausführungen, darüber 503
+    WIZARD_RUN_HISTORY: int = 200  # abfragbare Ausführungen pro Worker-Prozess
+    WIZARD_RUN_EVENTS: int = 1000  # Fortschrittsereignisse pro Ausführung (für SSE)
+    WIZARD_STEP_CACHE_SIZE: int = 1024  # gemerkte Ergebnisse von Schritten mit cache_ttl
+
+    # Live-Kanal (WebSocket /api/v1/ws/live)
+    LIVE_INTERVAL: float = 2.0  # Sekunden zwischen zwei Broadcasts
+    LIVE_CLIENT_QUEUE: int = 32  # Frames; volle Queue = Client wird getrennt
+    LIVE_TASK_LIMIT: int = 100  # neueste Tasks im Topic "tasks"
+
+    # Admission control (adaptives Concurrency-Limit, 503 bei Überlast)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_INITIAL_LIMIT: int = 50
+    ADMISSION_MIN_LIMIT: int = 4
+    ADMISSION_MAX_LIMIT: int = 500
+    ADMISSION_MAX_WAIT_MS: float = 1000.0  # Wartezeit normaler Requests auf einen Slot
+    ADMISSION_LOW_MAX_WAIT_MS: float = 50.0  # Dashboard-Polling wird früh abgewiesen
+    ADMISSION_CPU_SHED: float = 95.0  # % ab dem Polling sofort abgewiesen wird
+    ADMISSION_MEMORY_SHED: float = 95.0
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    ADMIN_TOKEN: str = ""  # leer = /admin nur mit Admin-JWT, sonst 503
+    AUTH_REQUIRED: bool = False  # True = API-Routen nur mit Bearer-JWT
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # verifizierte Tokens pro Worker (LRU)
+    AUTH_REVOCATION_TTL: float = 60.0  # Sekunden, Fallback falls eine Notification verloren geht
 
     # CORS
     CORS_ORIGINS: list = ["http://localhost:5173", "http://localhost:3000"]
@@ -32,6 +104,20 @@ class Settings(BaseSettings):
     AGENT_FORGE_ENABLED: bool = True
     AGENT_PHOENIX_ENABLED: bool = True
     AGENT_GUARDIAN_ENABLED: bool = True
+    AGENT_REGISTRY_TTL: float = 60.0  # Sekunden, Fallback falls eine Notification verloren geht
+
+    # Guardian
+    CGROUP_ROOT: str = "/sys/fs/cgroup"
+    DOCKER_CONTAINERS_ROOT: str = "/var/lib/docker/containers"
+    ANOMALY_THRESHOLD: float = 4.0  # Standardabweichungen
+    ANOMALY_ALPHA: float = 0.05
+    ANOMALY_SEASONAL: bool = True
+    # Multi-Worker: ein gewählter Worker sampelt in ein Shared-Memory-Segment
+    GUARDIAN_SHARED_STATE: bool = False
+    GUARDIAN_SAMPLE_INTERVAL: float = 5.0  # Sekunden zwischen Guardian-Samples (lokal oder geteilt)
+    GUARDIAN_SHM_NAME: str = "nova_guardian"
+    GUARDIAN_SHM_SIZE: int = 1024 * 1024  # Bytes Payload
+    GUARDIAN_LEADER_LOCK: str = "/tmp/nova-guardian.lock"
 
     class Config:
         env_file = ".env"
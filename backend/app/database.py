@@ -1,24 +1,100 @@
 """
 NOVA v3 - Database Setup
 """
+from typing import AsyncIterator, Optional
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import get_settings
+from .services.db_pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolAutoscaler,
+    pool_monitor,
+)
+from .services.db_routing import ReplicaRouter, RoutingSession
 
 settings = get_settings()
 
-# Create SQLAlchemy engine
+# Async drivers for the sync URLs used in settings
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL to its async driver (postgresql -> asyncpg, sqlite -> aiosqlite)"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _autoscaler():
+    """Adaptive pool sizing, enabled with DB_POOL_ADAPTIVE"""
+    if not settings.DB_POOL_ADAPTIVE:
+        return None
+    return PoolAutoscaler(
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        target_wait_ms=settings.DB_POOL_TARGET_WAIT_MS,
+    )
+
+
+# Create SQLAlchemy engine (sync: seed.py, tests, scripts)
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
 )
+pool_monitor.attach(engine, "sync", _autoscaler())
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _create_async_engine(url: str):
+    return create_async_engine(
+        to_async_url(url),
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW
+    )
+
+
+# Async engine for request handlers
+async_engine = _create_async_engine(settings.DATABASE_URL)
+pool_monitor.attach(async_engine.sync_engine, "async", _autoscaler())
+
+# Read replicas (DATABASE_REPLICA_URLS), reads are spread round-robin
+replica_engines = [_create_async_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+for index, replica in enumerate(replica_engines):
+    pool_monitor.attach(replica.sync_engine, f"replica{index}")
+
+replica_router = ReplicaRouter(
+    async_engine,
+    replica_engines,
+    read_your_writes=settings.DATABASE_READ_YOUR_WRITES,
+    pin_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS,
+)
+
+# Create AsyncSessionLocal class (objects stay usable after commit in async code)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    info={"router": replica_router, "primary": True},
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -30,3 +106,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _pin_key(request: Request) -> Optional[str]:
+    """Client identity for read-your-writes pinning"""
+    return request.client.host if request.client else None
+
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dependency for async database sessions (primary, reads and writes)"""
+    async with AsyncSessionLocal(info={"pin_key": _pin_key(request)}) as db:
+        yield db
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dependency for read-only endpoints: SELECTs go to a healthy replica"""
+    async with AsyncSessionLocal(info={"pin_key": _pin_key(request), "primary": False}) as db:
+        yield db
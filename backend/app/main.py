@@ -4,8 +4,21 @@ NOVA v3 - Main FastAPI Application
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .config import get_settings
-from .api.routes import agents, health, tasks, guardian, wizard
+from .api.middleware import AdmissionControlMiddleware, AuthenticationMiddleware, RequestMetricsMiddleware
+from .api.routes import admin, agents, auth, core, health, live, metrics, tasks, guardian, wizard
+from .services.admission import admission_controller
+from .services.audit import audit_log
+from .services.auth import token_service
+from .services.notifications import notification_listener
+from .services.request_metrics import request_metrics
+from .services.guardian import guardian as guardian_service
+from .services.health import health_service
+from .services.http_client import http_pool
+from .services.shared_state import LeaderLock, SeqlockSegment, SharedSampler
+from .services.wizard import wizard_service
+from .database import async_engine, replica_router
 
 # Ensure models are imported so their tables exist during tests
 import app.models  # noqa: F401
@@ -19,8 +32,16 @@ nova_app = FastAPI(
     description="NOVA v3 - AI-Agent System for Infrastructure-as-Code",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
 )
 
+# Admission control (innermost, so 503 responses still get CORS headers and are measured)
+if settings.ADMISSION_ENABLED:
+    nova_app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
+# Bearer JWTs (outside admission control, so rejected requests never hold a slot)
+nova_app.add_middleware(AuthenticationMiddleware, tokens=token_service)
+
 # CORS Middleware
 nova_app.add_middleware(
     CORSMiddleware,
@@ -30,16 +51,24 @@ nova_app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, status and size metrics (outermost, so CORS is included)
+nova_app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 # Include routers
 nova_app.include_router(health.router, tags=["Health"])
+nova_app.include_router(metrics.router, tags=["Metrics"])
 # Mount both v1 and legacy /api prefixes for backward compatibility
 nova_app.include_router(agents.router, prefix=settings.API_V1_PREFIX, tags=["Agents"])
 nova_app.include_router(agents.router, prefix="/api", tags=["Agents (legacy)"])
+nova_app.include_router(auth.router, prefix=settings.API_V1_PREFIX, tags=["Auth"])
+nova_app.include_router(core.router, prefix=settings.API_V1_PREFIX, tags=["Core"])
+nova_app.include_router(live.router, prefix=settings.API_V1_PREFIX, tags=["Live"])
 nova_app.include_router(tasks.router, prefix=settings.API_V1_PREFIX, tags=["Tasks"])
 nova_app.include_router(tasks.router, prefix="/api", tags=["Tasks (legacy)"])
 nova_app.include_router(guardian.router, prefix=settings.API_V1_PREFIX, tags=["Guardian"])
 nova_app.include_router(guardian.router, prefix="/api", tags=["Guardian (legacy)"])
 nova_app.include_router(wizard.router, tags=["Wizard"])
+nova_app.include_router(admin.router, prefix=settings.API_V1_PREFIX, tags=["Admin"])
 
 
 # Alias for uvicorn (uvicorn app.main:app)
@@ -55,12 +84,39 @@ async def startup_event():
           f"FORGE={settings.AGENT_FORGE_ENABLED}, "
           f"PHOENIX={settings.AGENT_PHOENIX_ENABLED}, "
           f"GUARDIAN={settings.AGENT_GUARDIAN_ENABLED}")
+    if settings.AUTH_REQUIRED and not settings.ADMIN_TOKEN:
+        # Ohne Admin-Secret lassen sich keine Tokens ausstellen
+        raise RuntimeError("AUTH_REQUIRED=true needs ADMIN_TOKEN to be set")
+    replica_router.start(settings.DATABASE_REPLICA_CHECK_INTERVAL)
+    request_metrics.start_sampler()
+    if settings.AUDIT_ENABLED:
+        audit_log.start()
+    wizard_service.start()
+    if settings.DB_LISTEN_NOTIFY:
+        notification_listener.start(async_engine)
+    if settings.GUARDIAN_SHARED_STATE:
+        guardian_service.attach_shared(SharedSampler(
+            SeqlockSegment(settings.GUARDIAN_SHM_NAME, settings.GUARDIAN_SHM_SIZE),
+            LeaderLock(settings.GUARDIAN_LEADER_LOCK),
+            interval=settings.GUARDIAN_SAMPLE_INTERVAL,
+        ))
+    else:
+        guardian_service.start_sampler()
 
 
 @nova_app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     print(f"🛑 {settings.APP_NAME} shutting down...")
+    await wizard_service.stop()
+    await audit_log.stop()
+    await health_service.close()
+    await http_pool.close()
+    await replica_router.stop()
+    await notification_listener.stop()
+    request_metrics.stop_sampler()
+    await guardian_service.detach_shared()
+    guardian_service.stop_sampler()
 
 
 @nova_app.get("/")
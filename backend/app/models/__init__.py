@@ -1,4 +1,8 @@
 """Models package for backend (keeps minimal test table)"""
 from . import meta  # ensure migration/test table exists for tests
+from .agent import Agent
+from .audit import AuditEvent
+from .task import ACTIVE_STATUSES, Task
+from .token import RevokedToken
 
-__all__ = ['meta']
+__all__ = ['meta', 'Agent', 'AuditEvent', 'RevokedToken', 'Task', 'ACTIVE_STATUSES']
@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, JSON, String, Text, func, true
+from sqlalchemy.dialects.postgresql import JSONB
+from ..database import Base
+
+# JSONB on Postgres, plain JSON elsewhere (SQLite in tests)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class Agent(Base):
+    __tablename__ = 'agents'
+    id = Column(String(50), primary_key=True)
+    name = Column(String(100), nullable=False)
+    emoji = Column(String(10))
+    role = Column(String(100))
+    description = Column(Text)
+    capabilities = Column(JSONType)
+    enabled = Column(Boolean, nullable=False, default=True, server_default=true())
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                        server_default=func.now())
@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from ..database import Base
+from .agent import JSONType
+
+# BIGSERIAL on Postgres; SQLite only auto-increments INTEGER PRIMARY KEY
+IdType = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class AuditEvent(Base):
+    """Append-only audit trail of API mutations (written in batches by AuditLog)"""
+    __tablename__ = 'audit_events'
+    id = Column(IdType, primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    action = Column(String(100), nullable=False)
+    resource_type = Column(String(50), nullable=False)
+    resource_id = Column(String(100))
+    actor = Column(String(100))
+    details = Column(JSONType)
+
+    __table_args__ = (
+        # time-range scans; rows arrive in time order, so BRIN stays tiny on Postgres
+        Index('ix_audit_events_occurred_at', 'occurred_at', postgresql_using='brin'),
+        # GET /admin/audit?action=... within a time range
+        Index('ix_audit_events_action_occurred_at', 'action', 'occurred_at'),
+        # history of a single task/workflow
+        Index('ix_audit_events_resource', 'resource_type', 'resource_id', 'occurred_at'),
+    )
@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, func, text
+from ..database import Base
+from .agent import JSONType
+
+# Statuses that are still being worked on; most dashboard queries filter on these
+ACTIVE_STATUSES = ("pending", "in_progress", "running")
+_ACTIVE_WHERE = text("status IN ('pending', 'in_progress', 'running')")
+
+
+class Task(Base):
+    __tablename__ = 'tasks'
+    task_id = Column(String(100), primary_key=True)
+    agent_id = Column(String(50), ForeignKey('agents.id'), nullable=False)
+    action = Column(String(100), nullable=False)
+    status = Column(String(50), nullable=False, default="pending", server_default="pending")
+    payload = Column(JSONType)
+    result = Column(JSONType)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                        server_default=func.now())
+    completed_at = Column(DateTime)
+
+    __table_args__ = (
+        # GET /tasks?agent_id=... ordered by time
+        Index('ix_tasks_agent_id_created_at', 'agent_id', 'created_at'),
+        # GET /tasks?status=... ordered by time
+        Index('ix_tasks_status_created_at', 'status', 'created_at'),
+        # retention / time-range scans
+        Index('ix_tasks_created_at', 'created_at'),
+        # small partial index for the active queue per agent
+        Index('ix_tasks_active_agent_id', 'agent_id', 'created_at',
+              postgresql_where=_ACTIVE_WHERE, sqlite_where=_ACTIVE_WHERE),
+    )
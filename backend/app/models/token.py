@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, String
+from ..database import Base
+
+
+class RevokedToken(Base):
+    """Revoked JWT ids; rows can be pruned once the token would have expired anyway"""
+    __tablename__ = 'revoked_tokens'
+    jti = Column(String(64), primary_key=True)
+    subject = Column(String(100))
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # loading the active revocation list / pruning expired entries
+        Index('ix_revoked_tokens_expires_at', 'expires_at'),
+    )
@@ -0,0 +1,135 @@
+"""
+NOVA v3 - Async Repository Helpers
+Dünne Schicht über AsyncSession für wiederkehrende Abfragen
+"""
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Agent, AuditEvent, RevokedToken, Task
+
+ModelT = TypeVar("ModelT")
+
+
+class AsyncRepository(Generic[ModelT]):
+    """Basis-Repository für ein ORM-Model"""
+
+    model: Type[ModelT]
+
+    def __init__(self, session: AsyncSession, model: Optional[Type[ModelT]] = None):
+        self.session = session
+        if model is not None:
+            self.model = model
+
+    async def get(self, pk: Any) -> Optional[ModelT]:
+        return await self.session.get(self.model, pk)
+
+    async def list(
+        self,
+        *where: Any,
+        order_by: Sequence[Any] = (),
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> List[ModelT]:
+        stmt = select(self.model).where(*where).order_by(*order_by)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset is not None:
+            stmt = stmt.offset(offset)
+        result = await self.session.scalars(stmt)
+        return list(result.all())
+
+    async def count(self, *where: Any) -> int:
+        stmt = select(func.count()).select_from(self.model).where(*where)
+        return await self.session.scalar(stmt)
+
+    async def add(self, instance: ModelT) -> ModelT:
+        """Fügt ein Objekt hinzu und flusht, damit generierte Werte verfügbar sind"""
+        self.session.add(instance)
+        await self.session.flush()
+        return instance
+
+    async def delete(self, *where: Any) -> int:
+        result = await self.session.execute(delete(self.model).where(*where))
+        return result.rowcount
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+
+class AgentRepository(AsyncRepository[Agent]):
+    """Zugriff auf die agents-Tabelle"""
+
+    model = Agent
+
+    async def list_agents(self, enabled: Optional[bool] = None) -> List[Agent]:
+        where = [Agent.enabled.is_(enabled)] if enabled is not None else []
+        return await self.list(*where, order_by=[Agent.id])
+
+
+class TaskRepository(AsyncRepository[Task]):
+    """Zugriff auf die tasks-Tabelle (Filter passen zu den Indizes aus 0002)"""
+
+    model = Task
+
+    async def list_tasks(
+        self,
+        agent_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Task]:
+        where = []
+        if agent_id:
+            where.append(Task.agent_id == agent_id)
+        if status:
+            where.append(Task.status == status)
+        return await self.list(*where, order_by=[Task.created_at.desc()], limit=limit, offset=offset)
+
+
+class AuditRepository(AsyncRepository[AuditEvent]):
+    """Zugriff auf audit_events; immer über einen Zeitraum (Indizes aus 0005)"""
+
+    model = AuditEvent
+
+    async def list_events(
+        self,
+        since: datetime,
+        until: datetime,
+        action: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        before_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[AuditEvent]:
+        where = [AuditEvent.occurred_at >= since]
+        if before_id is None:
+            where.append(AuditEvent.occurred_at < until)
+        else:
+            # Keyset-Pagination: Fortsetzung unterhalb von (until, before_id) der letzten Seite
+            where.append(or_(
+                AuditEvent.occurred_at < until,
+                and_(AuditEvent.occurred_at == until, AuditEvent.id < before_id),
+            ))
+        if action:
+            where.append(AuditEvent.action == action)
+        if resource_type:
+            where.append(AuditEvent.resource_type == resource_type)
+        if resource_id:
+            where.append(AuditEvent.resource_id == resource_id)
+        return await self.list(*where, order_by=[AuditEvent.occurred_at.desc(), AuditEvent.id.desc()], limit=limit)
+
+
+class RevokedTokenRepository(AsyncRepository[RevokedToken]):
+    """Zugriff auf revoked_tokens (Migration 0006)"""
+
+    model = RevokedToken
+
+    async def list_active(self, now: datetime) -> List[RevokedToken]:
+        return await self.list(RevokedToken.expires_at > now)
+
+    async def prune(self, now: datetime) -> int:
+        """Entfernt Einträge, deren Token ohnehin abgelaufen wäre"""
+        return await self.delete(RevokedToken.expires_at <= now)
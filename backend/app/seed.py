@@ -1,9 +1,30 @@
 """
 🌱 NOVA v3 Database Seeder
 Füllt die Datenbank mit initialen Daten für die 4 Agenten
+
+Synthetische Lasttest-Daten:
+    python -m app.seed --synthetic --tasks 5000000 --days 180
 """
-from sqlalchemy import create_engine, text
+import argparse
+import csv
+import io
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
 from app.config import settings
+from app.models import Agent, Task
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
 
 # Initial agent data
 AGENTS = [
@@ -46,80 +67,220 @@ AGENTS = [
 ]
 
 
+def run_migrations(database_url: Optional[str] = None, revision: str = "head"):
+    """Brings the schema up to date with the Alembic migrations in backend/alembic"""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", (database_url or settings.DATABASE_URL).replace("%", "%%"))
+    # Keep the caller's logging configuration
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, revision)
+
+
+def _insert_for(engine: Engine):
+    """Dialect-specific INSERT with ON CONFLICT support"""
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert
+    raise RuntimeError(f"Upsert not supported for dialect '{engine.dialect.name}'")
+
+
+def seed_agents(engine: Engine) -> int:
+    """
+    Upserts all agents in one statement (INSERT ... ON CONFLICT DO UPDATE).
+
+    Master data (name, emoji, role, description, capabilities) follow this
+    file; 'enabled' is only set on insert so a toggled agent stays toggled.
+    """
+    table = Agent.__table__
+    stmt = _insert_for(engine)(table).values(AGENTS)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={
+            "name": stmt.excluded.name,
+            "emoji": stmt.excluded.emoji,
+            "role": stmt.excluded.role,
+            "description": stmt.excluded.description,
+            "capabilities": stmt.excluded.capabilities,
+            "updated_at": datetime.utcnow(),
+        },
+    )
+    with engine.begin() as conn:
+        conn.execute(stmt)
+    return len(AGENTS)
+
+
 def seed_database():
     """Seeds the database with initial data"""
     print("🌱 Starting database seeding...")
 
+    run_migrations()
+    print("✓ Database schema up to date")
+
     engine = create_engine(settings.DATABASE_URL)
+    count = seed_agents(engine)
+    print(f"✓ Upserted {count} agents: " + ", ".join(f"{a['name']} ({a['emoji']})" for a in AGENTS))
+
+    print("🎉 Database seeding completed!")
+
+
+# ===== Synthetische Daten für Lasttests =====
+
+# Typische Aktionen je Agent (Verteilung grob an Produktionslogs angelehnt)
+SYNTHETIC_ACTIONS = {
+    "core": ["route_request", "distribute_tasks", "plan_workflow", "evaluate_decision"],
+    "forge": ["build", "deploy", "run_tests", "docker_build", "ansible_playbook", "lint"],
+    "phoenix": ["backup", "restore", "restart_service", "health_repair", "snapshot"],
+    "guardian": ["resource_check", "cve_scan", "security_audit", "alert", "log_review"],
+}
+SYNTHETIC_AGENT_WEIGHTS = {"core": 0.35, "forge": 0.25, "phoenix": 0.15, "guardian": 0.25}
+SYNTHETIC_ERRORS = ["timeout", "connection refused", "exit code 1", "out of memory", "permission denied"]
+
+TASK_COLUMNS = ("task_id", "agent_id", "action", "status", "payload", "result",
+                "created_at", "updated_at", "completed_at")
+TaskRow = Tuple[str, str, str, str, Optional[str], Optional[str], datetime, datetime, Optional[datetime]]
+
+
+def generate_tasks(
+    count: int,
+    days: int,
+    seed: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[TaskRow]:
+    """
+    Erzeugt count realistische Task-Zeilen, verteilt über die letzten days Tage.
+
+    Tagsüber entstehen mehr Tasks als nachts, Laufzeiten sind log-normal verteilt.
+    Ältere Tasks sind abgeschlossen, fehlgeschlagen oder abgebrochen; nur die
+    letzten Stunden enthalten noch aktive Tasks. JSON-Felder kommen bereits
+    serialisiert, damit sie direkt in COPY/executemany gehen.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.utcnow()
+    span = days * 86400
+    run = f"{rng.getrandbits(32):08x}"
+    agents = list(SYNTHETIC_AGENT_WEIGHTS)
+    weights = list(SYNTHETIC_AGENT_WEIGHTS.values())
+
+    for i in range(count):
+        # Tageszeit-Profil: Rejection Sampling gegen eine Sinuskurve (Peak 14 Uhr)
+        while True:
+            age = rng.random() * span
+            created = now - timedelta(seconds=age)
+            hour = created.hour + created.minute / 60
+            if rng.random() < 0.6 + 0.4 * math.cos((hour - 14) / 24 * 2 * math.pi):
+                break
 
-    with engine.connect() as conn:
-        # Create agents table if not exists
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS agents (
-                id VARCHAR(50) PRIMARY KEY,
-                name VARCHAR(100) NOT NULL,
-                emoji VARCHAR(10),
-                role VARCHAR(100),
-                description TEXT,
-                capabilities JSONB,
-                enabled BOOLEAN DEFAULT true,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
-        conn.commit()
-
-        # Insert agents
-        for agent in AGENTS:
-            # Check if agent exists
-            result = conn.execute(
-                text("SELECT id FROM agents WHERE id = :id"),
-                {"id": agent["id"]}
-            )
-
-            if result.fetchone() is None:
-                # Insert new agent
-                conn.execute(
-                    text("""
-                        INSERT INTO agents (id, name, emoji, role, description, capabilities, enabled)
-                        VALUES (:id, :name, :emoji, :role, :description, :capabilities::jsonb, :enabled)
-                    """),
-                    {
-                        "id": agent["id"],
-                        "name": agent["name"],
-                        "emoji": agent["emoji"],
-                        "role": agent["role"],
-                        "description": agent["description"],
-                        "capabilities": str(agent["capabilities"]).replace("'", '"'),
-                        "enabled": agent["enabled"],
-                    }
-                )
-                print(f"✓ Created agent: {agent['name']} ({agent['emoji']})")
+        agent_id = rng.choices(agents, weights)[0]
+        action = rng.choice(SYNTHETIC_ACTIONS[agent_id])
+        duration = min(rng.lognormvariate(3.0, 1.2), 6 * 3600)
+        payload = json.dumps({"source": rng.choice(["api", "wizard", "schedule"]), "priority": rng.randint(1, 5)})
+
+        if age < duration:
+            status = rng.choice(["pending", "running", "in_progress"])
+            result, completed_at, updated_at = None, None, created
+        else:
+            roll = rng.random()
+            completed_at = created + timedelta(seconds=duration)
+            updated_at = completed_at
+            if roll < 0.88:
+                status, result = "completed", json.dumps({"duration_ms": int(duration * 1000)})
+            elif roll < 0.96:
+                status, result = "failed", json.dumps({"error": rng.choice(SYNTHETIC_ERRORS)})
             else:
-                print(f"⚠ Agent already exists: {agent['name']}")
-
-        conn.commit()
-
-        # Create tasks table if not exists
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                task_id VARCHAR(100) PRIMARY KEY,
-                agent_id VARCHAR(50) REFERENCES agents(id),
-                action VARCHAR(100) NOT NULL,
-                status VARCHAR(50) DEFAULT 'pending',
-                payload JSONB,
-                result JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_at TIMESTAMP
-            )
-        """))
-        conn.commit()
-
-        print("✓ Database tables created")
+                status, result = "cancelled", None
 
-    print("🎉 Database seeding completed!")
+        yield (f"syn-{run}-{i:010d}", agent_id, action, status, payload, result,
+               created, updated_at, completed_at)
+
+
+def _copy_chunk(engine: Engine, rows: Iterable[TaskRow]) -> None:
+    """Streams one chunk through COPY ... FROM STDIN (PostgreSQL)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # Leere, nicht gequotete Felder liest COPY CSV als NULL
+        writer.writerow(["" if v is None else v.isoformat() if isinstance(v, datetime) else v for v in row])
+    buffer.seek(0)
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            cursor.copy_expert(f"COPY tasks ({', '.join(TASK_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _insert_chunk(engine: Engine, rows: Iterable[TaskRow]) -> None:
+    """Fallback for databases without COPY: one executemany per chunk"""
+    table = Task.__table__
+    params = [dict(zip(TASK_COLUMNS, row)) for row in rows]
+    for p in params:
+        # JSON-Spalten erwarten Python-Objekte, nicht die vorserialisierten Strings
+        p["payload"] = json.loads(p["payload"]) if p["payload"] else None
+        p["result"] = json.loads(p["result"]) if p["result"] else None
+    with engine.begin() as conn:
+        conn.execute(table.insert(), params)
+
+
+def load_synthetic_tasks(
+    engine: Engine,
+    count: int,
+    days: int,
+    chunk_size: int = 50000,
+    seed: Optional[int] = None,
+) -> int:
+    """Loads count synthetic tasks in chunks (COPY on PostgreSQL), returns rows written"""
+    write_chunk = _copy_chunk if engine.dialect.name == "postgresql" else _insert_chunk
+    rows = generate_tasks(count, days, seed=seed)
+    written = 0
+    started = time.monotonic()
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        write_chunk(engine, chunk)
+        written += len(chunk)
+        rate = written / max(time.monotonic() - started, 1e-6)
+        print(f"  … {written:,}/{count:,} tasks ({rate:,.0f} rows/s)")
+
+    if engine.dialect.name == "postgresql":
+        # Frische Statistiken, sonst plant der Optimizer mit einer leeren Tabelle
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("ANALYZE tasks")
+    return written
+
+
+def seed_synthetic(count: int, days: int, chunk_size: int = 50000, seed: Optional[int] = None):
+    """Seeds agents plus count synthetic tasks for load testing"""
+    print(f"🧪 Generating {count:,} synthetic tasks over {days} days...")
+
+    run_migrations()
+    engine = create_engine(settings.DATABASE_URL)
+    seed_agents(engine)
+
+    started = time.monotonic()
+    written = load_synthetic_tasks(engine, count, days, chunk_size=chunk_size, seed=seed)
+    print(f"🎉 Loaded {written:,} tasks in {time.monotonic() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NOVA v3 database seeder")
+    parser.add_argument("--synthetic", action="store_true", help="load synthetic tasks for load testing")
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="number of synthetic tasks")
+    parser.add_argument("--days", type=int, default=90, help="spread tasks over the last N days")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="rows per COPY/INSERT batch")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible data")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        seed_synthetic(args.tasks, args.days, chunk_size=args.chunk_size, seed=args.seed)
+    else:
+        seed_database()
 
 
 if __name__ == "__main__":
-    seed_database()
+    main()
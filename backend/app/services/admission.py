@@ -0,0 +1,256 @@
+"""
+NOVA v3 - Admission Control
+Adaptives Concurrency-Limit mit Prioritätsklassen und Load Shedding
+
+Das Limit folgt dem Gradient-Verfahren (Netflix concurrency-limits): solange
+die aktuelle Latenz (kurze EWMA) nahe der Basislatenz (lange EWMA) liegt, darf
+es wachsen; steigt sie, schrumpft das Limit proportional. Requests über dem
+Limit warten kurz in einer Prioritäts-Queue, sonst gibt es 503 + Retry-After.
+Kritische Routen (Health, Metrics, Admin, PHOENIX) umgehen das Limit.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from app.config import get_settings
+from app.services.guardian import guardian
+
+CRITICAL = "critical"
+NORMAL = "normal"
+LOW = "low"
+PRIORITIES = (CRITICAL, NORMAL, LOW)
+
+# Pfad-Präfixe je Klasse; der erste Treffer gewinnt, Rest ist NORMAL
+CRITICAL_PATHS = (
+    "/health", "/ready", "/live", "/metrics",
+    "/api/v1/admin",
+    # PHOENIX muss auch unter Last Recovery auslösen können
+    "/api/v1/agents/phoenix", "/api/agents/phoenix",
+)
+# Lesende Dashboard-Abfragen (Polling), nur GET
+LOW_READ_PATHS = (
+    "/api/v1/guardian", "/api/guardian",
+    "/api/v1/tasks", "/api/tasks",
+    "/api/wizard",
+    "/api/v1/core/route/decisions",
+    "/api/docs", "/api/redoc", "/openapi.json",
+)
+
+# Server-Sent-Event-Streams laufen so lange wie die Ausführung; sie halten
+# keinen Slot und ihre Dauer fließt nicht als Latenz in das Limit ein
+STREAM_PATH_PREFIX = "/api/wizard/runs/"
+STREAM_PATH_SUFFIX = "/events"
+
+
+def is_stream(path: str) -> bool:
+    return path.startswith(STREAM_PATH_PREFIX) and path.endswith(STREAM_PATH_SUFFIX)
+
+
+def classify(method: str, path: str) -> str:
+    if path.startswith(CRITICAL_PATHS):
+        return CRITICAL
+    if method in ("GET", "HEAD") and path.startswith(LOW_READ_PATHS):
+        return LOW
+    return NORMAL
+
+
+class Rejected(Exception):
+    """Request wird abgewiesen (503)"""
+
+    def __init__(self, priority: str, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.priority = priority
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class GradientLimit:
+    """Concurrency-Limit aus dem Verhältnis Basislatenz / aktuelle Latenz"""
+
+    def __init__(
+        self,
+        initial: int = 50,
+        min_limit: int = 4,
+        max_limit: int = 500,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        short_alpha: float = 0.1,
+        long_alpha: float = 0.01,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.short_alpha = short_alpha
+        self.long_alpha = long_alpha
+        self.short_rtt = 0.0
+        self.long_rtt = 0.0
+
+    def update(self, rtt: float, in_flight: int) -> float:
+        if self.long_rtt == 0.0:
+            self.short_rtt = self.long_rtt = rtt
+            return self.limit
+        self.short_rtt += self.short_alpha * (rtt - self.short_rtt)
+        self.long_rtt += self.long_alpha * (rtt - self.long_rtt)
+
+        # Nach einer Lastspitze sinkt die Basislatenz schneller wieder
+        if self.long_rtt / self.short_rtt > 2:
+            self.long_rtt *= 0.95
+
+        # Nicht wachsen, solange das Limit gar nicht ausgeschöpft wird
+        if in_flight < self.limit / 2:
+            return self.limit
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        new_limit = self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, new_limit))
+        return self.limit
+
+
+class AdmissionController:
+    """Vergibt Slots unter dem adaptiven Limit, bevorzugt NORMAL vor LOW"""
+
+    def __init__(
+        self,
+        limit: Optional[GradientLimit] = None,
+        max_wait: Optional[Dict[str, float]] = None,
+        max_queue: int = 200,
+        pressure_source: Optional[Callable[[], Dict]] = None,
+        cpu_shed: float = 95.0,
+        memory_shed: float = 95.0,
+        retry_after: int = 1,
+    ):
+        self.limit = limit or GradientLimit()
+        # Sekunden, die ein Request auf einen Slot warten darf
+        self.max_wait = max_wait or {NORMAL: 1.0, LOW: 0.05}
+        self.max_queue = max_queue
+        self.pressure_source = pressure_source
+        self.cpu_shed = cpu_shed
+        self.memory_shed = memory_shed
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {NORMAL: deque(), LOW: deque()}
+        self.admitted = {p: 0 for p in PRIORITIES}
+        self.shed = {p: 0 for p in PRIORITIES}
+        self.queue_wait_total = {p: 0.0 for p in PRIORITIES}
+
+    # ===== Slots =====
+
+    async def acquire(self, priority: str) -> float:
+        """Wartet auf einen Slot; gibt den Start-Zeitpunkt zurück oder wirft Rejected"""
+        if priority == CRITICAL:
+            self.admitted[CRITICAL] += 1
+            return time.perf_counter()
+
+        if priority == LOW and self._under_pressure():
+            raise self._reject(priority, "system under pressure")
+
+        waited = 0.0
+        if self.in_flight < self.limit.limit and not self._has_waiters(priority):
+            self.in_flight += 1
+        else:
+            waited = await self._wait(priority)
+
+        self.admitted[priority] += 1
+        self.queue_wait_total[priority] += waited
+        return time.perf_counter()
+
+    def release(self, priority: str, started: float) -> None:
+        if priority == CRITICAL:
+            return
+        self.in_flight -= 1
+        self.limit.update(time.perf_counter() - started, self.in_flight + 1)
+        self._wake()
+
+    async def _wait(self, priority: str) -> float:
+        queue = self._waiters[priority]
+        if len(queue) >= self.max_queue or self.max_wait[priority] <= 0:
+            raise self._reject(priority, "concurrency limit reached")
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, timeout=self.max_wait[priority])
+        except asyncio.TimeoutError:
+            # Slot kann im selben Loop-Durchlauf noch vergeben worden sein
+            if not (future.done() and not future.cancelled()):
+                raise self._reject(priority, "queue timeout")
+        except asyncio.CancelledError:
+            # Client weg, nachdem der Slot schon vergeben war: Slot zurückgeben
+            if future.done() and not future.cancelled():
+                self.in_flight -= 1
+                self._wake()
+            raise
+        finally:
+            if future in queue:
+                queue.remove(future)
+        return time.perf_counter() - queued_at
+
+    def _wake(self) -> None:
+        for priority in (NORMAL, LOW):
+            queue = self._waiters[priority]
+            while queue and self.in_flight < self.limit.limit:
+                future = queue.popleft()
+                if not future.done():
+                    # Slot wird hier reserviert, der Wartende übernimmt ihn
+                    self.in_flight += 1
+                    future.set_result(True)
+
+    def _has_waiters(self, priority: str) -> bool:
+        # LOW stellt sich hinter wartende NORMAL-Requests
+        if priority == LOW:
+            return bool(self._waiters[NORMAL] or self._waiters[LOW])
+        return bool(self._waiters[NORMAL])
+
+    # ===== Shedding =====
+
+    def _under_pressure(self) -> bool:
+        if self.pressure_source is None:
+            return False
+        pressure = self.pressure_source()
+        return pressure["cpu"] >= self.cpu_shed or pressure["memory"] >= self.memory_shed
+
+    def _reject(self, priority: str, reason: str) -> Rejected:
+        self.shed[priority] += 1
+        return Rejected(priority, reason, self.retry_after)
+
+    # ===== Status =====
+
+    def status(self) -> Dict:
+        return {
+            "limit": round(self.limit.limit, 1),
+            "in_flight": self.in_flight,
+            "queued": {p: len(q) for p, q in self._waiters.items()},
+            "latency_ms": {
+                "short": round(self.limit.short_rtt * 1000, 2),
+                "baseline": round(self.limit.long_rtt * 1000, 2),
+            },
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+            "avg_queue_wait_ms": {
+                p: round(self.queue_wait_total[p] / self.admitted[p] * 1000, 2) if self.admitted[p] else 0.0
+                for p in (NORMAL, LOW)
+            },
+            "pressure": self.pressure_source() if self.pressure_source else None,
+        }
+
+
+settings = get_settings()
+
+# Singleton instance
+admission_controller = AdmissionController(
+    limit=GradientLimit(
+        initial=settings.ADMISSION_INITIAL_LIMIT,
+        min_limit=settings.ADMISSION_MIN_LIMIT,
+        max_limit=settings.ADMISSION_MAX_LIMIT,
+    ),
+    max_wait={NORMAL: settings.ADMISSION_MAX_WAIT_MS / 1000, LOW: settings.ADMISSION_LOW_MAX_WAIT_MS / 1000},
+    pressure_source=guardian.get_pressure,
+    cpu_shed=settings.ADMISSION_CPU_SHED,
+    memory_shed=settings.ADMISSION_MEMORY_SHED,
+)
@@ -0,0 +1,116 @@
+"""
+NOVA v3 - Agent Load Tracking
+Queue-Tiefe und Latenz pro Agent für das Routing von CORE
+
+Die Task-Endpunkte melden Änderungen sofort (nur dieser Worker sieht sie),
+in festen Abständen wird der Stand aus der tasks-Tabelle neu gelesen und
+gleicht Tasks anderer Worker ab.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ACTIVE_STATUSES, Task
+from app.services.anomaly import StreamingStats
+
+
+class AgentLoadTracker:
+    """Aktive Tasks und EWMA der Laufzeit je Agent"""
+
+    def __init__(
+        self,
+        refresh_interval: float = 5.0,
+        latency_window: float = 900.0,
+        alpha: float = 0.2,
+        default_latency_ms: float = 1000.0,
+        sample_limit: int = 500,
+    ):
+        self.refresh_interval = refresh_interval
+        self.latency_window = latency_window
+        self.alpha = alpha
+        self.default_latency_ms = default_latency_ms
+        self.sample_limit = sample_limit
+        self._depth: Dict[str, int] = {}
+        self._latency: Dict[str, StreamingStats] = {}
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    # ===== Abfragen =====
+
+    def depth(self, agent_id: str) -> int:
+        return self._depth.get(agent_id, 0)
+
+    def latency_ms(self, agent_id: str) -> float:
+        stats = self._latency.get(agent_id)
+        return stats.mean if stats is not None and stats.count else self.default_latency_ms
+
+    def snapshot(self) -> Dict[str, Dict]:
+        agents = set(self._depth) | set(self._latency)
+        return {
+            agent_id: {"queue_depth": self.depth(agent_id), "latency_ms": round(self.latency_ms(agent_id), 1)}
+            for agent_id in sorted(agents)
+        }
+
+    # ===== Ereignisse aus den Task-Endpunkten =====
+
+    def task_queued(self, agent_id: str) -> None:
+        self._depth[agent_id] = self._depth.get(agent_id, 0) + 1
+
+    def task_finished(self, agent_id: str, duration: Optional[float] = None) -> None:
+        """Task verlässt die Queue; duration in Sekunden (None bei Abbruch)"""
+        self._depth[agent_id] = max(self._depth.get(agent_id, 0) - 1, 0)
+        if duration is not None:
+            self._observe(agent_id, duration * 1000)
+
+    def _observe(self, agent_id: str, latency_ms: float) -> None:
+        stats = self._latency.get(agent_id)
+        if stats is None:
+            stats = self._latency[agent_id] = StreamingStats(self.alpha)
+        stats.update(latency_ms)
+
+    # ===== Abgleich mit der Datenbank =====
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        async with self._lock:
+            if time.monotonic() - self._refreshed_at >= self.refresh_interval:
+                await self.refresh(db)
+
+    async def refresh(self, db: AsyncSession) -> None:
+        # Partieller Index ix_tasks_active_agent_id
+        depth = await db.execute(
+            select(Task.agent_id, func.count())
+            .where(Task.status.in_(ACTIVE_STATUSES))
+            .group_by(Task.agent_id)
+        )
+        # ix_tasks_status_created_at
+        cutoff = datetime.utcnow() - timedelta(seconds=self.latency_window)
+        recent = await db.execute(
+            select(Task.agent_id, Task.created_at, Task.completed_at)
+            .where(Task.status == "completed", Task.created_at >= cutoff, Task.completed_at.is_not(None))
+            .order_by(Task.created_at.desc())
+            .limit(self.sample_limit)
+        )
+
+        self._depth = {agent_id: count for agent_id, count in depth.all()}
+        latency: Dict[str, StreamingStats] = {}
+        for agent_id, created_at, completed_at in reversed(recent.all()):
+            stats = latency.setdefault(agent_id, StreamingStats(self.alpha))
+            stats.update((completed_at - created_at).total_seconds() * 1000)
+        # Agenten ohne aktuelle Samples behalten ihre bisherige Schätzung
+        self._latency = {**self._latency, **latency}
+        self._refreshed_at = time.monotonic()
+
+    def reset(self) -> None:
+        self._depth.clear()
+        self._latency.clear()
+        self._refreshed_at = 0.0
+
+
+# Singleton instance
+agent_load = AgentLoadTracker()
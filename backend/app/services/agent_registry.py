@@ -0,0 +1,148 @@
+"""
+NOVA v3 - Agent Registry
+Agenten aus der agents-Tabelle als unveränderlicher In-Process-Cache
+
+Jeder Worker hält einen Snapshot mit fertig serialisierten Antworten. Änderungen
+an der Tabelle lösen über einen Trigger (Migration 0003) ein Postgres NOTIFY aus;
+der notification_listener markiert den Snapshot als veraltet, die nächste
+Anfrage lädt neu.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.repositories import AgentRepository
+from app.services.notifications import notification_listener
+from app.services.versions import content_etag
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class AgentSnapshot:
+    """Unveränderlicher Stand der Registry"""
+
+    version: int = 0
+    agents: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+    list_body: bytes = b"[]"
+    detail_bodies: Mapping[str, bytes] = field(default_factory=lambda: MappingProxyType({}))
+    # Inhalts-ETags, in allen Workern gleich für denselben Tabellenstand
+    list_etag: str = content_etag(b"[]")
+    detail_etags: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    # Capability -> aktivierte Agenten, für das Routing von CORE
+    capability_index: Mapping[str, FrozenSet[str]] = field(default_factory=lambda: MappingProxyType({}))
+    loaded_at: float = 0.0
+
+    def get(self, agent_id: str) -> Optional[Mapping[str, Any]]:
+        return self.agents.get(agent_id)
+
+
+class AgentRegistry:
+    """Lädt Agenten bei Bedarf neu und tauscht den Snapshot atomar aus"""
+
+    def __init__(self, channel: str = "agents_changed", ttl: float = 60.0):
+        self.channel = channel
+        self.ttl = ttl
+        self._snapshot = AgentSnapshot()
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    # ===== Snapshot =====
+
+    @property
+    def snapshot(self) -> AgentSnapshot:
+        return self._snapshot
+
+    def is_stale(self) -> bool:
+        return self._stale or time.monotonic() - self._snapshot.loaded_at > self.ttl
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    async def get_snapshot(self, db: AsyncSession) -> AgentSnapshot:
+        """Aktueller Snapshot; lädt nur, wenn er veraltet ist (single-flight)"""
+        if not self.is_stale():
+            return self._snapshot
+        async with self._lock:
+            if self.is_stale():
+                await self.load(db)
+        return self._snapshot
+
+    async def load(self, db: AsyncSession) -> AgentSnapshot:
+        # Vor dem Lesen zurücksetzen, damit ein NOTIFY während des Ladens nicht verloren geht
+        self._stale = False
+        try:
+            rows = await AgentRepository(db).list_agents()
+        except Exception:
+            self._stale = True
+            if self._snapshot.loaded_at:
+                logger.exception("Agent registry reload failed, serving previous snapshot")
+                return self._snapshot
+            raise
+
+        agents = {row.id: MappingProxyType(self._to_dict(row)) for row in rows}
+        list_body = orjson.dumps([self._list_item(a) for a in agents.values()])
+        detail_bodies = {agent_id: orjson.dumps(self._detail(a)) for agent_id, a in agents.items()}
+        self._snapshot = AgentSnapshot(
+            version=self._snapshot.version + 1,
+            agents=MappingProxyType(agents),
+            list_body=list_body,
+            detail_bodies=MappingProxyType(detail_bodies),
+            list_etag=content_etag(list_body),
+            detail_etags=MappingProxyType({agent_id: content_etag(body) for agent_id, body in detail_bodies.items()}),
+            capability_index=self._index(agents),
+            loaded_at=time.monotonic(),
+        )
+        return self._snapshot
+
+    def _to_dict(self, row) -> Dict[str, Any]:
+        # AGENT_<ID>_ENABLED bleibt als Notschalter pro Deployment erhalten
+        switch = getattr(settings, f"AGENT_{row.id.upper()}_ENABLED", True)
+        return {
+            "id": row.id,
+            "name": row.name,
+            "emoji": row.emoji,
+            "role": row.role,
+            "description": row.description,
+            "enabled": bool(row.enabled and switch),
+            "capabilities": tuple(row.capabilities or ()),
+        }
+
+    def _index(self, agents: Mapping[str, Mapping[str, Any]]) -> Mapping[str, FrozenSet[str]]:
+        index: Dict[str, set] = {}
+        for agent in agents.values():
+            if agent["enabled"]:
+                for capability in agent["capabilities"]:
+                    index.setdefault(capability, set()).add(agent["id"])
+        return MappingProxyType({capability: frozenset(ids) for capability, ids in index.items()})
+
+    def _list_item(self, agent: Mapping[str, Any]) -> Dict[str, Any]:
+        # legacy-friendly: 'name' contains lowercase id, keep 'display_name' for original label
+        return {
+            "id": agent["id"],
+            "name": agent["id"],
+            "display_name": agent["name"],
+            "emoji": agent["emoji"],
+            "role": agent["role"],
+            "description": agent["description"],
+            "enabled": agent["enabled"],
+            "capabilities": list(agent["capabilities"]),
+        }
+
+    def _detail(self, agent: Mapping[str, Any]) -> Dict[str, Any]:
+        item = self._list_item(agent)
+        item["status"] = "active" if agent["enabled"] else "inactive"
+        return item
+
+
+# Singleton instance
+agent_registry = AgentRegistry(ttl=settings.AGENT_REGISTRY_TTL)
+notification_listener.subscribe(agent_registry.channel, lambda payload: agent_registry.invalidate())
@@ -0,0 +1,138 @@
+"""
+🛡️ GUARDIAN - Streaming-Anomalie-Erkennung
+EWMA-Mittelwert/Varianz pro Metrik (optional pro Tagesstunde), O(1) pro Sample
+"""
+import math
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+
+class StreamingStats:
+    """Exponentiell gewichteter Mittelwert und Varianz mit konstantem Speicher"""
+
+    __slots__ = ("alpha", "mean", "variance", "count")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+    def update(self, value: float) -> None:
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class MetricModel:
+    """Globale Statistik plus optional 24 Stunden-Buckets für eine Metrik"""
+
+    __slots__ = ("overall", "hourly")
+
+    def __init__(self, alpha: float, seasonal: bool):
+        self.overall = StreamingStats(alpha)
+        self.hourly = [StreamingStats(alpha) for _ in range(24)] if seasonal else None
+
+
+class AnomalyDetector:
+    """
+    Erkennt ungewöhnliche Werte unterhalb der festen Schwellwerte.
+
+    Der Score ist die Abweichung vom erwarteten Wert in Standardabweichungen.
+    Saisonale Buckets werden genutzt, sobald die jeweilige Stunde genug
+    Samples gesehen hat, vorher die globale Statistik.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        threshold: float = 4.0,
+        warmup: int = 30,
+        seasonal: bool = True,
+        min_std: float = 1.0,
+        max_metrics: int = 256,
+        history_size: int = 50,
+    ):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.seasonal = seasonal
+        self.min_std = min_std
+        self.max_metrics = max_metrics
+        self._models: "OrderedDict[str, MetricModel]" = OrderedDict()
+        self.recent: Deque[Dict] = deque(maxlen=history_size)
+
+    def observe(self, metric: str, value: Optional[float], timestamp: Optional[datetime] = None) -> Optional[Dict]:
+        """Bewertet einen Wert gegen die bisherige Statistik und aktualisiert sie"""
+        if value is None:
+            return None
+
+        timestamp = timestamp or datetime.now()
+        model = self._get_model(metric)
+        hourly = model.hourly[timestamp.hour] if model.hourly else None
+
+        baseline = hourly if hourly is not None and hourly.count >= self.warmup else model.overall
+        anomaly = None
+        if baseline.count >= self.warmup:
+            expected = baseline.mean
+            score = abs(value - expected) / max(baseline.std, self.min_std)
+            if score >= self.threshold:
+                anomaly = {
+                    "type": "anomaly",
+                    "metric": metric,
+                    "value": value,
+                    "expected": round(expected, 2),
+                    "score": round(score, 2),
+                    "severity": "critical" if score >= 2 * self.threshold else "warning",
+                    "seasonal": baseline is hourly,
+                    "timestamp": timestamp.isoformat(),
+                    "message": f"Unusual {metric}: {value:.1f} (expected ~{expected:.1f}, score {score:.1f})",
+                }
+                self.recent.append(anomaly)
+
+        model.overall.update(value)
+        if hourly is not None:
+            hourly.update(value)
+
+        return anomaly
+
+    def observe_many(self, values: Dict[str, Optional[float]], timestamp: Optional[datetime] = None) -> List[Dict]:
+        """Bewertet mehrere Metriken desselben Samples"""
+        anomalies = []
+        for metric, value in values.items():
+            anomaly = self.observe(metric, value, timestamp)
+            if anomaly:
+                anomalies.append(anomaly)
+        return anomalies
+
+    def _get_model(self, metric: str) -> MetricModel:
+        model = self._models.get(metric)
+        if model is None:
+            # Begrenzter Speicher: am längsten nicht gesehene Metrik verdrängen
+            if len(self._models) >= self.max_metrics:
+                self._models.popitem(last=False)
+            model = self._models[metric] = MetricModel(self.alpha, self.seasonal)
+        else:
+            self._models.move_to_end(metric)
+        return model
+
+    def get_baseline(self, metric: str) -> Optional[Dict]:
+        """Aktuelle Statistik einer Metrik"""
+        model = self._models.get(metric)
+        if model is None:
+            return None
+        return {
+            "mean": model.overall.mean,
+            "std": model.overall.std,
+            "samples": model.overall.count,
+        }
@@ -0,0 +1,196 @@
+"""
+NOVA v3 - Audit-Log
+Mutationen landen in einer begrenzten Queue und werden gebündelt geschrieben
+
+Requests zahlen nur ein Queue-put statt eines DB-Roundtrips. Ein Writer-Task
+schreibt, sobald batch_size Events vorliegen oder flush_interval abgelaufen ist,
+mit einem einzigen mehrzeiligen INSERT. Ist die Queue voll, wartet record()
+(Backpressure) höchstens enqueue_timeout lang und verwirft das Event danach,
+damit ein DB-Ausfall die API nicht blockiert.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import get_settings
+from app.database import async_engine
+from app.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLog:
+    """Begrenzte Queue plus Batch-Writer für audit_events"""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        enqueue_timeout: float = 1.0,
+        max_retries: int = 3,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failures = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms = 0.0
+        # Queue gehört zum Event-Loop, in dem der Writer läuft; erst in start() anlegen
+        self._queue: Optional[asyncio.Queue] = None
+        # Bereits aus der Queue genommen, aber noch nicht geschrieben
+        self._pending: List[Dict] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    # ===== Erfassen =====
+
+    async def record(
+        self,
+        action: str,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        actor: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Reiht ein Event ein; False, wenn es verworfen wurde"""
+        if self._queue is None:
+            self.dropped += 1
+            return False
+        event = {
+            "occurred_at": datetime.utcnow(),
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "actor": actor,
+            "details": details,
+        }
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            pass
+        self.backpressure_waits += 1
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=self.enqueue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            logger.warning(f"Audit queue full, dropped '{action}' event")
+            return False
+
+    # ===== Writer =====
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._write_lock = asyncio.Lock()
+            self._writer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Beendet den Writer und schreibt alles, was noch in der Queue liegt"""
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        if self._queue is not None:
+            await self.flush()
+            self._queue = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._collect()
+            batch, self._pending = self._pending, []
+            if not batch:
+                # flush() hat die gesammelten Events bereits geschrieben
+                continue
+            # Ein Abbruch (stop) unterbricht keinen laufenden INSERT; flush() wartet auf ihn
+            await asyncio.shield(self._write(batch))
+
+    async def _collect(self) -> None:
+        """Wartet auf das erste Event, dann bis batch_size oder flush_interval"""
+        self._pending.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_interval
+        while len(self._pending) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def flush(self) -> int:
+        """Schreibt sofort alles Eingereihte (Shutdown, Tests)"""
+        flushed = 0
+        while self._pending or (self._queue is not None and not self._queue.empty()):
+            batch, self._pending = self._pending, []
+            while len(batch) < self.batch_size and self._queue is not None and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+            flushed += len(batch)
+        return flushed
+
+    async def _write(self, batch: List[Dict]) -> None:
+        async with self._write_lock:
+            for attempt in range(1, self.max_retries + 1):
+                started = time.perf_counter()
+                try:
+                    async with self.engine.begin() as conn:
+                        # Ein Statement mit mehrzeiligem VALUES statt batch_size Roundtrips
+                        await conn.execute(insert(AuditEvent).values(batch))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failures += 1
+                    logger.warning(f"Audit write of {len(batch)} events failed (attempt {attempt}): {e}")
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(min(self.flush_interval * attempt, 5.0))
+                    continue
+                self.written += len(batch)
+                self.batches += 1
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+                return
+            self.dropped += len(batch)
+            logger.error(f"Dropped {len(batch)} audit events after {self.max_retries} failed writes")
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._writer is not None and not self._writer.done(),
+            "queued": (self._queue.qsize() if self._queue is not None else 0) + len(self._pending),
+            "max_queue": self.max_queue,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "avg_batch_size": round(self.written / self.batches, 1) if self.batches else 0.0,
+            "failures": self.failures,
+            "backpressure_waits": self.backpressure_waits,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+settings = get_settings()
+
+# Singleton instance
+audit_log = AuditLog(
+    async_engine,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+    max_queue=settings.AUDIT_QUEUE_SIZE,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT,
+)
@@ -0,0 +1,237 @@
+"""
+NOVA v3 - Token-Authentifizierung
+JWT-Access-Tokens ausstellen und prüfen, mit Cache für bereits verifizierte Tokens
+
+Eine Prüfung kostet HMAC, Base64- und JSON-Decoding. Das Dashboard pollt
+mit immer demselben Token; ein begrenzter LRU-Cache (Schlüssel: SHA-256 des
+Tokens) hält die geprüften Claims bis exp, sodass nur der erste Request pro
+Token und Worker die Krypto bezahlt. Widerrufene Tokens (jti) stehen in
+revoked_tokens und im Speicher jedes Workers; Migration 0006 meldet neue
+Einträge per NOTIFY. Der Widerruf wird auch bei Cache-Treffern geprüft.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from jose import JWTError, jwt
+from sqlalchemy.exc import IntegrityError
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models import RevokedToken
+from app.repositories import RevokedTokenRepository
+from app.services.notifications import notification_listener
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+# Ohne Token erreichbar: Probes, Metriken, Doku; /admin hat einen eigenen Guard
+PUBLIC_PATHS = (
+    "/health", "/ready", "/live", "/metrics",
+    "/api/docs", "/api/redoc", "/openapi.json",
+    "/api/v1/admin",
+)
+
+
+def is_public(path: str) -> bool:
+    return path == "/" or path.startswith(PUBLIC_PATHS)
+
+
+class InvalidToken(Exception):
+    """Token fehlt, ist ungültig, abgelaufen oder widerrufen"""
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Geprüfte Claims eines Tokens"""
+
+    subject: str
+    scopes: FrozenSet[str]
+    token_id: str
+    expires_at: float  # Unix-Zeit (Claim exp)
+
+
+class TokenService:
+    """Stellt Tokens aus, prüft sie mit LRU-Cache und führt die Widerrufsliste"""
+
+    def __init__(
+        self,
+        secret_key: str,
+        required: bool = False,
+        algorithm: str = "HS256",
+        expire_minutes: int = 30,
+        cache_size: int = 10000,
+        revocation_ttl: float = 60.0,
+        channel: str = "tokens_revoked",
+        session_factory=AsyncSessionLocal,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.secret_key = secret_key
+        # True = API-Routen nur mit gültigem Token (AUTH_REQUIRED)
+        self.required = required
+        self.algorithm = algorithm
+        self.expire_minutes = expire_minutes
+        self.cache_size = cache_size
+        self.revocation_ttl = revocation_ttl
+        self.channel = channel
+        self.session_factory = session_factory
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[bytes, Principal]" = OrderedDict()
+        # jti -> exp; inf = per NOTIFY gemeldet, exp erst nach dem nächsten Laden bekannt
+        self._revoked: Dict[str, float] = {}
+        self._stale = True
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    # ===== Ausstellen =====
+
+    def issue(
+        self,
+        subject: str,
+        scopes: Iterable[str] = (),
+        expires_minutes: Optional[int] = None,
+    ) -> Tuple[str, Principal]:
+        now = self.clock()
+        principal = Principal(
+            subject=subject,
+            scopes=frozenset(scopes),
+            token_id=uuid.uuid4().hex,
+            expires_at=float(int(now + 60 * (expires_minutes or self.expire_minutes))),
+        )
+        claims = {"sub": subject, "jti": principal.token_id, "iat": int(now), "exp": int(principal.expires_at)}
+        if principal.scopes:
+            claims["scope"] = " ".join(sorted(principal.scopes))
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm), principal
+
+    # ===== Prüfen =====
+
+    def verify(self, token: str) -> Principal:
+        """Claims eines gültigen Tokens; Krypto nur beim ersten Auftreten"""
+        key = hashlib.sha256(token.encode()).digest()
+        principal = self._cache.get(key)
+        if principal is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            principal = self._decode(token)
+            if self.cache_size > 0:
+                self._cache[key] = principal
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        if principal.expires_at <= self.clock():
+            self._cache.pop(key, None)
+            raise InvalidToken("Token expired")
+        if principal.token_id in self._revoked:
+            self._cache.pop(key, None)
+            raise InvalidToken("Token revoked")
+        return principal
+
+    def _decode(self, token: str) -> Principal:
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError as e:
+            raise InvalidToken(str(e)) from None
+        subject, token_id, exp = claims.get("sub"), claims.get("jti"), claims.get("exp")
+        if not isinstance(subject, str) or not isinstance(token_id, str) or not isinstance(exp, (int, float)):
+            raise InvalidToken("Token lacks sub, jti or exp")
+        return Principal(
+            subject=subject,
+            scopes=frozenset(str(claims.get("scope", "")).split()),
+            token_id=token_id,
+            expires_at=float(exp),
+        )
+
+    # ===== Widerruf =====
+
+    def is_revoked(self, token_id: str) -> bool:
+        return token_id in self._revoked
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def on_notify(self, payload: Optional[str]) -> None:
+        if payload is None:
+            # Verbindung neu aufgebaut, Widerrufe evtl. verpasst
+            self.invalidate()
+        else:
+            self._revoked.setdefault(payload, math.inf)
+
+    def replace_revocations(self, revoked: Dict[str, float]) -> None:
+        self._revoked = dict(revoked)
+        self._stale = False
+        self._loaded_at = time.monotonic()
+
+    async def ensure_revocations(self) -> None:
+        """Lädt die Widerrufsliste, wenn sie veraltet ist (single-flight)"""
+        if not self._stale and time.monotonic() - self._loaded_at <= self.revocation_ttl:
+            return
+        async with self._lock:
+            if self._stale or time.monotonic() - self._loaded_at > self.revocation_ttl:
+                await self.load_revocations()
+
+    async def load_revocations(self) -> None:
+        # Vor dem Lesen zurücksetzen, damit ein NOTIFY während des Ladens nicht verloren geht
+        self._stale = False
+        known = set(self._revoked)
+        try:
+            async with self.session_factory() as db:
+                rows = await RevokedTokenRepository(db).list_active(datetime.utcnow())
+        except Exception:
+            self._stale = True
+            if self._loaded_at:
+                logger.exception("Loading revoked tokens failed, keeping previous list")
+                return
+            raise
+        revoked = {row.jti: row.expires_at.replace(tzinfo=timezone.utc).timestamp() for row in rows}
+        # Während des Ladens gemeldete jti fehlen evtl. noch im gelesenen Stand
+        revoked.update({jti: exp for jti, exp in self._revoked.items() if jti not in known and jti not in revoked})
+        self.replace_revocations(revoked)
+
+    async def revoke(self, principal: Principal) -> None:
+        """Widerruft ein Token in allen Workern (DB + NOTIFY) und lokal sofort"""
+        expires_at = datetime.utcfromtimestamp(principal.expires_at)
+        async with self.session_factory() as db:
+            repo = RevokedTokenRepository(db)
+            await repo.prune(datetime.utcnow())
+            try:
+                await repo.add(RevokedToken(jti=principal.token_id, subject=principal.subject, expires_at=expires_at))
+                await repo.commit()
+            except IntegrityError:
+                await db.rollback()  # bereits widerrufen
+        self._revoked[principal.token_id] = principal.expires_at
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        now = self.clock()
+        return {
+            "cache_size": self.cache_size,
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "revoked": sum(1 for exp in self._revoked.values() if exp > now),
+            "revocations_age_s": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+        }
+
+
+# Singleton instance
+token_service = TokenService(
+    settings.SECRET_KEY,
+    required=settings.AUTH_REQUIRED,
+    algorithm=settings.ALGORITHM,
+    expire_minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+    cache_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    revocation_ttl=settings.AUTH_REVOCATION_TTL,
+)
+notification_listener.subscribe(token_service.channel, token_service.on_notify)
@@ -0,0 +1,193 @@
+"""
+🛡️ GUARDIAN - Container-Metriken aus cgroup v2
+Liest cpu.stat, memory.current, io.stat und pids.current direkt aus /sys/fs/cgroup
+"""
+import json
+import os
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+# systemd-Treiber: system.slice/docker-<id>.scope, cgroupfs-Treiber: docker/<id>
+_SCOPE_PATTERN = re.compile(r"^(?:docker|libpod)-([0-9a-f]{64})\.scope$")
+_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class CgroupCollector:
+    """Sammelt Ressourcen-Verbrauch pro Container aus der cgroup-v2-Hierarchie"""
+
+    def __init__(
+        self,
+        root: str = "/sys/fs/cgroup",
+        containers_root: str = "/var/lib/docker/containers",
+        clock: Callable[[], float] = time.monotonic,
+        cpu_count: Optional[int] = None,
+    ):
+        self.root = root
+        self.containers_root = containers_root
+        self.clock = clock
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self._previous: Dict[str, Dict] = {}
+        self._names: Dict[str, Dict] = {}
+
+    def available(self) -> bool:
+        """cgroup v2 ist eingehängt (unified hierarchy)"""
+        return os.path.exists(os.path.join(self.root, "cgroup.controllers"))
+
+    # ===== Discovery =====
+
+    def discover(self) -> Dict[str, str]:
+        """Findet alle Container-Scopes: Container-ID -> cgroup-Pfad"""
+        scopes = {}
+
+        for parent in ("system.slice", "machine.slice"):
+            for entry in self._scandir(os.path.join(self.root, parent)):
+                match = _SCOPE_PATTERN.match(entry.name)
+                if match and entry.is_dir():
+                    scopes[match.group(1)] = entry.path
+
+        for entry in self._scandir(os.path.join(self.root, "docker")):
+            if _ID_PATTERN.match(entry.name) and entry.is_dir():
+                scopes[entry.name] = entry.path
+
+        return scopes
+
+    def _scandir(self, path: str) -> List[os.DirEntry]:
+        try:
+            with os.scandir(path) as it:
+                return list(it)
+        except OSError:
+            return []
+
+    def resolve_name(self, container_id: str) -> Dict:
+        """Ordnet eine Container-ID ihrem Namen und Compose-Service zu (gecacht)"""
+        if container_id in self._names:
+            return self._names[container_id]
+
+        identity = {"name": container_id[:12], "service": None}
+        config_path = os.path.join(self.containers_root, container_id, "config.v2.json")
+        try:
+            with open(config_path) as f:
+                config = json.load(f)
+            identity["name"] = config.get("Name", "").lstrip("/") or identity["name"]
+            labels = (config.get("Config") or {}).get("Labels") or {}
+            identity["service"] = labels.get("com.docker.compose.service")
+        except (OSError, ValueError):
+            pass
+
+        self._names[container_id] = identity
+        return identity
+
+    # ===== Counter =====
+
+    def read_scope(self, path: str) -> Dict:
+        """Liest die Roh-Zähler eines Scopes"""
+        cpu = self._read_keyed(os.path.join(path, "cpu.stat"))
+        io_read, io_write = self._read_io(os.path.join(path, "io.stat"))
+
+        return {
+            "cpu_usage_usec": cpu.get("usage_usec", 0),
+            "memory_current": self._read_int(os.path.join(path, "memory.current")),
+            "memory_max": self._read_int(os.path.join(path, "memory.max")),
+            "io_read_bytes": io_read,
+            "io_write_bytes": io_write,
+            "pids_current": self._read_int(os.path.join(path, "pids.current")),
+        }
+
+    def _read_int(self, path: str) -> Optional[int]:
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            return None
+        # memory.max / pids.max enthalten "max" wenn kein Limit gesetzt ist
+        return int(value) if value.isdigit() else None
+
+    def _read_keyed(self, path: str) -> Dict[str, int]:
+        values = {}
+        try:
+            with open(path) as f:
+                for line in f:
+                    key, _, value = line.partition(" ")
+                    if value.strip().isdigit():
+                        values[key] = int(value)
+        except OSError:
+            pass
+        return values
+
+    def _read_io(self, path: str) -> tuple:
+        """Summiert rbytes/wbytes über alle Block-Devices"""
+        read_bytes = write_bytes = 0
+        try:
+            with open(path) as f:
+                for line in f:
+                    for field in line.split()[1:]:
+                        key, _, value = field.partition("=")
+                        if key == "rbytes":
+                            read_bytes += int(value)
+                        elif key == "wbytes":
+                            write_bytes += int(value)
+        except (OSError, ValueError):
+            pass
+        return read_bytes, write_bytes
+
+    # ===== Sampling =====
+
+    def collect(self) -> List[Dict]:
+        """
+        Liest alle Container und berechnet Raten seit dem letzten Aufruf.
+
+        Beim ersten Sample eines Containers sind die Raten None.
+        """
+        now = self.clock()
+        scopes = self.discover()
+        containers = []
+        current = {}
+
+        for container_id, path in scopes.items():
+            counters = self.read_scope(path)
+            counters["sampled_at"] = now
+            current[container_id] = counters
+
+            identity = self.resolve_name(container_id)
+            entry = {
+                "id": container_id[:12],
+                "name": identity["name"],
+                "service": identity["service"],
+                "cpu_percent": None,
+                "memory": {
+                    "current": counters["memory_current"],
+                    "limit": counters["memory_max"],
+                    "percent": None,
+                },
+                "io": {
+                    "read_bytes": counters["io_read_bytes"],
+                    "write_bytes": counters["io_write_bytes"],
+                    "read_bytes_per_sec": None,
+                    "write_bytes_per_sec": None,
+                },
+                "pids": counters["pids_current"],
+            }
+
+            if counters["memory_current"] is not None and counters["memory_max"]:
+                entry["memory"]["percent"] = counters["memory_current"] / counters["memory_max"] * 100
+
+            previous = self._previous.get(container_id)
+            elapsed = now - previous["sampled_at"] if previous else 0
+            if elapsed > 0:
+                cpu_delta = max(0, counters["cpu_usage_usec"] - previous["cpu_usage_usec"])
+                # Anteil an der gesamten Host-Kapazität, wie psutil.cpu_percent()
+                entry["cpu_percent"] = min(100.0, cpu_delta / (elapsed * 1_000_000 * self.cpu_count) * 100)
+                entry["io"]["read_bytes_per_sec"] = max(
+                    0, counters["io_read_bytes"] - previous["io_read_bytes"]) / elapsed
+                entry["io"]["write_bytes_per_sec"] = max(
+                    0, counters["io_write_bytes"] - previous["io_write_bytes"]) / elapsed
+
+            containers.append(entry)
+
+        # Verschwundene Container vergessen
+        self._previous = current
+        self._names = {cid: ident for cid, ident in self._names.items() if cid in current}
+
+        containers.sort(key=lambda c: c["cpu_percent"] or 0, reverse=True)
+        return containers
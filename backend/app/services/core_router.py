@@ -0,0 +1,95 @@
+"""
+🧠 CORE - Capability-Routing
+Wählt für eine Task den am wenigsten ausgelasteten Agenten mit allen benötigten Capabilities
+"""
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from app.services.agent_load import AgentLoadTracker
+from app.services.agent_registry import AgentSnapshot
+
+
+class NoAgentAvailable(Exception):
+    """Kein aktivierter Agent bietet alle benötigten Capabilities"""
+
+
+class CoreRouter:
+    """
+    Routing über den invertierten Capability-Index der Agent-Registry.
+
+    Kandidaten sind die Schnittmenge der Agenten-Mengen je Capability (kleinste
+    Menge zuerst). Bewertet wird die erwartete Wartezeit
+    (queue_depth + 1) * latency_ms; bei Gleichstand gewinnt der Agent mit
+    weniger Capabilities, damit Generalisten frei bleiben. Jede Entscheidung
+    landet in einem Ringpuffer für die spätere Auswertung.
+    """
+
+    def __init__(self, history_size: int = 1000):
+        self.decisions: Deque[Dict] = deque(maxlen=history_size)
+        self.routed: Counter = Counter()
+        self.unroutable: Counter = Counter()
+        self._next_id = 1
+
+    def candidates(self, agents: AgentSnapshot, capabilities: Iterable[str]) -> List[str]:
+        sets = []
+        for capability in set(capabilities):
+            ids = agents.capability_index.get(capability)
+            if not ids:
+                return []
+            sets.append(ids)
+        if not sets:
+            return []
+        sets.sort(key=len)
+        return sorted(sets[0].intersection(*sets[1:]))
+
+    def score(self, agent_id: str, load: AgentLoadTracker) -> float:
+        return (load.depth(agent_id) + 1) * load.latency_ms(agent_id)
+
+    def route(self, agents: AgentSnapshot, capabilities: List[str], load: AgentLoadTracker) -> Dict:
+        started = time.perf_counter()
+        candidates = self.candidates(agents, capabilities)
+        if not candidates:
+            self.unroutable[",".join(sorted(set(capabilities)))] += 1
+            raise NoAgentAvailable(f"No enabled agent provides {sorted(set(capabilities))}")
+
+        scored = sorted(
+            (
+                {
+                    "agent_id": agent_id,
+                    "score": round(self.score(agent_id, load), 1),
+                    "queue_depth": load.depth(agent_id),
+                    "latency_ms": round(load.latency_ms(agent_id), 1),
+                }
+                for agent_id in candidates
+            ),
+            key=lambda c: (c["score"], len(agents.get(c["agent_id"])["capabilities"]), c["agent_id"]),
+        )
+        chosen = scored[0]
+
+        decision = {
+            "decision_id": self._next_id,
+            "timestamp": time.time(),
+            "capabilities": sorted(set(capabilities)),
+            "agent_id": chosen["agent_id"],
+            "candidates": scored,
+            "registry_version": agents.version,
+            "routing_us": round((time.perf_counter() - started) * 1e6, 1),
+        }
+        self._next_id += 1
+        self.decisions.append(decision)
+        self.routed[chosen["agent_id"]] += 1
+        return decision
+
+    def stats(self, limit: Optional[int] = 50) -> Dict:
+        recent = list(self.decisions)[-limit:] if limit else []
+        return {
+            "total": sum(self.routed.values()),
+            "by_agent": dict(self.routed),
+            "unroutable": dict(self.unroutable),
+            "recent": recent[::-1],
+        }
+
+
+# Singleton instance
+core_router = CoreRouter()
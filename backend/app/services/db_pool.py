@@ -0,0 +1,245 @@
+"""
+NOVA v3 - Connection-Pool Instrumentierung
+Misst Checkout-Wartezeiten, Auslastung, Verbindungsalter und Pre-Ping-Fehler
+und passt die Pool-Größe optional anhand der Wartezeiten an
+"""
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class PoolAutoscaler:
+    """
+    Passt pool_size innerhalb fester Grenzen an.
+
+    Liegt das p95 der Checkout-Wartezeit über dem Ziel, wächst der Pool;
+    wird über ein ganzes Intervall höchstens die Hälfte der Verbindungen
+    gleichzeitig genutzt, schrumpft er wieder.
+    """
+
+    def __init__(self, min_size: int, max_size: int, target_wait_ms: float = 5.0,
+                 interval: float = 10.0, step: int = 2):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_wait = target_wait_ms / 1000
+        self.interval = interval
+        self.step = step
+        self.resizes: Deque[Dict] = deque(maxlen=20)
+
+    def decide(self, size: int, waits: List[float], peak_checked_out: int) -> int:
+        """Neue Pool-Größe für ein abgeschlossenes Intervall"""
+        if not waits:
+            return size
+        if _percentile(waits, 0.95) > self.target_wait and size < self.max_size:
+            return min(self.max_size, size + self.step)
+        if peak_checked_out <= size // 2 and size > self.min_size:
+            return max(self.min_size, size - 1)
+        return size
+
+
+class PoolStats:
+    """Zähler und Wartezeiten eines Pools (thread-safe)"""
+
+    def __init__(self, name: str, window: int = 1024, autoscaler: Optional[PoolAutoscaler] = None):
+        self.name = name
+        self.autoscaler = autoscaler
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.recent_waits: Deque[float] = deque(maxlen=window)
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.connection_ages: Deque[float] = deque(maxlen=window)
+        self._interval_waits: List[float] = []
+        self._interval_peak = 0
+        self._interval_started = time.monotonic()
+
+    def record_checkout(self, wait: float, pool: QueuePool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.recent_waits.append(wait)
+            if self.autoscaler is None:
+                return
+            self._interval_waits.append(wait)
+            self._interval_peak = max(self._interval_peak, pool.checkedout())
+            if time.monotonic() - self._interval_started < self.autoscaler.interval:
+                return
+            waits, peak = self._interval_waits, self._interval_peak
+            self._interval_waits, self._interval_peak = [], 0
+            self._interval_started = time.monotonic()
+
+        size = pool.size()
+        new_size = self.autoscaler.decide(size, waits, peak)
+        if new_size != size:
+            pool.resize(new_size)
+            self.autoscaler.resizes.append({
+                "at": time.time(),
+                "from": size,
+                "to": new_size,
+                "p95_wait_ms": round(_percentile(waits, 0.95) * 1000, 3),
+                "peak_checked_out": peak,
+            })
+
+    def snapshot(self, pool) -> Dict:
+        with self._lock:
+            waits = list(self.recent_waits)
+            ages = list(self.connection_ages)
+            data = {
+                "checkouts": self.checkouts,
+                "wait_ms": {
+                    "avg": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                    "p50": round(_percentile(waits, 0.50) * 1000, 3),
+                    "p95": round(_percentile(waits, 0.95) * 1000, 3),
+                    "p99": round(_percentile(waits, 0.99) * 1000, 3),
+                    "max": round(self.wait_max * 1000, 3),
+                },
+                "connections_opened": self.connects,
+                "connections_closed": self.closes,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "connection_age_seconds": {
+                    "avg": round(sum(ages) / len(ages), 1) if ages else 0.0,
+                    "max": round(max(ages), 1) if ages else 0.0,
+                },
+            }
+
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": pool._max_overflow,
+            })
+        if self.autoscaler is not None:
+            data["adaptive"] = {
+                "min_size": self.autoscaler.min_size,
+                "max_size": self.autoscaler.max_size,
+                "target_wait_ms": self.autoscaler.target_wait * 1000,
+                "resizes": list(self.autoscaler.resizes),
+            }
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """Misst die Zeit, die ein Aufrufer auf eine Verbindung wartet"""
+
+    stats: Optional[PoolStats] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        connection = super().connect()
+        if self.stats is not None:
+            self.stats.record_checkout(time.perf_counter() - started, self)
+        return connection
+
+    def resize(self, pool_size: int) -> None:
+        """
+        Ändert pool_size zur Laufzeit.
+
+        Nutzt die Interna von QueuePool: die Queue-Kapazität und der
+        Overflow-Zähler (startet bei -pool_size) werden gemeinsam verschoben.
+        Überzählige freie Verbindungen werden sofort geschlossen, ausgeliehene
+        beim Zurückgeben.
+        """
+        excess = []
+        with self._overflow_lock:
+            delta = pool_size - self._pool.maxsize
+            self._pool.maxsize = pool_size
+            self._overflow -= delta
+            # AsyncAdaptedQueue legt seine asyncio.Queue lazy mit fester Kapazität an
+            queue = self._pool.__dict__.get("_queue")
+            if queue is not None:
+                queue._maxsize = pool_size
+            while self._pool.qsize() > pool_size:
+                try:
+                    excess.append(self._pool.get(False))
+                except sqla_queue.Empty:
+                    break
+                self._overflow -= 1
+        for record in excess:
+            record.close()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class PoolMonitor:
+    """Registriert Pool-Events für alle Engines und liefert Snapshots"""
+
+    def __init__(self):
+        self.engines: Dict[str, Engine] = {}
+        self.stats: Dict[str, PoolStats] = {}
+
+    def attach(self, engine: Engine, name: str, autoscaler: Optional[PoolAutoscaler] = None) -> PoolStats:
+        stats = PoolStats(name, autoscaler=autoscaler)
+        if isinstance(engine.pool, _InstrumentedPoolMixin):
+            engine.pool.stats = stats
+
+        @event.listens_for(engine.pool, "connect")
+        def on_connect(dbapi_connection, record):
+            record.info["nova_created_at"] = time.monotonic()
+            with stats._lock:
+                stats.connects += 1
+
+        @event.listens_for(engine.pool, "checkout")
+        def on_checkout(dbapi_connection, record, proxy):
+            created = record.info.get("nova_created_at")
+            if created is not None:
+                with stats._lock:
+                    stats.connection_ages.append(time.monotonic() - created)
+
+        @event.listens_for(engine.pool, "close")
+        def on_close(dbapi_connection, record):
+            with stats._lock:
+                stats.closes += 1
+
+        @event.listens_for(engine.pool, "invalidate")
+        def on_invalidate(dbapi_connection, record, exception):
+            with stats._lock:
+                stats.invalidations += 1
+
+        @event.listens_for(engine, "handle_error")
+        def on_error(context):
+            if context.is_pre_ping:
+                with stats._lock:
+                    stats.pre_ping_failures += 1
+
+        self.engines[name] = engine
+        self.stats[name] = stats
+        return stats
+
+    def snapshot(self) -> Dict:
+        return {name: self.stats[name].snapshot(engine.pool) for name, engine in self.engines.items()}
+
+
+# Singleton instance
+pool_monitor = PoolMonitor()
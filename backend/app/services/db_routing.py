@@ -0,0 +1,186 @@
+"""
+NOVA v3 - Read-Replica Routing
+Leseabfragen gehen reihum an gesunde Replicas, Schreibzugriffe an den Primary
+"""
+import asyncio
+import itertools
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+_SELECT = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+
+
+class ReplicaRouter:
+    """
+    Wählt Engines für Lese- und Schreibzugriffe.
+
+    Replicas werden per Round-Robin verteilt; fällt eine aus (Verbindungsfehler
+    oder fehlgeschlagener Check), wird sie für retry_after Sekunden übersprungen.
+    Nach einem Schreibzugriff liest derselbe Client für pin_seconds vom Primary
+    (read-your-writes).
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Optional[List[AsyncEngine]] = None,
+        read_your_writes: bool = True,
+        pin_seconds: float = 5.0,
+        retry_after: float = 10.0,
+        max_pins: int = 10000,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.read_your_writes = read_your_writes
+        self.pin_seconds = pin_seconds
+        self.retry_after = retry_after
+        self.max_pins = max_pins
+        self._cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._unhealthy_until: Dict[int, float] = {}
+        self._pins: "OrderedDict[str, float]" = OrderedDict()
+        self._checker: Optional[asyncio.Task] = None
+
+        for index, replica in enumerate(self.replicas):
+            self._watch(index, replica)
+
+    def _watch(self, index: int, replica: AsyncEngine) -> None:
+        @event.listens_for(replica.sync_engine, "handle_error")
+        def on_error(context):
+            # Veraltete Verbindungen erkennt pre_ping selbst, nur echte Ausfälle zählen
+            if context.is_pre_ping:
+                return
+            if context.is_disconnect or context.connection is None:
+                self.mark_unhealthy(index)
+
+    # ===== Auswahl =====
+
+    def reader(self, pin_key: Optional[str] = None) -> AsyncEngine:
+        """Engine für eine Leseabfrage"""
+        if not self.replicas or self.is_pinned(pin_key):
+            return self.primary
+
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            index = next(self._cycle)
+            if self._unhealthy_until.get(index, 0) <= now:
+                return self.replicas[index]
+
+        # Alle Replicas ausgefallen: Primary übernimmt die Lesezugriffe
+        return self.primary
+
+    def mark_unhealthy(self, index: int) -> None:
+        if self._unhealthy_until.get(index, 0) <= time.monotonic():
+            logger.warning(f"Replica {index} marked unhealthy for {self.retry_after}s")
+        self._unhealthy_until[index] = time.monotonic() + self.retry_after
+
+    def mark_healthy(self, index: int) -> None:
+        self._unhealthy_until.pop(index, None)
+
+    # ===== Read-your-writes =====
+
+    def pin(self, pin_key: Optional[str]) -> None:
+        """Nach einem Schreibzugriff liest der Client eine Weile vom Primary"""
+        if not self.read_your_writes or not pin_key or not self.replicas:
+            return
+        self._pins[pin_key] = time.monotonic() + self.pin_seconds
+        self._pins.move_to_end(pin_key)
+        while len(self._pins) > self.max_pins:
+            self._pins.popitem(last=False)
+
+    def is_pinned(self, pin_key: Optional[str]) -> bool:
+        if not pin_key:
+            return False
+        until = self._pins.get(pin_key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._pins[pin_key]
+            return False
+        return True
+
+    # ===== Health-Checks =====
+
+    async def check_replicas(self, timeout: float = 1.0) -> Dict[int, bool]:
+        """Prüft alle Replicas parallel mit SELECT 1"""
+        async def probe(index: int, replica: AsyncEngine) -> bool:
+            try:
+                async with replica.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=timeout)
+            except Exception:
+                self.mark_unhealthy(index)
+                return False
+            self.mark_healthy(index)
+            return True
+
+        results = await asyncio.gather(*(probe(i, r) for i, r in enumerate(self.replicas)))
+        return dict(enumerate(results))
+
+    async def _check_loop(self, interval: float) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = 5.0) -> None:
+        if self.replicas and self._checker is None:
+            self._checker = asyncio.create_task(self._check_loop(interval))
+
+    async def stop(self) -> None:
+        if self._checker is not None:
+            self._checker.cancel()
+            self._checker = None
+
+    def status(self) -> List[Dict]:
+        now = time.monotonic()
+        return [
+            {
+                "replica": index,
+                "url": replica.url.render_as_string(hide_password=True),
+                "healthy": self._unhealthy_until.get(index, 0) <= now,
+            }
+            for index, replica in enumerate(self.replicas)
+        ]
+
+
+class RoutingSession(Session):
+    """
+    Session, die SELECTs an eine Replica und alles andere an den Primary bindet.
+
+    Die Replica wird einmal pro Session gewählt, damit alle Lesezugriffe einer
+    Anfrage denselben Stand sehen. Nach dem ersten Schreibzugriff bleibt die
+    Session auf dem Primary. Mit info["primary"] liest die Session nie von
+    Replicas, merkt sich Schreibzugriffe aber trotzdem für read-your-writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router: ReplicaRouter = self.info["router"]
+        is_read = not self._flushing and self._is_read(clause)
+        if not is_read:
+            self._mark_write()
+        if not is_read or self.info.get("wrote") or self.info.get("primary"):
+            return router.primary.sync_engine
+
+        if "reader" not in self.info:
+            self.info["reader"] = router.reader(self.info.get("pin_key"))
+        return self.info["reader"].sync_engine
+
+    def _is_read(self, clause) -> bool:
+        if clause is None:
+            return False
+        if isinstance(clause, TextClause):
+            return bool(_SELECT.match(clause.text))
+        return getattr(clause, "is_select", False) and getattr(clause, "_for_update_arg", None) is None
+
+    def _mark_write(self) -> None:
+        if not self.info.get("wrote"):
+            self.info["wrote"] = True
+            self.info["router"].pin(self.info.get("pin_key"))
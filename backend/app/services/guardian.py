@@ -2,26 +2,147 @@
 🛡️ GUARDIAN Service - Extended Monitoring & Security
 Erweiterte Überwachung, Predictive Resource-Management und Security-Scans
 """
+import logging
 import psutil
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, List, Optional
 from datetime import datetime
 
+from app.config import get_settings
+from app.services.anomaly import AnomalyDetector
+from app.services.cgroups import CgroupCollector
+from app.services.shared_state import SharedSampler
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsUnavailable(Exception):
+    """Es liegt noch kein Sample vor, und dieser Worker misst nicht selbst"""
+
 
 class GuardianService:
     """GUARDIAN Agent - Monitoring, Security & Resource Management"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        container_collector: Optional[CgroupCollector] = None,
+        anomaly_detector: Optional[AnomalyDetector] = None,
+    ):
         self.alert_thresholds = {
             "cpu": 80.0,  # %
             "memory": 85.0,  # %
             "disk": 90.0,  # %
+            "container_cpu": 50.0,  # % der Host-Kapazität
+            "container_memory": 90.0,  # % des Container-Limits
         }
         self.prediction_window = 300  # 5 minutes
+        # Wird bei jedem Sample ersetzt statt verändert, Leser sehen immer eine ganze Liste
         self.metrics_history = []
+        self.pressure_ttl = 1.0  # Sekunden
+        self.pressure_alpha = 0.3  # EWMA-Gewicht pro Messwert
+        self._cpu_times: Optional[tuple] = None
+        self._pressure: Optional[Dict] = None
+        self._pressure_at = 0.0
+        # Multi-Worker-Betrieb: Snapshot aus dem Shared-Memory-Segment statt eigener Samples
+        self.shared: Optional[SharedSampler] = None
+        # Letztes eigenes Sample; nur sample() misst (Historie, Anomalie-Statistik, cgroup-Raten)
+        self._latest: Optional[Dict] = None
+        self._latest_at = 0.0
+        self._sample_lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        settings = get_settings()
+        self.sample_interval = settings.GUARDIAN_SAMPLE_INTERVAL
+        if container_collector is None:
+            container_collector = CgroupCollector(settings.CGROUP_ROOT, settings.DOCKER_CONTAINERS_ROOT)
+        if anomaly_detector is None:
+            anomaly_detector = AnomalyDetector(
+                alpha=settings.ANOMALY_ALPHA,
+                threshold=settings.ANOMALY_THRESHOLD,
+                seasonal=settings.ANOMALY_SEASONAL,
+            )
+        self.container_collector = container_collector
+        self.anomaly_detector = anomaly_detector
 
     # ===== System Monitoring =====
 
     def get_system_metrics(self) -> Dict:
+        """
+        Letztes Sample (geteilt oder vom lokalen Sampler), notfalls veraltet.
+
+        Gemessen wird hier nur, wenn ohne Shared State noch nie ein Sample
+        entstanden ist; das blockiert, Endpunkte rufen es deshalb im Thread
+        auf. Follower messen nie selbst, sonst führten sie eigene Historie
+        und Anomalie-Statistik.
+        """
+        metrics = self.latest_metrics()
+        if metrics is not None:
+            return metrics
+        if self.shared is not None:
+            raise MetricsUnavailable("No Guardian sample published yet")
+        return self.sample()
+
+    def latest_metrics(self) -> Optional[Dict]:
+        """Letztes Sample ohne neue Messung (veraltete mit "stale"); None, wenn es keins gibt"""
+        if self.shared is not None:
+            last = self.shared.last()
+            if last is None:
+                return None
+            snapshot, age = last
+            if age <= self.shared.stale_after:
+                return snapshot["metrics"]
+            # Leader weg oder Übernahme läuft: lieber alt als eine eigene, abweichende Statistik
+            return {**snapshot["metrics"], "stale": True, "age_seconds": round(age, 3)}
+        if self._latest is None:
+            return None
+        age = time.monotonic() - self._latest_at
+        if age <= self.sample_interval * 3:
+            return self._latest
+        return {**self._latest, "stale": True, "age_seconds": round(age, 3)}
+
+    def sample(self) -> Dict:
+        """
+        Misst einmal und schreibt Historie, Anomalie-Statistik und cgroup-Raten fort.
+
+        Blockiert (cpu_percent misst eine Sekunde); der Sampler ruft es in
+        seinem Thread auf. Hat ein anderer Thread gemessen, während wir auf das
+        Lock gewartet haben, wird dessen Sample übernommen.
+        """
+        requested = time.monotonic()
+        with self._sample_lock:
+            if self._latest is not None and self._latest_at >= requested:
+                return self._latest
+            metrics = self._sample_system_metrics()
+            self._latest, self._latest_at = metrics, time.monotonic()
+            return metrics
+
+    def start_sampler(self) -> None:
+        """Sampler-Thread (ohne Shared State); Endpunkte lesen sein letztes Sample"""
+        if self._sampler is not None:
+            return
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, args=(self._stop,), name="guardian-sampler",
+                                         daemon=True)
+        self._sampler.start()
+
+    def stop_sampler(self) -> None:
+        # Nicht joinen: eine laufende Messung endet nach spätestens einer Sekunde von selbst
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler = None
+
+    def _sample_loop(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Guardian sampler failed: {e}")
+            stop.wait(max(0.0, self.sample_interval - (time.monotonic() - started)))
+
+    def _sample_system_metrics(self) -> Dict:
         """Sammelt aktuelle System-Metriken"""
         cpu_percent = psutil.cpu_percent(interval=1)
         memory = psutil.virtual_memory()
@@ -47,15 +168,88 @@ class GuardianService:
                 "percent": disk.percent,
             },
             "network": self._get_network_stats(),
+            "containers": self._collect_containers(),
         }
+        metrics["anomalies"] = self.anomaly_detector.observe_many(self._anomaly_inputs(metrics))
 
-        # Store in history for predictions
-        self.metrics_history.append(metrics)
-        if len(self.metrics_history) > 100:  # Keep last 100 entries
-            self.metrics_history.pop(0)
+        # Store in history for predictions (keep last 100 entries)
+        self.metrics_history = [*self.metrics_history[-99:], metrics]
 
         return metrics
 
+    # ===== Shared State (Multi-Worker) =====
+
+    def attach_shared(self, sampler: SharedSampler) -> None:
+        """Ein gewählter Worker sampelt, alle lesen denselben Snapshot"""
+        self.shared = sampler
+        sampler.start(self.shared_snapshot)
+
+    async def detach_shared(self) -> None:
+        if self.shared is not None:
+            await self.shared.stop()
+            self.shared = None
+
+    def shared_snapshot(self) -> Dict:
+        """Payload für das Segment: volles letztes Sample, kompakte Historie, Pressure"""
+        metrics = self.sample()
+        return {
+            "metrics": metrics,
+            "history": [
+                {
+                    "timestamp": m["timestamp"],
+                    "cpu": {"percent": m["cpu"]["percent"]},
+                    "memory": {"percent": m["memory"]["percent"]},
+                    "disk": {"percent": m["disk"]["percent"]},
+                }
+                for m in self.metrics_history
+            ],
+            "pressure": self._local_pressure(),
+        }
+
+    def _shared_snapshot(self) -> Optional[Dict]:
+        """Letzter geteilter Snapshot, auch veraltet; Follower fallen nie auf eigene Messungen zurück"""
+        if self.shared is None:
+            return None
+        last = self.shared.last()
+        return last[0] if last is not None else None
+
+    def _history(self) -> List[Dict]:
+        snapshot = self._shared_snapshot()
+        return snapshot["history"] if snapshot is not None else self.metrics_history
+
+    def get_pressure(self) -> Dict:
+        """Günstige CPU-/Memory-Auslastung für Hot Paths (Admission Control)"""
+        # Nur frischer Druck zählt; der lokale Messwert ist billig und schreibt keine Statistik fort
+        snapshot = self.shared.read() if self.shared is not None else None
+        if snapshot is not None:
+            return snapshot["pressure"]
+        return self._local_pressure()
+
+    def _local_pressure(self) -> Dict:
+        """
+        Lokal gemessene CPU-/Memory-Auslastung.
+
+        Die CPU-Last kommt aus eigenen cpu_times()-Deltas (cpu_percent teilt seine
+        Basis mit allen anderen Aufrufern) und wird geglättet, damit kurze Spitzen
+        nicht sofort zu Load Shedding führen. Höchstens ein Messwert pro pressure_ttl.
+        """
+        now = time.monotonic()
+        if self._pressure is None or now - self._pressure_at >= self.pressure_ttl:
+            times = psutil.cpu_times()
+            total = sum(times)
+            idle = times.idle + getattr(times, "iowait", 0.0)
+            cpu = self._pressure["cpu"] if self._pressure else 0.0
+            if self._cpu_times is not None and total > self._cpu_times[0]:
+                busy = 100.0 * (1 - (idle - self._cpu_times[1]) / (total - self._cpu_times[0]))
+                cpu += self.pressure_alpha * (busy - cpu)
+            self._cpu_times = (total, idle)
+            self._pressure = {
+                "cpu": round(cpu, 1),
+                "memory": psutil.virtual_memory().percent,
+            }
+            self._pressure_at = now
+        return self._pressure
+
     def _get_network_stats(self) -> Dict:
         """Netzwerk-Statistiken"""
         net_io = psutil.net_io_counters()
@@ -66,6 +260,30 @@ class GuardianService:
             "packets_recv": net_io.packets_recv,
         }
 
+    def _anomaly_inputs(self, metrics: Dict) -> Dict[str, Optional[float]]:
+        """Metriken, die der Anomalie-Detektor pro Sample bewertet"""
+        values = {
+            "cpu": metrics["cpu"]["percent"],
+            "memory": metrics["memory"]["percent"],
+            "disk": metrics["disk"]["percent"],
+        }
+        for container in metrics["containers"]:
+            values[f"container:{container['name']}:cpu"] = container["cpu_percent"]
+            values[f"container:{container['name']}:memory"] = container["memory"]["current"] / 1024 ** 2 \
+                if container["memory"]["current"] is not None else None
+        return values
+
+    def get_container_metrics(self) -> List[Dict]:
+        """Ressourcen-Verbrauch pro Container (cgroup v2) aus dem letzten Sample"""
+        return self.get_system_metrics().get("containers", [])
+
+    def _collect_containers(self) -> List[Dict]:
+        # Raten gelten seit dem letzten Aufruf, deshalb nur aus sample()
+        try:
+            return self.container_collector.collect()
+        except OSError:
+            return []
+
     def get_process_list(self) -> List[Dict]:
         """Liste aller laufenden Prozesse"""
         processes = []
@@ -84,7 +302,8 @@ class GuardianService:
     def predict_resource_usage(self, minutes_ahead: int = 5) -> Dict:
         """Vorhersage der Ressourcen-Nutzung basierend auf historischen Daten"""
         # If not enough historical data, return a best-effort prediction with low confidence
-        if len(self.metrics_history) < 10:
+        history = self._history()
+        if len(history) < 10:
             current = self.get_system_metrics()
             return {
                 "timestamp": datetime.utcnow().isoformat(),
@@ -111,7 +330,7 @@ class GuardianService:
             }
 
         # Simple linear prediction based on recent trend
-        recent_metrics = self.metrics_history[-10:]
+        recent_metrics = history[-10:]
 
         cpu_trend = self._calculate_trend([m["cpu"]["percent"] for m in recent_metrics])
         memory_trend = self._calculate_trend([m["memory"]["percent"] for m in recent_metrics])
@@ -216,6 +435,57 @@ class GuardianService:
             ]
         }
 
+    # ===== Alerts =====
+
+    def get_alerts(self, metrics: Optional[Dict] = None) -> List[Dict]:
+        """Aktuelle Alerts auf Basis des letzten (oder übergebenen) Metrik-Samples"""
+        return self._evaluate_alerts(metrics if metrics is not None else self.get_system_metrics())
+
+    def _evaluate_alerts(self, metrics: Dict) -> List[Dict]:
+        """Prüft Host- und Container-Metriken gegen die Schwellwerte"""
+        alerts = []
+
+        for resource, severity in (("cpu", "warning"), ("memory", "warning"), ("disk", "critical")):
+            value = metrics[resource]["percent"]
+            if value > self.alert_thresholds[resource]:
+                alerts.append({
+                    "type": resource,
+                    "severity": severity,
+                    "value": value,
+                    "message": f"High {resource} usage: {value:.1f}%"
+                })
+
+        alerts.extend(self._evaluate_container_alerts(metrics.get("containers", [])))
+        alerts.extend(metrics.get("anomalies", []))
+        return alerts
+
+    def _evaluate_container_alerts(self, containers: List[Dict]) -> List[Dict]:
+        """Alerts für einzelne Container"""
+        alerts = []
+
+        for container in containers:
+            cpu = container["cpu_percent"]
+            if cpu is not None and cpu > self.alert_thresholds["container_cpu"]:
+                alerts.append({
+                    "type": "container_cpu",
+                    "severity": "warning",
+                    "container": container["name"],
+                    "value": cpu,
+                    "message": f"Container {container['name']} CPU usage: {cpu:.1f}%"
+                })
+
+            memory = container["memory"]["percent"]
+            if memory is not None and memory > self.alert_thresholds["container_memory"]:
+                alerts.append({
+                    "type": "container_memory",
+                    "severity": "warning",
+                    "container": container["name"],
+                    "value": memory,
+                    "message": f"Container {container['name']} memory usage: {memory:.1f}% of limit"
+                })
+
+        return alerts
+
     # ===== Health Checks =====
 
     def health_check(self) -> Dict:
@@ -239,6 +509,16 @@ class GuardianService:
             status = "critical"
             issues.append(f"High disk usage: {metrics['disk']['percent']:.1f}%")
 
+        for alert in self._evaluate_container_alerts(metrics.get("containers", [])):
+            if status == "healthy":
+                status = "warning"
+            issues.append(alert["message"])
+
+        for anomaly in metrics.get("anomalies", []):
+            if status == "healthy":
+                status = "warning"
+            issues.append(anomaly["message"])
+
         return {
             "status": status,
             "timestamp": datetime.utcnow().isoformat(),
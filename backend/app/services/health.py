@@ -0,0 +1,132 @@
+"""
+NOVA v3 - Health Check Service
+Prüft Abhängigkeiten (Postgres, Redis, ai-service) parallel mit Timeouts und cacht das Ergebnis
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+import psutil
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+
+class HealthService:
+    """Nicht-blockierende Health-Checks mit kurzem Ergebnis-Cache"""
+
+    def __init__(self, timeout: float = 1.0, cache_ttl: float = 2.0,
+                 redis_url: str = "", ai_service_url: str = ""):
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.redis_url = redis_url
+        self.ai_service_url = ai_service_url.rstrip("/")
+        self.started_at = time.monotonic()
+        self._cached: Optional[Dict] = None
+        self._cached_at = 0.0
+        self._lock = asyncio.Lock()
+        self._http: Optional[httpx.AsyncClient] = None
+
+    # ===== Einzelne Checks =====
+
+    async def check_database(self, db: AsyncSession) -> None:
+        await db.execute(text("SELECT 1"))
+
+    async def check_redis(self) -> None:
+        url = urlparse(self.redis_url)
+        reader, writer = await asyncio.open_connection(url.hostname or "localhost", url.port or 6379)
+        try:
+            if url.password:
+                writer.write(self._resp("AUTH", url.password))
+                reply = await reader.readline()
+                if not reply.startswith(b"+OK"):
+                    raise ConnectionError(f"Redis AUTH failed: {reply.decode(errors='replace').strip()}")
+            writer.write(self._resp("PING"))
+            reply = await reader.readline()
+            if not reply.startswith(b"+PONG"):
+                raise ConnectionError(f"Unexpected Redis reply: {reply.decode(errors='replace').strip()}")
+        finally:
+            writer.close()
+
+    def _resp(self, *args: str) -> bytes:
+        """Kodiert ein Redis-Kommando im RESP-Format"""
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            encoded = arg.encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(encoded), encoded))
+        return b"".join(parts)
+
+    async def check_ai_service(self) -> None:
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._http.get(f"{self.ai_service_url}/health")
+        response.raise_for_status()
+
+    async def _timed(self, check: Callable[[], Awaitable[None]]) -> Dict:
+        """Führt einen Check mit Timeout aus und misst die Latenz"""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+            result = {"status": "healthy"}
+        except asyncio.TimeoutError:
+            result = {"status": "unhealthy", "error": f"timeout after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": "unhealthy", "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    # ===== Aggregation =====
+
+    async def run_checks(self, db: AsyncSession) -> Dict:
+        """Alle Abhängigkeiten parallel prüfen (Ergebnis wird cache_ttl Sekunden gecacht)"""
+        if self._cached is not None and time.monotonic() - self._cached_at < self.cache_ttl:
+            return self._cached
+
+        async with self._lock:
+            # Parallele Anfragen teilen sich eine Prüfung
+            if self._cached is not None and time.monotonic() - self._cached_at < self.cache_ttl:
+                return self._cached
+
+            checks = {"database": lambda: self.check_database(db)}
+            if self.redis_url:
+                checks["redis"] = self.check_redis
+            if self.ai_service_url:
+                checks["ai_service"] = self.check_ai_service
+
+            results = await asyncio.gather(*(self._timed(check) for check in checks.values()))
+            self._cached = dict(zip(checks.keys(), results))
+            self._cached_at = time.monotonic()
+            return self._cached
+
+    def invalidate(self) -> None:
+        self._cached = None
+
+    def system_metrics(self) -> Dict:
+        """Host-Metriken ohne Blockieren (CPU seit dem letzten Aufruf)"""
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_percent": psutil.disk_usage('/').percent,
+        }
+
+    def uptime(self) -> float:
+        return time.monotonic() - self.started_at
+
+    async def close(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+settings = get_settings()
+
+# Singleton instance
+health_service = HealthService(
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    cache_ttl=settings.HEALTH_CACHE_TTL,
+    redis_url=settings.REDIS_URL,
+    ai_service_url=settings.AI_SERVICE_URL,
+)
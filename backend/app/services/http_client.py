@@ -0,0 +1,274 @@
+"""
+NOVA v3 - HTTP-Client für Wizard-API-Calls
+Ein geteilter httpx.AsyncClient mit Keep-Alive statt einer Verbindung pro Aufruf
+
+Workflows rufen Backend, ai-service und n8n oft dutzendfach hintereinander
+auf; der gemeinsame Client hält die Verbindungen offen (optional HTTP/2,
+wenn h2 installiert ist). Ein Semaphore pro Host begrenzt die gleichzeitigen
+Anfragen und damit die Verbindungen je Ziel. Idempotente Methoden werden bei
+Transportfehlern und 502/503/504 mit Backoff plus Jitter wiederholt, damit
+viele Workflows einen wackelnden Dienst nicht im Gleichtakt erneut treffen.
+Antworten werden gestreamt und ab max_response_bytes abgebrochen.
+
+Ziele sind auf freigegebene Hosts beschränkt (leer = keine), Weiterleitungen
+werden nicht verfolgt: Workflow-Definitionen kommen von außen und dürfen den
+Client nicht als Proxy zu internen Diensten oder Metadaten-Endpunkten nutzen.
+"""
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import SplitResult, urlsplit
+
+import httpx
+import orjson
+
+from app.config import get_settings
+from app.services.request_metrics import LATENCY_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Wiederholbar ohne Nebenwirkungen (RFC 9110, Abschnitt 9.2.2)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+# Vorübergehende Fehler eines Gateways oder überlasteten Dienstes
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class HttpCallError(Exception):
+    """Anfrage ungültig, gescheitert, zu groß oder mit Fehlerstatus beantwortet"""
+
+
+class HostStats:
+    """Zähler und Latenz-Histogramm für einen Host"""
+
+    __slots__ = ("requests", "errors", "retries", "in_flight", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+    def snapshot(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "in_flight": self.in_flight,
+            "avg_ms": round(self.latency.sum / self.latency.count * 1000, 2) if self.latency.count else 0.0,
+            "p50_ms": round(self.latency.quantile(0.5) * 1000, 2),
+            "p95_ms": round(self.latency.quantile(0.95) * 1000, 2),
+        }
+
+
+class HttpClientPool:
+    """Geteilter AsyncClient mit Limits pro Host, Retries und Latenz-Statistik"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_per_host: int = 10,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 10.0,
+        max_response_bytes: int = 1024 * 1024,
+        retries: int = 2,
+        backoff: float = 0.2,
+        backoff_max: float = 5.0,
+        allowed_hosts: Iterable[str] = (),
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and self._h2_available()
+        self.timeout = timeout
+        self.max_response_bytes = max_response_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        # Erlaubte Ziele als "host" (jeder Port) oder "host:port"
+        self.allowed_hosts = frozenset(host.lower() for host in allowed_hosts if host)
+        # Für Tests (httpx.MockTransport)
+        self.transport = transport
+        self.rng = rng
+        self.hosts: Dict[str, HostStats] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _h2_available() -> bool:
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+            return False
+        return True
+
+    def client(self) -> httpx.AsyncClient:
+        # Erst im laufenden Event-Loop anlegen
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                timeout=self.timeout,
+                # Eine Weiterleitung könnte die Host-Freigabe umgehen
+                follow_redirects=False,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._slots.clear()
+
+    # ===== Anfragen =====
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json: Any = None,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        max_response_bytes: Optional[int] = None,
+        retries: Optional[int] = None,
+    ) -> Dict:
+        """
+        Sendet eine Anfrage über den geteilten Client.
+
+        Returns:
+            status_code, response (JSON oder Text), bytes, attempts, elapsed_ms
+
+        Raises:
+            HttpCallError: Ungültige URL, Host nicht freigegeben, Transportfehler, Antwort zu groß oder Status >= 400
+        """
+        method = method.upper()
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise HttpCallError(f"endpoint must be an absolute http(s) URL, got '{url}'")
+        host = self._check_host(parts)
+        timeout = timeout or self.timeout
+        limit = min(max_response_bytes or self.max_response_bytes, self.max_response_bytes)
+        retries = self.retries if retries is None else retries
+        if method not in IDEMPOTENT_METHODS:
+            retries = 0
+
+        stats = self.hosts.setdefault(host, HostStats())
+        slot = self._slots.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        kwargs = {"json": json, "params": params, "headers": headers}
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            async with slot:
+                stats.requests += 1
+                stats.in_flight += 1
+                sent = time.perf_counter()
+                try:
+                    status, body, content_type = await asyncio.wait_for(
+                        self._send(method, url, kwargs, timeout, limit), timeout
+                    )
+                except (httpx.TransportError, asyncio.TimeoutError) as e:
+                    stats.errors += 1
+                    if attempt > retries:
+                        raise HttpCallError(f"{method} {url} failed: {str(e) or type(e).__name__}") from None
+                    status = None
+                except HttpCallError:
+                    stats.errors += 1
+                    raise
+                finally:
+                    stats.in_flight -= 1
+                    stats.latency.observe(time.perf_counter() - sent)
+            if status is None or (status in RETRY_STATUSES and attempt <= retries):
+                stats.retries += 1
+                await asyncio.sleep(self._backoff_delay(attempt))
+                continue
+            break
+
+        if status >= 400:
+            stats.errors += 1
+            raise HttpCallError(f"{method} {url} returned {status}")
+        return {
+            "status_code": status,
+            "response": self._decode(body, content_type),
+            "bytes": len(body),
+            "attempts": attempt,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _check_host(self, parts: SplitResult) -> str:
+        """host:port des Ziels, wenn es freigegeben ist"""
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+        except ValueError:
+            raise HttpCallError(f"endpoint has an invalid port: '{parts.netloc}'") from None
+        hostname = parts.hostname
+        host = f"{hostname}:{port}"
+        if hostname not in self.allowed_hosts and host not in self.allowed_hosts:
+            raise HttpCallError(f"Host '{host}' is not allowed (WIZARD_HTTP_ALLOWED_HOSTS)")
+        return host
+
+    async def _send(
+        self, method: str, url: str, kwargs: Dict, timeout: float, limit: int
+    ) -> Tuple[int, bytes, str]:
+        async with self.client().stream(method, url, timeout=timeout, **kwargs) as response:
+            declared = response.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > limit:
+                raise HttpCallError(f"{method} {url}: response of {declared} bytes exceeds {limit}")
+            chunks = []
+            received = 0
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                if received > limit:
+                    raise HttpCallError(f"{method} {url}: response exceeds {limit} bytes")
+                chunks.append(chunk)
+            return response.status_code, b"".join(chunks), response.headers.get("content-type", "")
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full Jitter: zufällig zwischen 0 und dem exponentiellen Backoff"""
+        return self.rng() * min(self.backoff_max, self.backoff * 2 ** (attempt - 1))
+
+    @staticmethod
+    def _decode(body: bytes, content_type: str) -> Any:
+        if "json" in content_type:
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return body.decode(errors="replace")
+
+    def stats(self) -> Dict:
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_per_host": self.max_per_host,
+            "allowed_hosts": sorted(self.allowed_hosts),
+            "hosts": {host: stats.snapshot() for host, stats in self.hosts.items()},
+        }
+
+
+# Singleton instance
+http_pool = HttpClientPool(
+    max_connections=settings.WIZARD_HTTP_MAX_CONNECTIONS,
+    max_per_host=settings.WIZARD_HTTP_MAX_PER_HOST,
+    max_keepalive=settings.WIZARD_HTTP_KEEPALIVE,
+    http2=settings.WIZARD_HTTP2,
+    timeout=settings.WIZARD_HTTP_TIMEOUT,
+    max_response_bytes=settings.WIZARD_HTTP_MAX_RESPONSE_BYTES,
+    retries=settings.WIZARD_HTTP_RETRIES,
+    # Der ai-service ist immer erreichbar, wenn er konfiguriert ist
+    allowed_hosts=[*settings.WIZARD_HTTP_ALLOWED_HOSTS, urlsplit(settings.AI_SERVICE_URL).netloc],
+)
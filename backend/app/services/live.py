@@ -0,0 +1,291 @@
+"""
+NOVA v3 - Live-Kanal für das Dashboard
+Ein Broadcaster-Task sammelt pro Intervall den Zustand jedes abonnierten Topics
+und verteilt Änderungen an alle WebSocket-Clients
+
+Der erste Frame pro Topic enthält den vollen Zustand, danach nur noch einen
+JSON Merge Patch (RFC 7386: geänderte Schlüssel mit neuem Wert, entfernte mit
+null). Jeder Frame wird einmal kodiert und an alle Clients verteilt; pro Client
+bleibt nur ein put_nowait. Clients, deren Queue voll ist, werden getrennt statt
+gepuffert.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import orjson
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.repositories import TaskRepository
+from app.services.agent_load import agent_load
+from app.services.agent_registry import agent_registry
+from app.services.guardian import guardian
+from app.services.versions import resource_versions
+
+logger = logging.getLogger(__name__)
+
+# Quelle liefert den Zustand für ein oder mehrere Topics in einem Durchlauf
+Source = Callable[[], Awaitable[Dict[str, Dict]]]
+
+
+def merge_patch(old: Dict, new: Dict) -> Dict:
+    """Diff als JSON Merge Patch; Listen werden als Ganzes ersetzt"""
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        previous = old[key]
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = merge_patch(previous, value)
+            if nested:
+                patch[key] = nested
+        elif value != previous:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+class LiveClient:
+    """Verbundener Client mit begrenzter Frame-Queue"""
+
+    def __init__(self, queue_size: int):
+        self.topics: Set[str] = set()
+        # Topics, für die der Client als Nächstes einen vollen Frame braucht
+        self.pending_full: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def offer(self, frame: str) -> bool:
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def next_frame(self) -> Optional[str]:
+        """Nächster Frame; None, wenn der Client wegen Rückstau getrennt wurde"""
+        frame = await self.queue.get()
+        return None if self.dropped else frame
+
+
+class LiveBroadcaster:
+    """Fan-out aller Topics an die abonnierten Clients; läuft nur, solange Clients verbunden sind"""
+
+    def __init__(self, interval: float = 2.0, queue_size: int = 32):
+        self.interval = interval
+        self.queue_size = queue_size
+        self.clients: Set[LiveClient] = set()
+        self.dropped_total = 0
+        self._sources: List[Tuple[Tuple[str, ...], Source]] = []
+        self._state: Dict[str, Dict] = {}
+        self._seq: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def topics(self) -> Tuple[str, ...]:
+        return tuple(topic for topics, _ in self._sources for topic in topics)
+
+    def register(self, source: Source, *topics: str) -> None:
+        self._sources.append((topics, source))
+
+    # ===== Clients =====
+
+    def connect(self) -> LiveClient:
+        client = LiveClient(self.queue_size)
+        self.clients.add(client)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return client
+
+    def disconnect(self, client: LiveClient) -> None:
+        self.clients.discard(client)
+
+    def subscribe(self, client: LiveClient, topics: List[str]) -> List[str]:
+        """Abonniert bekannte Topics und gibt unbekannte zurück"""
+        known = set(self.topics)
+        for topic in topics:
+            if topic not in known or topic in client.topics:
+                continue
+            client.topics.add(topic)
+            if topic in self._state:
+                # Aktueller Zustand ist bekannt: sofort voller Frame
+                self._deliver(client, self._frame("full", topic, self._state[topic]))
+            else:
+                client.pending_full.add(topic)
+        return [topic for topic in topics if topic not in known]
+
+    def unsubscribe(self, client: LiveClient, topics: List[str]) -> None:
+        client.topics.difference_update(topics)
+        client.pending_full.difference_update(topics)
+
+    def _deliver(self, client: LiveClient, frame: str) -> None:
+        if client.dropped:
+            return
+        if not client.offer(frame):
+            client.dropped = True
+            self.clients.discard(client)
+            self.dropped_total += 1
+            # Platz für einen Weckruf schaffen, damit der Sender die Verbindung schließt
+            client.queue.get_nowait()
+            client.queue.put_nowait("")
+
+    # ===== Broadcast =====
+
+    async def _run(self) -> None:
+        while self.clients:
+            started = time.monotonic()
+            await self.tick()
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def tick(self) -> None:
+        """Ein Durchlauf: nur Quellen mit Abonnenten werden abgefragt"""
+        subscribed = set()
+        for client in self.clients:
+            subscribed |= client.topics
+        for topics, source in self._sources:
+            if subscribed.isdisjoint(topics):
+                continue
+            try:
+                states = await source()
+            except Exception as e:
+                logger.warning(f"Live source for {topics} failed: {e}")
+                continue
+            for topic, state in states.items():
+                self._publish(topic, state)
+
+    def _publish(self, topic: str, state: Dict) -> None:
+        previous = self._state.get(topic)
+        if state == previous:
+            delta = None
+        else:
+            self._seq[topic] = self._seq.get(topic, 0) + 1
+            self._state[topic] = state
+            delta = self._frame("delta", topic, merge_patch(previous, state)) if previous is not None else None
+
+        full = None
+        for client in list(self.clients):
+            if topic not in client.topics:
+                continue
+            if topic in client.pending_full:
+                client.pending_full.discard(topic)
+                full = full or self._frame("full", topic, state)
+                self._deliver(client, full)
+            elif delta is not None:
+                self._deliver(client, delta)
+
+    def _frame(self, kind: str, topic: str, data: Dict) -> str:
+        key = "data" if kind == "full" else "patch"
+        return orjson.dumps({"type": kind, "topic": topic, "seq": self._seq.get(topic, 0), key: data}).decode()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self.clients),
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "topics": {topic: self._seq.get(topic, 0) for topic in self.topics},
+            "dropped_total": self.dropped_total,
+        }
+
+
+# ===== Quellen =====
+
+async def guardian_source() -> Dict[str, Dict]:
+    """
+    Letztes Sample des Guardian-Samplers für Metriken und Alerts.
+
+    Misst nicht selbst: Historie, Anomalie-Statistik und cgroup-Raten schreibt
+    nur der Sampler fort, der Broadcast-Takt würde sie sonst verzerren.
+    """
+    metrics = guardian.latest_metrics()
+    if metrics is None:
+        return {}
+    alerts = guardian.get_alerts(metrics)
+    return {
+        "guardian": {
+            "timestamp": metrics["timestamp"],
+            "cpu": metrics["cpu"]["percent"],
+            "memory": metrics["memory"]["percent"],
+            "disk": metrics["disk"]["percent"],
+            "containers": {
+                container["name"]: {
+                    "cpu_percent": container["cpu_percent"],
+                    "memory_percent": container["memory"]["percent"],
+                }
+                for container in metrics.get("containers", [])
+            },
+        },
+        "alerts": {
+            f"{alert['type']}:{alert.get('container') or alert.get('metric') or ''}": alert
+            for alert in alerts
+        },
+    }
+
+
+class TaskSource:
+    """Status der neuesten Tasks; fragt die DB nur nach einer Änderung (oder nach max_age) ab"""
+
+    def __init__(self, limit: int = 100, max_age: float = 30.0, session_factory=AsyncSessionLocal):
+        self.limit = limit
+        self.max_age = max_age
+        self.session_factory = session_factory
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._state: Dict[str, Dict] = {}
+
+    async def __call__(self) -> Dict[str, Dict]:
+        version = resource_versions.get("tasks")
+        if version != self._version or time.monotonic() - self._loaded_at > self.max_age:
+            async with self.session_factory() as db:
+                tasks = await TaskRepository(db).list_tasks(limit=self.limit)
+            self._version = version
+            self._loaded_at = time.monotonic()
+            self._state = {
+                task.task_id: {
+                    "agent_id": task.agent_id,
+                    "action": task.action,
+                    "status": task.status,
+                    "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+                }
+                for task in tasks
+            }
+        return {"tasks": self._state}
+
+
+class AgentSource:
+    """Agenten aus der Registry plus Queue-Tiefe und Latenz aus dem Load-Tracker"""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def __call__(self) -> Dict[str, Dict]:
+        if agent_registry.is_stale():
+            async with self.session_factory() as db:
+                await agent_registry.get_snapshot(db)
+        load = agent_load.snapshot()
+        return {
+            "agents": {
+                agent_id: {
+                    "name": agent["name"],
+                    "enabled": agent["enabled"],
+                    "queue_depth": load.get(agent_id, {}).get("queue_depth", 0),
+                    "latency_ms": load.get(agent_id, {}).get("latency_ms", 0.0),
+                }
+                for agent_id, agent in agent_registry.snapshot.agents.items()
+            }
+        }
+
+
+settings = get_settings()
+
+# Singleton instances
+task_source = TaskSource(limit=settings.LIVE_TASK_LIMIT)
+agent_source = AgentSource()
+live_broadcaster = LiveBroadcaster(interval=settings.LIVE_INTERVAL, queue_size=settings.LIVE_CLIENT_QUEUE)
+live_broadcaster.register(guardian_source, "guardian", "alerts")
+live_broadcaster.register(task_source, "tasks")
+live_broadcaster.register(agent_source, "agents")
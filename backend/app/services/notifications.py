@@ -0,0 +1,79 @@
+"""
+NOVA v3 - Postgres LISTEN/NOTIFY
+Eine Listener-Verbindung pro Worker, verteilt Notifications an registrierte Callbacks
+
+Die Kanäle werden von Triggern aus den Migrationen bedient (agents_changed,
+tasks_changed). Callbacks laufen im Event-Loop und müssen schnell sein,
+typischerweise nur einen Cache verwerfen oder einen Zähler erhöhen.
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Callback(payload); payload None = Verbindung neu aufgebaut, Änderungen evtl. verpasst
+Callback = Callable[[Optional[str]], None]
+
+
+class NotificationListener:
+    """Hält LISTEN auf allen abonnierten Kanälen und baut die Verbindung bei Abbruch neu auf"""
+
+    def __init__(self, reconnect_interval: float = 5.0):
+        self.reconnect_interval = reconnect_interval
+        self._callbacks: Dict[str, List[Callback]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, channel: str, callback: Callback) -> None:
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def dispatch(self, channel: str, payload: Optional[str]) -> None:
+        for callback in self._callbacks.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception(f"Notification callback for '{channel}' failed")
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.dispatch(channel, payload)
+
+    def start(self, engine: AsyncEngine) -> None:
+        """Startet den Listener (nur Postgres/asyncpg)"""
+        if engine.dialect.name != "postgresql" or not self._callbacks or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._listen(engine))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _listen(self, engine: AsyncEngine) -> None:
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    for channel in self._callbacks:
+                        await driver.add_listener(channel, self._on_notify)
+                    # Änderungen während eines Verbindungsabbruchs wurden verpasst
+                    for channel in self._callbacks:
+                        self.dispatch(channel, None)
+                    try:
+                        while not driver.is_closed():
+                            await asyncio.sleep(self.reconnect_interval)
+                    finally:
+                        if not driver.is_closed():
+                            for channel in self._callbacks:
+                                await driver.remove_listener(channel, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification listener failed: {e}")
+            await asyncio.sleep(self.reconnect_interval)
+
+
+# Singleton instance
+notification_listener = NotificationListener()
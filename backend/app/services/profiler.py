@@ -0,0 +1,165 @@
+"""
+NOVA v3 - Sampling-Profiler
+Statistisches Profiling des laufenden Workers ohne Neustart
+
+Ein Hintergrund-Thread liest in festen Abständen die Stacks aller Threads
+(sys._current_frames) und die Await-Ketten der asyncio-Tasks und zählt sie im
+"collapsed"-Format (frame;frame;frame count), das flamegraph.pl und speedscope
+direkt lesen. Optional liefert tracemalloc die größten Allokationen.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Pfade kürzen, damit die Flamegraph-Labels lesbar bleiben
+_PREFIXES = sorted({p for p in sys.path if p and os.path.isdir(p)}, key=len, reverse=True)
+
+
+class ProfilerBusy(Exception):
+    """Es läuft bereits eine Profiling-Session"""
+
+
+def _label(code) -> str:
+    filename = code.co_filename
+    for prefix in _PREFIXES:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix):].lstrip(os.sep)
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> List[str]:
+    """Frames von außen nach innen"""
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class StackSampler:
+    """Thread, der bis zu einer Deadline Stacks zählt und sich dann selbst beendet"""
+
+    def __init__(self, interval: float, duration: float, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.interval = interval
+        self.deadline = time.monotonic() + duration
+        self.loop = loop
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval) and time.monotonic() < self.deadline:
+            self.sample(exclude=own)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            stack = [f"thread:{names.get(ident, ident)}"] + _collapse(frame)
+            self.stacks[";".join(stack)] += 1
+        if self.loop is not None:
+            self._sample_tasks()
+        self.samples += 1
+
+    def _sample_tasks(self) -> None:
+        # Wartende Coroutines: zeigt, worauf Requests gerade warten (I/O, Locks, Pools)
+        try:
+            tasks = asyncio.all_tasks(self.loop)
+        except RuntimeError:
+            return
+        for task in tasks:
+            labels = []
+            coro = task.get_coro()
+            while coro is not None:
+                frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+                if frame is None:
+                    break
+                labels.append(_label(frame.f_code))
+                coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+            if labels:
+                self.stacks[";".join(["asyncio"] + labels)] += 1
+
+
+class ProfilerService:
+    """Höchstens eine Profiling-Session pro Worker, mit fester Maximaldauer"""
+
+    def __init__(self, max_seconds: float = 60.0):
+        self.max_seconds = max_seconds
+        self.running = False
+        self.last_run: Optional[Dict] = None
+
+    async def profile(
+        self,
+        seconds: float,
+        interval_ms: float = 10.0,
+        memory: bool = False,
+        memory_top: int = 25,
+        async_tasks: bool = True,
+    ) -> Dict:
+        if self.running:
+            raise ProfilerBusy("A profiling session is already running")
+        seconds = min(seconds, self.max_seconds)
+        self.running = True
+        started_tracing = False
+        sampler = StackSampler(interval_ms / 1000, seconds, asyncio.get_running_loop() if async_tasks else None)
+        try:
+            if memory and not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            started = time.monotonic()
+            sampler.start()
+            # Auch wenn der Client abbricht: der Sampler endet spätestens an seiner Deadline
+            await asyncio.sleep(seconds)
+            sampler.stop()
+            allocations = self._top_allocations(memory_top) if memory else None
+        finally:
+            sampler.stop()
+            if started_tracing:
+                tracemalloc.stop()
+            self.running = False
+
+        result = {
+            "seconds": round(time.monotonic() - started, 3),
+            "interval_ms": interval_ms,
+            "samples": sampler.samples,
+            "stacks": len(sampler.stacks),
+            "collapsed": [f"{stack} {count}" for stack, count in sampler.stacks.most_common()],
+            "allocations": allocations,
+        }
+        self.last_run = {k: v for k, v in result.items() if k not in ("collapsed", "allocations")}
+        return result
+
+    def _top_allocations(self, limit: int) -> List[Dict]:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        return [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+
+
+# Singleton instance
+profiler_service = ProfilerService()
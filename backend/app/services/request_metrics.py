@@ -0,0 +1,302 @@
+"""
+NOVA v3 - Request-Metriken
+Latenz-Histogramme, Antwortgrößen und Statuscodes pro Route, In-Flight-Gauge
+und ein begrenztes Log langsamer Requests mit Stack-Snapshot
+
+Der Hot Path (begin/end) macht nur Dict-Zugriffe und eine Bisektion; die
+Stack-Snapshots nimmt ein separater Sampler-Thread, der auch dann noch läuft,
+wenn der Event-Loop blockiert ist.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+
+# Sekunden; orientiert an den Standard-Buckets von Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes
+SIZE_BUCKETS = (128, 1024, 8192, 65536, 524288, 4194304)
+
+# Routen-Label für Requests ohne passende Route (404), begrenzt die Kardinalität
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Kumulierbares Histogramm mit festen Bucket-Grenzen"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Schätzung wie histogram_quantile(): linear innerhalb des Buckets"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if seen + count >= rank:
+                return lower + (bound - lower) * ((rank - seen) / count if count else 0.0)
+            seen += count
+            lower = bound
+        return self.bounds[-1]
+
+
+class RouteMetrics:
+    """Metriken für eine Kombination aus Methode und Routen-Template"""
+
+    __slots__ = ("latency", "sizes", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sizes = Histogram(SIZE_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+
+class InFlightRequest:
+    """Laufender Request, für In-Flight-Gauge und Sampler"""
+
+    __slots__ = ("method", "path", "started", "task", "stack")
+
+    def __init__(self, method: str, path: str, started: float, task: Optional[asyncio.Task]):
+        self.method = method
+        self.path = path
+        self.started = started
+        self.task = task
+        self.stack: Optional[Dict] = None
+
+
+class RequestMetrics:
+    """Sammelt Request-Metriken eines Workers"""
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = 500.0,
+        slow_log_size: int = 100,
+        sample_interval: float = 0.05,
+        max_routes: int = 1000,
+    ):
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.sample_interval = sample_interval
+        self.max_routes = max_routes
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.in_flight: Dict[int, InFlightRequest] = {}
+        self.in_flight_peak = 0
+        self.slow_log: Deque[Dict] = deque(maxlen=slow_log_size)
+        self.slow_total = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+    # ===== Hot Path =====
+
+    def begin(self, method: str, path: str) -> InFlightRequest:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        record = InFlightRequest(method, path, time.perf_counter(), task)
+        self.in_flight[id(record)] = record
+        if len(self.in_flight) > self.in_flight_peak:
+            self.in_flight_peak = len(self.in_flight)
+        return record
+
+    def end(self, record: InFlightRequest, route: Optional[str], status: int, size: int) -> float:
+        duration = time.perf_counter() - record.started
+        del self.in_flight[id(record)]
+
+        key = (record.method, route or UNMATCHED_ROUTE)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            if len(self.routes) >= self.max_routes:
+                key = (record.method, UNMATCHED_ROUTE)
+            metrics = self.routes.setdefault(key, RouteMetrics())
+        metrics.latency.observe(duration)
+        metrics.sizes.observe(size)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+        if duration >= self.slow_threshold:
+            self._record_slow(record, key[1], status, size, duration)
+        return duration
+
+    def _record_slow(self, record: InFlightRequest, route: str, status: int, size: int, duration: float) -> None:
+        self.slow_total += 1
+        self.slow_log.append({
+            "timestamp": time.time(),
+            "method": record.method,
+            "path": record.path,
+            "route": route,
+            "status": status,
+            "size": size,
+            "duration_ms": round(duration * 1000, 1),
+            # Vom Sampler aufgenommen, solange der Request noch lief (None, wenn er zu schnell war)
+            "stack": record.stack,
+        })
+
+    # ===== Stack-Sampling =====
+
+    def start_sampler(self) -> None:
+        """Startet den Sampler-Thread für den aktuellen Event-Loop-Thread"""
+        if self._sampler is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="request-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop_sampler(self) -> None:
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.sample_interval):
+            self.sample()
+
+    def sample(self) -> int:
+        """Nimmt für jeden Request über dem Schwellwert einmalig einen Stack auf"""
+        now = time.perf_counter()
+        sampled = 0
+        for record in list(self.in_flight.values()):
+            if record.stack is None and now - record.started >= self.slow_threshold:
+                record.stack = {
+                    "elapsed_ms": round((now - record.started) * 1000, 1),
+                    "task": self._task_stack(record.task),
+                    "loop_thread": self._loop_stack(),
+                }
+                sampled += 1
+        return sampled
+
+    def _task_stack(self, task: Optional[asyncio.Task]) -> List[str]:
+        """Await-Kette der Coroutine: woran der Request gerade wartet"""
+        if task is None:
+            return []
+        frames = []
+        coro = task.get_coro()
+        while coro is not None:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is None:
+                break
+            frames.append((frame, frame.f_lineno))
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+        return traceback.StackSummary.extract(frames, capture_locals=False).format()
+
+    def _loop_stack(self) -> List[str]:
+        """Was der Loop-Thread gerade ausführt; leer, wenn er im select() wartet"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None or frame.f_code.co_filename.endswith("selectors.py"):
+            return []
+        return traceback.format_stack(frame)[-20:]
+
+    # ===== Auswertung =====
+
+    def snapshot(self) -> Dict:
+        routes = []
+        for (method, route), metrics in sorted(self.routes.items(), key=lambda item: item[0][::-1]):
+            latency = metrics.latency
+            errors = sum(count for status, count in metrics.statuses.items() if status >= 500)
+            routes.append({
+                "method": method,
+                "route": route,
+                "count": latency.count,
+                "errors": errors,
+                "mean_ms": round(latency.sum / latency.count * 1000, 2) if latency.count else 0.0,
+                "p50_ms": round(latency.quantile(0.5) * 1000, 2),
+                "p95_ms": round(latency.quantile(0.95) * 1000, 2),
+                "p99_ms": round(latency.quantile(0.99) * 1000, 2),
+                "avg_size_bytes": round(metrics.sizes.sum / metrics.sizes.count) if metrics.sizes.count else 0,
+                "statuses": dict(sorted(metrics.statuses.items())),
+            })
+        return {
+            "in_flight": len(self.in_flight),
+            "in_flight_peak": self.in_flight_peak,
+            "slow_threshold_ms": self.slow_threshold * 1000,
+            "slow_total": self.slow_total,
+            "routes": routes,
+        }
+
+    def slow_requests(self, limit: int = 50) -> List[Dict]:
+        return list(self.slow_log)[-limit:][::-1] if limit else []
+
+    def prometheus(self) -> str:
+        """Prometheus-Textformat"""
+        lines = [
+            "# HELP nova_http_request_duration_seconds Request latency by route template",
+            "# TYPE nova_http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in self.routes.items():
+            lines.extend(_histogram_lines("nova_http_request_duration_seconds", metrics.latency,
+                                          f'method="{method}",route="{_escape(route)}"'))
+        lines += [
+            "# HELP nova_http_response_size_bytes Response body size by route template",
+            "# TYPE nova_http_response_size_bytes histogram",
+        ]
+        for (method, route), metrics in self.routes.items():
+            lines.extend(_histogram_lines("nova_http_response_size_bytes", metrics.sizes,
+                                          f'method="{method}",route="{_escape(route)}"'))
+        lines += [
+            "# HELP nova_http_requests_total Requests by route template and status",
+            "# TYPE nova_http_requests_total counter",
+        ]
+        for (method, route), metrics in self.routes.items():
+            for status, count in metrics.statuses.items():
+                lines.append(
+                    f'nova_http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+                )
+        lines += [
+            "# HELP nova_http_requests_in_flight Requests currently being handled",
+            "# TYPE nova_http_requests_in_flight gauge",
+            f"nova_http_requests_in_flight {len(self.in_flight)}",
+            "# HELP nova_http_slow_requests_total Requests slower than the slow-request threshold",
+            "# TYPE nova_http_slow_requests_total counter",
+            f"nova_http_slow_requests_total {self.slow_total}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        self.routes.clear()
+        self.in_flight_peak = len(self.in_flight)
+        self.slow_log.clear()
+        self.slow_total = 0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+settings = get_settings()
+
+# Singleton instance
+request_metrics = RequestMetrics(
+    slow_threshold_ms=settings.SLOW_REQUEST_MS,
+    slow_log_size=settings.SLOW_REQUEST_LOG_SIZE,
+)
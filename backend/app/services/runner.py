@@ -0,0 +1,250 @@
+"""
+NOVA v3 - Command Runner
+Führt Wizard-Befehle als Subprozesse aus, begrenzt durch einen globalen Pool
+
+Befehle laufen ohne Shell (argv, create_subprocess_exec) in einer eigenen
+Prozessgruppe. Ein Semaphore begrenzt die gleichzeitig laufenden Prozesse
+über alle Workflows hinweg, damit eine Welle von Ausführungen die Mini-PCs
+nicht mit Forks überrollt. stdout/stderr werden zeilenweise gelesen und
+sofort an einen OutputBuffer gereicht statt erst am Ende gesammelt.
+Timeout oder Abbruch beenden die ganze Prozessgruppe (SIGTERM, dann SIGKILL).
+
+Was laufen darf, legt die Konfiguration fest, nicht der Workflow: argv[0] muss
+in der Allowlist stehen (leer = nichts erlaubt), zusätzliche Umgebungsvariablen
+nur mit freigegebenem Namen, cwd nur unterhalb freigegebener Verzeichnisse.
+"""
+import asyncio
+import logging
+import os
+import shlex
+import signal
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Mapping, Optional, Sequence, Union
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Maximale Zeilenlänge, die der StreamReader puffert
+STREAM_LIMIT = 1024 * 1024
+
+# Listener(stream, line) für Live-Ausgabe
+OutputListener = Callable[[str, str], None]
+
+
+class CommandError(Exception):
+    """Befehl ungültig, nicht erlaubt, fehlgeschlagen oder zu langsam"""
+
+
+class OutputBuffer:
+    """Letzte max_lines Ausgabezeilen eines Schritts, mit Listenern für Live-Ausgabe"""
+
+    def __init__(self, max_lines: int = 1000, max_line_length: int = 4096):
+        self.max_line_length = max_line_length
+        self.lines: Deque[Dict[str, str]] = deque(maxlen=max_lines)
+        self.total = 0
+        self.listeners: List[OutputListener] = []
+
+    def append(self, stream: str, line: str) -> None:
+        if len(line) > self.max_line_length:
+            line = line[:self.max_line_length] + "…"
+        self.lines.append({"stream": stream, "line": line})
+        self.total += 1
+        for listener in self.listeners:
+            listener(stream, line)
+
+    @property
+    def truncated(self) -> int:
+        """Zeilen, die aus dem Puffer gefallen sind"""
+        return self.total - len(self.lines)
+
+
+def parse_command(command: Union[str, Sequence[str]]) -> List[str]:
+    """argv aus einer Liste oder einem String (Shell-Quoting, aber ohne Shell)"""
+    argv = shlex.split(command) if isinstance(command, str) else list(command)
+    if not argv or not all(isinstance(arg, str) for arg in argv):
+        raise CommandError("command must be a non-empty string or list of strings")
+    return argv
+
+
+class CommandRunner:
+    """Globaler Pool für Subprozesse mit Timeout, Abbruch und Zeilen-Streaming"""
+
+    def __init__(
+        self,
+        max_processes: int = 4,
+        default_timeout: float = 300.0,
+        kill_grace: float = 5.0,
+        allowed: Sequence[str] = (),
+        allowed_env: Sequence[str] = (),
+        workdirs: Sequence[str] = (),
+    ):
+        self.max_processes = max_processes
+        self.default_timeout = default_timeout
+        self.kill_grace = kill_grace
+        # Erlaubte Programme: Name (Suche im PATH) oder absoluter Pfad, genau wie in argv[0]; leer = keine
+        self.allowed = frozenset(allowed)
+        # Namen der Umgebungsvariablen, die ein Schritt setzen darf
+        self.allowed_env = frozenset(allowed_env)
+        # Erlaubte Arbeitsverzeichnisse (samt Unterverzeichnissen); leer = kein cwd
+        self.workdirs = tuple(os.path.realpath(path) for path in workdirs)
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Erst im laufenden Event-Loop anlegen
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_processes)
+        return self._slots
+
+    async def run(
+        self,
+        command: Union[str, Sequence[str]],
+        timeout: Optional[float] = None,
+        env: Optional[Mapping[str, str]] = None,
+        cwd: Optional[str] = None,
+        output: Optional[OutputBuffer] = None,
+    ) -> Dict:
+        """
+        Führt einen Befehl aus, sobald ein Slot frei ist.
+
+        Returns:
+            argv, exit_code und duration_ms
+
+        Raises:
+            CommandError: Nicht erlaubt, nicht startbar, Exit-Code != 0 oder Timeout
+        """
+        argv = parse_command(command)
+        self._check(argv, env, cwd)
+        output = output or OutputBuffer()
+        timeout = timeout or self.default_timeout
+
+        self.waiting += 1
+        try:
+            await self._semaphore().acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            return await self._run(argv, timeout, env, cwd, output)
+        finally:
+            self.running -= 1
+            self._semaphore().release()
+
+    def _check(self, argv: List[str], env: Optional[Mapping[str, str]], cwd: Optional[str]) -> None:
+        if argv[0] not in self.allowed:
+            raise CommandError(f"Command '{argv[0]}' is not allowed")
+        denied = sorted(set(env or ()) - self.allowed_env)
+        if denied:
+            raise CommandError(f"Environment variables not allowed: {', '.join(denied)}")
+        if cwd is not None:
+            path = os.path.realpath(cwd)
+            if not any(path == root or path.startswith(root + os.sep) for root in self.workdirs):
+                raise CommandError(f"Working directory '{cwd}' is not allowed")
+            if not os.path.isdir(path):
+                raise CommandError(f"Working directory '{cwd}' does not exist")
+
+    async def _run(
+        self,
+        argv: List[str],
+        timeout: float,
+        env: Optional[Mapping[str, str]],
+        cwd: Optional[str],
+        output: OutputBuffer,
+    ) -> Dict:
+        started = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env={**os.environ, **env} if env else None,
+                cwd=cwd,
+                limit=STREAM_LIMIT,
+                # Eigene Prozessgruppe, damit Timeout/Abbruch auch Kindprozesse beendet
+                start_new_session=True,
+            )
+        except OSError as e:
+            self.failed += 1
+            raise CommandError(f"Cannot start '{argv[0]}': {e.strerror or e}") from None
+
+        logger.info(f"🧙 Command started (pid {process.pid}): {shlex.join(argv)}")
+        readers = [
+            asyncio.create_task(self._pump(process.stdout, "stdout", output)),
+            asyncio.create_task(self._pump(process.stderr, "stderr", output)),
+        ]
+        try:
+            await asyncio.wait_for(asyncio.gather(*readers, process.wait()), timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            await self._terminate(process, readers)
+            raise CommandError(f"Command timed out after {timeout:g}s") from None
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            await self._terminate(process, readers)
+            raise
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        if process.returncode != 0:
+            self.failed += 1
+            raise CommandError(f"Command exited with code {process.returncode}")
+        self.completed += 1
+        return {"argv": argv, "exit_code": process.returncode, "duration_ms": duration_ms}
+
+    async def _pump(self, stream: asyncio.StreamReader, name: str, output: OutputBuffer) -> None:
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # Zeile länger als STREAM_LIMIT; der StreamReader hat sie bereits verworfen
+                output.append(name, f"[line longer than {STREAM_LIMIT} bytes dropped]")
+                continue
+            if not line:
+                return
+            output.append(name, line.decode(errors="replace").rstrip("\r\n"))
+
+    async def _terminate(self, process: asyncio.subprocess.Process, readers: List[asyncio.Task]) -> None:
+        """SIGTERM an die Prozessgruppe, nach kill_grace SIGKILL"""
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(asyncio.shield(process.wait()), self.kill_grace)
+            except asyncio.TimeoutError:
+                pass
+            # Auch Kindprozesse, die SIGTERM ignorieren oder die Pipes noch offen halten
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        return {
+            "max_processes": self.max_processes,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+        }
+
+
+# Singleton instance
+command_runner = CommandRunner(
+    max_processes=settings.WIZARD_MAX_PROCESSES,
+    default_timeout=settings.WIZARD_COMMAND_TIMEOUT,
+    allowed=settings.WIZARD_COMMAND_ALLOWLIST,
+    allowed_env=settings.WIZARD_COMMAND_ENV,
+    workdirs=settings.WIZARD_COMMAND_WORKDIRS,
+)
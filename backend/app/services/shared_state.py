@@ -0,0 +1,236 @@
+"""
+NOVA v3 - Geteilter Zustand zwischen Workern
+Shared-Memory-Segment mit Seqlock, in das ein gewählter Sampler-Prozess schreibt
+
+Unter gunicorn mit mehreren Workern sampelt nur der Worker, der den Leader-Lock
+(flock auf eine Datei) hält; alle anderen lesen ohne Lock aus dem Segment.
+Stirbt der Sampler, gibt der Kernel den flock frei und ein anderer Worker
+übernimmt beim nächsten Intervall.
+
+Layout: 32 Byte Header (Magic, Sequenznummer, Schreibzeitpunkt, Länge), danach
+der orjson-Payload. Der Writer setzt die Sequenz vor dem Schreiben auf ungerade
+und danach auf gerade; Leser kopieren den Payload und verwerfen ihn, wenn sich
+die Sequenz dabei geändert hat oder ungerade war.
+"""
+import asyncio
+import fcntl
+import logging
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NOVASHM1"
+# magic, seq, written_at, length (+ Padding auf 32 Byte)
+HEADER = struct.Struct("<8sQdI4x")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+
+
+class SeqlockSegment:
+    """Ein Writer, beliebig viele lock-freie Leser über Prozessgrenzen hinweg"""
+
+    def __init__(self, name: str, size: int = 1024 * 1024):
+        self.name = name
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER.size + size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        _untrack(self._shm)
+        self._buf = self._shm.buf
+        self.capacity = self._shm.size - HEADER.size
+
+    def _seq(self) -> int:
+        return SEQ.unpack_from(self._buf, SEQ_OFFSET)[0]
+
+    def write(self, payload: bytes) -> int:
+        if len(payload) > self.capacity:
+            raise ValueError(f"Payload of {len(payload)} bytes exceeds segment capacity {self.capacity}")
+        seq = self._seq()
+        if seq % 2:
+            # Vorheriger Writer ist mitten im Schreiben gestorben
+            seq += 1
+        SEQ.pack_into(self._buf, SEQ_OFFSET, seq + 1)
+        self._buf[HEADER.size:HEADER.size + len(payload)] = payload
+        HEADER.pack_into(self._buf, 0, MAGIC, seq + 1, time.time(), len(payload))
+        SEQ.pack_into(self._buf, SEQ_OFFSET, seq + 2)
+        return seq + 2
+
+    def peek(self) -> Tuple[int, float]:
+        """(seq, written_at) ohne den Payload zu kopieren"""
+        _, seq, written_at, _ = HEADER.unpack_from(self._buf, 0)
+        return seq, written_at
+
+    def read(self, retries: int = 100) -> Optional[Tuple[int, float, bytes]]:
+        """(seq, written_at, payload) oder None, solange noch nichts geschrieben wurde"""
+        for _ in range(retries):
+            magic, seq, written_at, length = HEADER.unpack_from(self._buf, 0)
+            if magic != MAGIC or seq == 0:
+                return None
+            if seq % 2:
+                time.sleep(0)
+                continue
+            payload = bytes(self._buf[HEADER.size:HEADER.size + min(length, self.capacity)])
+            if self._seq() == seq:
+                return seq, written_at, payload
+        return None
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+
+
+# Segmente, die dieser Prozess beim resource_tracker schon abgemeldet hat
+_untracked: Set[str] = set()
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """
+    Der resource_tracker würde das Segment beim Ende *jedes* Workers entfernen
+    (vor Python 3.13 auch beim bloßen Anhängen). Aufgeräumt wird stattdessen im
+    gunicorn-Master über unlink_segment. Der Tracker führt pro Prozess eine Menge
+    von Namen, daher nur einmal abmelden.
+    """
+    if shm._name not in _untracked:
+        resource_tracker.unregister(shm._name, "shared_memory")
+        _untracked.add(shm._name)
+
+
+def unlink_segment(name: str) -> None:
+    """Entfernt das Segment (im gunicorn-Master beim Beenden)"""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    # unlink() meldet das gerade registrierte Segment selbst wieder ab
+    shm.close()
+    shm.unlink()
+    _untracked.discard(shm._name)
+
+
+class LeaderLock:
+    """Nicht-blockierender flock; wird bei Prozessende vom Kernel freigegeben"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedSampler:
+    """Periodischer Sampler mit Leader-Wahl; liefert allen Workern denselben Snapshot"""
+
+    def __init__(
+        self,
+        segment: SeqlockSegment,
+        lock: LeaderLock,
+        interval: float = 5.0,
+        stale_after: Optional[float] = None,
+    ):
+        self.segment = segment
+        self.lock = lock
+        self.interval = interval
+        # Ohne frische Daten (Sampler tot, Übernahme läuft) liefern Leser den letzten Snapshot als veraltet
+        self.stale_after = stale_after or interval * 3
+        self.samples_written = 0
+        # (seq, written_at, dekodierter Payload)
+        self._cached: Optional[Tuple[int, float, Dict]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.held
+
+    def start(self, produce: Callable[[], Dict]) -> None:
+        """produce() läuft im Thread-Pool, weil das Sampling blockieren darf"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(produce))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.lock.release()
+
+    async def _run(self, produce: Callable[[], Dict]) -> None:
+        while True:
+            started = time.monotonic()
+            if self.lock.try_acquire():
+                try:
+                    self.publish(await asyncio.to_thread(produce))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Shared sampler failed: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def publish(self, data: Dict) -> None:
+        self.segment.write(orjson.dumps(data))
+        self.samples_written += 1
+
+    def read(self) -> Optional[Dict]:
+        """Letzter frischer Snapshot; None, wenn keiner da oder er älter als stale_after ist"""
+        last = self.last()
+        if last is None or last[1] > self.stale_after:
+            return None
+        return last[0]
+
+    def last(self) -> Optional[Tuple[Dict, float]]:
+        """
+        Zuletzt dekodierter Snapshot samt Alter in Sekunden, auch wenn er veraltet ist.
+
+        Kopiert und dekodiert nur, wenn sich die Sequenz geändert hat; schlägt
+        der Read fehl (Writer mitten im Schreiben), bleibt es beim vorigen Snapshot.
+        """
+        seq, _ = self.segment.peek()
+        if self._cached is None or self._cached[0] != seq:
+            result = self.segment.read()
+            if result is not None:
+                seq, written_at, payload = result
+                self._cached = (seq, written_at, orjson.loads(payload))
+        if self._cached is None:
+            return None
+        _, written_at, data = self._cached
+        return data, time.time() - written_at
+
+    def status(self) -> Dict:
+        result = self.segment.read()
+        return {
+            "segment": self.segment.name,
+            "capacity_bytes": self.segment.capacity,
+            "pid": os.getpid(),
+            "leader": self.is_leader,
+            "interval": self.interval,
+            "seq": result[0] if result else 0,
+            "payload_bytes": len(result[2]) if result else 0,
+            "age_seconds": round(time.time() - result[1], 3) if result else None,
+            "samples_written": self.samples_written,
+        }
@@ -0,0 +1,97 @@
+"""
+NOVA v3 - Ergebnis-Cache für Wizard-Schritte
+Merkt sich Ergebnisse idempotenter Schritte für cache_ttl Sekunden
+
+Health- und Status-Checks tauchen in vielen Workflows auf, die kurz
+nacheinander laufen. Schritte mit cache_ttl teilen sich über alle Workflows
+ein Ergebnis, solange Typ, Parameter und die referenzierten Kontextwerte
+gleich sind. Laufen identische Schritte gleichzeitig, führt nur der erste den
+Handler aus (single-flight); die anderen warten auf sein Ergebnis. Fehler
+werden an die Wartenden weitergereicht, aber nicht gecacht.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+HIT = "hit"
+MISS = "miss"
+COALESCED = "coalesced"
+
+
+class StepCache:
+    """TTL-Cache mit LRU-Grenze und Single-Flight pro Schlüssel"""
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        # Schlüssel -> (läuft ab um, Ergebnis)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_run(self, key: Hashable, ttl: float, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+        """Ergebnis aus dem Cache, von einer laufenden Ausführung oder neu berechnet, plus wie"""
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], HIT
+                del self._entries[key]
+
+            flight = self._inflight.get(key)
+            if flight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight), COALESCED
+            except asyncio.CancelledError:
+                # Die ausführende Instanz wurde abgebrochen, nicht wir: selbst ausführen
+                if flight.cancelled() and not asyncio.current_task().cancelling():
+                    self.coalesced -= 1
+                    continue
+                raise
+
+        self.misses += 1
+        flight = asyncio.get_running_loop().create_future()
+        # Fehler ohne Wartende nicht als "never retrieved" melden
+        flight.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = flight
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+        self._store(key, ttl, value)
+        flight.set_result(value)
+        return value, MISS
+
+    def _store(self, key: Hashable, ttl: float, value: Any) -> None:
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
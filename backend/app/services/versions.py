@@ -0,0 +1,48 @@
+"""
+NOVA v3 - Resource Versions
+Monotone Versionszähler je Ressource als Grundlage für ETags
+
+Schreibpfade erhöhen den Zähler nach dem Commit, Lesepfade vergleichen nur
+noch If-None-Match mit der aktuellen Version (O(1), ohne Query oder
+Serialisierung). Die Zähler leben pro Prozess; die Epoch im ETag sorgt dafür,
+dass ein Neustart oder ein anderer Worker nie fälschlich 304 liefert.
+"""
+import hashlib
+import uuid
+from typing import Any, Dict
+
+from app.services.notifications import notification_listener
+
+
+class ResourceVersions:
+    """Versionszähler für gecachte Leseendpunkte"""
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+
+    def get(self, resource: str) -> int:
+        return self._versions.get(resource, 0)
+
+    def bump(self, resource: str) -> int:
+        version = self._versions.get(resource, 0) + 1
+        self._versions[resource] = version
+        return version
+
+    def etag(self, resource: str, *variant: Any) -> str:
+        """Weak ETag für die aktuelle Version; variant unterscheidet z.B. Query-Parameter"""
+        tag = f"{self.epoch}-{resource}-{self.get(resource)}"
+        if variant:
+            tag += "-" + hashlib.blake2b(repr(variant).encode(), digest_size=6).hexdigest()
+        return f'W/"{tag}"'
+
+
+def content_etag(body: bytes) -> str:
+    """Weak ETag aus dem Inhalt, für Antworten, die in jedem Worker gleich gerendert werden"""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+# Singleton instance
+resource_versions = ResourceVersions()
+# Task-Änderungen anderer Worker/Prozesse (Trigger aus Migration 0004)
+notification_listener.subscribe("tasks_changed", lambda payload: resource_versions.bump("tasks"))
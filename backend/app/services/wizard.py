@@ -3,11 +3,131 @@
 Unterstützungs-Service zur Lastreduzierung der KI-Agenten
 """
 import logging
-from typing import Dict, List, Optional, Any
+import heapq
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple, Type
 from datetime import datetime
 import asyncio
 
+import orjson
+
+from app.config import get_settings
+from app.services.http_client import HttpClientPool, http_pool
+from app.services.runner import CommandRunner, OutputBuffer, command_runner
+from app.services.step_cache import COALESCED, HIT, MISS, StepCache
+from app.services.versions import resource_versions
+from app.services.workflow_plan import (
+    ApiCallStep,
+    CheckStep,
+    CommandStep,
+    CompiledPlan,
+    CompiledStep,
+    InvalidWorkflow,
+    StepHandler,
+    StepSchema,
+    StepType,
+    WaitStep,
+    compile_plan,
+)
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Ausgabe des laufenden Schritts; jeder Schritt läuft in einem eigenen Task mit eigenem Kontext
+_step_output: ContextVar[Optional[OutputBuffer]] = ContextVar("wizard_step_output", default=None)
+# Hintergrund-Ausführung, zu der der laufende Schritt gehört (None bei direktem Aufruf)
+_current_run: ContextVar[Optional["WorkflowRun"]] = ContextVar("wizard_current_run", default=None)
+
+FINISHED_RUN_STATUSES = ("completed", "failed", "cancelled")
+
+
+class RunQueueFull(RuntimeError):
+    """Zu viele Ausführungen warten bereits"""
+
+
+class WorkflowRun:
+    """
+    Hintergrund-Ausführung eines Workflows.
+
+    Fortschritt landet als Ereignis (run_started, step_started, output,
+    step_finished, run_finished) mit fortlaufender seq in einem begrenzten
+    Protokoll. SSE-Clients lesen ab ihrer letzten seq und warten auf das
+    nächste Ereignis; ein Client, der zurückfällt, verliert nur alte
+    Ereignisse, der Endstand steht immer in run_finished und im Status.
+    """
+
+    def __init__(self, workflow: str, context: Dict, steps_total: int, max_events: int = 1000):
+        self.id = uuid.uuid4().hex
+        self.workflow = workflow
+        self.context = context
+        self.status = "queued"
+        self.steps_total = steps_total
+        self.steps_done = 0
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.events: Deque[Dict] = deque(maxlen=max_events)
+        self.seq = 0
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_RUN_STATUSES
+
+    def emit(self, event: str, data: Dict) -> None:
+        self.seq += 1
+        self.events.append({"seq": self.seq, "event": event, "data": data})
+        # Wartende Clients wecken; neue Wartende warten auf das nächste Ereignis
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def events_after(self, seq: int) -> List[Dict]:
+        return [event for event in self.events if event["seq"] > seq]
+
+    async def wait_for_event(self, seq: int, timeout: float) -> bool:
+        """Wartet, bis es ein Ereignis nach seq gibt; False nach timeout"""
+        if self.seq > seq or self.finished:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def start(self) -> None:
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self.emit("run_started", {"run_id": self.id, "workflow": self.workflow})
+
+    def finish(self, status: str, result: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = datetime.utcnow()
+        self.emit("run_finished", self.snapshot())
+
+    def snapshot(self) -> Dict:
+        data = {
+            "run_id": self.id,
+            "workflow": self.workflow,
+            "status": self.status,
+            "steps_total": self.steps_total,
+            "steps_done": self.steps_done,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
 
 
 class WizardService:
@@ -21,39 +141,117 @@ class WizardService:
     - Deployment-Unterstützung bietet
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        runner: Optional[CommandRunner] = None,
+        output_lines: int = 1000,
+        http: Optional[HttpClientPool] = None,
+        run_workers: int = 4,
+        max_queued_runs: int = 100,
+        max_runs: int = 200,
+        max_run_events: int = 1000,
+        step_cache: Optional[StepCache] = None,
+        commands_enabled: bool = False,
+    ):
+        self.max_concurrency = max_concurrency
+        # command-Schritte nur, wenn ausdrücklich freigeschaltet
+        self.commands_enabled = commands_enabled
+        self.runner = runner or CommandRunner()
+        self.http = http or HttpClientPool()
+        self.output_lines = output_lines
+        self.run_workers = run_workers
+        self.max_queued_runs = max_queued_runs
+        self.max_runs = max_runs
+        self.max_run_events = max_run_events
+        # Ergebnisse von Schritten mit cache_ttl, über alle Workflows geteilt
+        self.step_cache = step_cache or StepCache()
         self.workflows: Dict[str, Dict] = {}
-        self.task_queue: List[Dict] = []
+        self._plans: Dict[str, CompiledPlan] = {}
+        # Handler-Registry; register_workflow bindet die Handler einmal an den Plan
+        self.step_types: Dict[str, StepType] = {}
+        self.register_step_type("generic", self._execute_generic)
+        self.register_step_type("command", self._execute_command, CommandStep)
+        self.register_step_type("api_call", self._execute_api_call, ApiCallStep)
+        self.register_step_type("check", self._execute_check, CheckStep)
+        self.register_step_type("wait", self._execute_wait, WaitStep)
+        # Wartende Hintergrund-Ausführungen; gehört zum Event-Loop, erst in start() anlegen
+        self.task_queue: Optional[asyncio.Queue] = None
+        # Letzte max_runs Ausführungen, älteste zuerst
+        self.runs: "OrderedDict[str, WorkflowRun]" = OrderedDict()
+        self._workers: List[asyncio.Task] = []
         self.is_running = False
+        # Serialisierte Workflow-Liste, wird bei Änderungen verworfen
+        self._workflows_body: Optional[bytes] = None
         logger.info("🧙 Wizard Service initialized")
 
-    async def register_workflow(self, name: str, steps: List[Dict]) -> Dict:
+    def register_step_type(self, name: str, handler: StepHandler, schema: Optional[Type[StepSchema]] = None) -> None:
+        """
+        Registriert (oder ersetzt) einen Schritt-Typ.
+
+        Bereits registrierte Workflows behalten den Handler, der beim
+        Registrieren gebunden wurde.
+        """
+        if schema is not None and not issubclass(schema, StepSchema):
+            raise TypeError("schema must be a StepSchema subclass")
+        self.step_types[name] = StepType(name, handler, schema)
+
+    async def register_workflow(
+        self,
+        name: str,
+        steps: List[Dict],
+        max_concurrency: Optional[int] = None,
+        on_error: str = "fail_fast",
+    ) -> Dict:
         """
         Registriert einen neuen Workflow.
 
         Args:
             name: Workflow-Name
-            steps: Liste von Workflow-Schritten
+            steps: Liste von Workflow-Schritten (optional mit `id`, `depends_on` und `cache_ttl`)
+            max_concurrency: Maximal gleichzeitig laufende Schritte
+            on_error: "fail_fast" oder "continue"
 
         Returns:
             Workflow-Informationen
+
+        Raises:
+            InvalidWorkflow: Schema verletzt, unbekannter Typ, unbekannte Abhängigkeit, Zyklus, doppelte id
+                oder command-Schritte, obwohl sie abgeschaltet sind
         """
+        plan = compile_plan(steps, self.step_types, max_concurrency or self.max_concurrency, on_error)
+        if not self.commands_enabled and any(step.type == "command" for step in plan.steps):
+            raise InvalidWorkflow("command steps are disabled (WIZARD_COMMANDS_ENABLED=false)")
         workflow = {
             "name": name,
             "steps": steps,
+            "order": list(plan.order),
+            "max_concurrency": plan.max_concurrency,
+            "on_error": plan.on_error,
             "created_at": datetime.utcnow().isoformat(),
             "executions": 0
         }
 
         self.workflows[name] = workflow
+        self._plans[name] = plan
+        self._workflows_changed()
         logger.info(f"🧙 Workflow '{name}' registered with {len(steps)} steps")
 
         return workflow
 
+    def runs_commands(self, name: str) -> bool:
+        """Registrierter Workflow enthält command-Schritte (Ersetzen nur als Admin)"""
+        plan = self._plans.get(name)
+        return plan is not None and any(step.type == "command" for step in plan.steps)
+
     async def execute_workflow(self, name: str, context: Optional[Dict] = None) -> Dict:
         """
         Führt einen registrierten Workflow aus.
 
+        Bereite Schritte (alle Abhängigkeiten erfolgreich) laufen gleichzeitig,
+        höchstens max_concurrency auf einmal; die Laufzeit nähert sich damit der
+        Länge des kritischen Pfads.
+
         Args:
             name: Workflow-Name
             context: Optionaler Kontext für Workflow-Ausführung
@@ -65,88 +263,294 @@ class WizardService:
             raise ValueError(f"Workflow '{name}' not found")
 
         workflow = self.workflows[name]
+        plan = self._plans[name]
         context = context or {}
 
         logger.info(f"🧙 Executing workflow '{name}'")
 
-        results = []
-        for i, step in enumerate(workflow["steps"]):
-            logger.debug(f"🧙 Step {i+1}/{len(workflow['steps'])}: {step.get('name', 'Unnamed')}")
-
-            try:
-                result = await self._execute_step(step, context)
-                results.append({
-                    "step": i + 1,
-                    "name": step.get("name", "Unnamed"),
-                    "status": "success",
-                    "result": result
-                })
-            except Exception as e:
-                logger.error(f"🧙 Step {i+1} failed: {e}")
-                results.append({
-                    "step": i + 1,
-                    "name": step.get("name", "Unnamed"),
-                    "status": "error",
-                    "error": str(e)
-                })
-                break
+        started = time.perf_counter()
+        outcomes = await self._run_plan(plan, context)
+        results = sorted(outcomes.values(), key=lambda r: r["step"])
+        run = _current_run.get()
+        if run is not None:
+            # Schritte, die nie gestartet oder abgebrochen wurden, melden sonst kein Ende
+            for outcome in results:
+                if outcome["status"] in ("skipped", "cancelled"):
+                    self._step_finished(run, outcome)
 
         workflow["executions"] += 1
+        self._workflows_changed()
 
         return {
             "workflow": name,
             "status": "completed" if all(r["status"] == "success" for r in results) else "failed",
-            "steps_executed": len(results),
+            "steps_executed": sum(1 for r in results if r["status"] in ("success", "error")),
             "results": results,
+            "cache": {
+                status: sum(1 for r in results if r.get("cache") == status) for status in (HIT, MISS, COALESCED)
+            },
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
             "timestamp": datetime.utcnow().isoformat()
         }
 
-    async def _execute_step(self, step: Dict, context: Dict) -> Any:
-        """Führt einen einzelnen Workflow-Schritt aus."""
-        step_type = step.get("type", "generic")
-
-        if step_type == "command":
-            return await self._execute_command(step, context)
-        elif step_type == "api_call":
-            return await self._execute_api_call(step, context)
-        elif step_type == "check":
-            return await self._execute_check(step, context)
-        elif step_type == "wait":
-            await asyncio.sleep(step.get("duration", 1))
-            return {"waited": step.get("duration", 1)}
+    # ===== Hintergrund-Ausführungen =====
+
+    def start(self) -> None:
+        """Startet die Executor-Tasks, die Ausführungen aus task_queue abarbeiten"""
+        if not self._workers:
+            self.task_queue = asyncio.Queue(maxsize=self.max_queued_runs)
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.run_workers)]
+            self.is_running = True
+
+    async def stop(self) -> None:
+        """Bricht laufende und wartende Ausführungen ab (sie leben nur im Speicher)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.is_running = False
+        tasks = [run._task for run in self.runs.values() if run._task is not None and not run._task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for run in self.runs.values():
+            if not run.finished:
+                run.finish("cancelled", error="Wizard stopped")
+        self.task_queue = None
+
+    def submit_workflow(self, name: str, context: Optional[Dict] = None) -> WorkflowRun:
+        """
+        Reiht eine Ausführung ein und kehrt sofort zurück.
+
+        Raises:
+            ValueError: Workflow unbekannt
+            RunQueueFull: task_queue voll oder Executor nicht gestartet
+        """
+        if name not in self.workflows:
+            raise ValueError(f"Workflow '{name}' not found")
+        if self.task_queue is None:
+            raise RunQueueFull("Wizard executor is not running")
+        run = WorkflowRun(name, context or {}, len(self._plans[name].order), self.max_run_events)
+        try:
+            self.task_queue.put_nowait(run)
+        except asyncio.QueueFull:
+            raise RunQueueFull(f"{self.max_queued_runs} workflow runs are already queued") from None
+        self.runs[run.id] = run
+        self._prune_runs()
+        logger.info(f"🧙 Queued workflow '{name}' as run {run.id}")
+        return run
+
+    def get_run(self, run_id: str) -> Optional[WorkflowRun]:
+        return self.runs.get(run_id)
+
+    def cancel_run(self, run_id: str) -> Optional[WorkflowRun]:
+        """Bricht eine wartende oder laufende Ausführung ab"""
+        run = self.runs.get(run_id)
+        if run is None or run.finished:
+            return run
+        if run._task is None:
+            # Noch in der Queue; der Executor überspringt beendete Ausführungen
+            run.finish("cancelled", error="Cancelled before start")
+        else:
+            run._task.cancel()
+        return run
+
+    def _prune_runs(self) -> None:
+        excess = len(self.runs) - self.max_runs
+        if excess <= 0:
+            return
+        for run_id in [run_id for run_id, run in self.runs.items() if run.finished][:excess]:
+            del self.runs[run_id]
+
+    async def _worker(self) -> None:
+        while True:
+            run = await self.task_queue.get()
+            if run.finished:
+                continue
+            # Eigener Task, damit cancel_run nur diese Ausführung trifft
+            run._task = asyncio.create_task(self._execute_run(run))
+            await asyncio.wait([run._task])
+
+    async def _execute_run(self, run: WorkflowRun) -> None:
+        _current_run.set(run)
+        run.start()
+        try:
+            result = await self.execute_workflow(run.workflow, run.context)
+        except asyncio.CancelledError:
+            run.finish("cancelled", error="Cancelled")
+        except Exception as e:
+            logger.exception(f"🧙 Run {run.id} of '{run.workflow}' failed")
+            run.finish("failed", error=str(e))
         else:
-            return {"type": step_type, "executed": True}
+            run.finish(result["status"], result=result)
+
+    async def _run_plan(self, plan: CompiledPlan, context: Dict) -> Dict[str, Dict]:
+        """Startet Schritte, sobald ihre Abhängigkeiten erfolgreich waren"""
+        steps = plan.steps
+        outcomes: Dict[str, Dict] = {}
+        remaining = [len(step.depends_on) for step in steps]
+        ready: List[Tuple[int, int]] = []
+        running: Dict[asyncio.Task, CompiledStep] = {}
+        aborted = False
+
+        for step in steps:
+            if not remaining[step.index]:
+                heapq.heappush(ready, (-step.rank, step.index))
+
+        try:
+            while ready or running:
+                while ready and len(running) < plan.max_concurrency:
+                    step = steps[heapq.heappop(ready)[1]]
+                    running[asyncio.create_task(self._run_step(step, context))] = step
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    outcome = outcomes[step.id] = task.result()
+                    if outcome["status"] != "success":
+                        if plan.on_error == "fail_fast":
+                            aborted = True
+                        continue
+                    for child in step.dependents:
+                        remaining[child] -= 1
+                        if not remaining[child]:
+                            heapq.heappush(ready, (-steps[child].rank, child))
+                if aborted:
+                    break
+        finally:
+            # fail_fast oder Abbruch der Ausführung selbst: laufende Schritte beenden
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            for step in running.values():
+                outcomes[step.id] = self._outcome(step, "cancelled", error="Cancelled after a failed step")
+
+        for step in steps:
+            if step.id not in outcomes:
+                failed = [dep for dep in step.depends_on if outcomes.get(dep, {}).get("status") != "success"]
+                reason = f"Dependencies not successful: {failed}" if failed else "Workflow aborted"
+                outcomes[step.id] = self._outcome(step, "skipped", error=reason)
+        return outcomes
+
+    async def _run_step(self, step: CompiledStep, context: Dict) -> Dict:
+        logger.debug(f"🧙 Step '{step.id}': {step.name}")
+        output = OutputBuffer(self.output_lines)
+        _step_output.set(output)
+        run = _current_run.get()
+        if run is not None:
+            run.emit("step_started", {"id": step.id, "name": step.name})
+            output.listeners.append(
+                lambda stream, line: run.emit("output", {"id": step.id, "stream": stream, "line": line})
+            )
+        started = time.perf_counter()
+        cache_status = None
+        try:
+            if step.cache_ttl is None:
+                result = await step.handler(step.render(context))
+            else:
+                result, cache_status = await self.step_cache.get_or_run(
+                    step.cache_key(context), step.cache_ttl, lambda: step.handler(step.render(context))
+                )
+        except Exception as e:
+            logger.error(f"🧙 Step '{step.id}' failed: {e}")
+            outcome = self._outcome(step, "error", error=str(e), started=started)
+        else:
+            outcome = self._outcome(step, "success", result=result, started=started)
+            if cache_status is not None:
+                outcome["cache"] = cache_status
+        if output.total:
+            outcome["output"] = list(output.lines)
+            if output.truncated:
+                outcome["output_truncated"] = output.truncated
+        if run is not None:
+            self._step_finished(run, outcome)
+        return outcome
+
+    @staticmethod
+    def _step_finished(run: WorkflowRun, outcome: Dict) -> None:
+        run.steps_done += 1
+        # Ausgabe wurde bereits zeilenweise als output-Ereignis gesendet
+        run.emit("step_finished", {key: value for key, value in outcome.items() if key != "output"})
+
+    @staticmethod
+    def _outcome(
+        step: CompiledStep,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        started: Optional[float] = None,
+    ) -> Dict:
+        outcome = {"step": step.index + 1, "id": step.id, "name": step.name, "status": status}
+        if status == "success":
+            outcome["result"] = result
+        else:
+            outcome["error"] = error
+        if started is not None:
+            outcome["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return outcome
+
+    # ===== Schritt-Handler (Parameter sind beim Registrieren validiert) =====
 
-    async def _execute_command(self, step: Dict, context: Dict) -> Dict:
-        """Führt einen Befehl aus."""
-        command = step.get("command", "")
-        logger.info(f"🧙 Executing command: {command}")
+    async def _execute_generic(self, step: Dict) -> Dict:
+        return {"type": step.get("type", "generic"), "executed": True}
 
-        # Placeholder für Command-Ausführung
+    async def _execute_wait(self, params: Dict) -> Dict:
+        await asyncio.sleep(params["duration"])
+        return {"waited": params["duration"]}
+
+    async def _execute_command(self, params: Dict) -> Dict:
+        """
+        Führt einen Befehl als Subprozess aus (ohne Shell).
+
+        Felder (CommandStep): command (String oder argv-Liste), timeout (Sekunden),
+        env (zusätzliche Variablen), cwd; erlaubt ist nur, was der Runner
+        freigibt (Programme, Variablennamen, Verzeichnisse). Die Ausgabe landet zeilenweise im
+        Ergebnis des Schritts; Exit-Code != 0 oder Timeout lassen ihn scheitern.
+        Kontextwerte aus Platzhaltern besser in der argv-Liste verwenden: im
+        String werden sie mit aufgeteilt.
+        """
+        command = params["command"]
+        env = params["env"]
+        result = await self.runner.run(
+            command if isinstance(command, str) else [str(arg) for arg in command],
+            timeout=params["timeout"],
+            env={str(key): str(value) for key, value in env.items()} if env else None,
+            cwd=params["cwd"],
+            output=_step_output.get(),
+        )
         return {
-            "command": command,
-            "output": "Command executed successfully",
-            "exit_code": 0
+            "command": result["argv"],
+            "exit_code": result["exit_code"],
+            "duration_ms": result["duration_ms"],
         }
 
-    async def _execute_api_call(self, step: Dict, context: Dict) -> Dict:
-        """Führt einen API-Call aus."""
-        endpoint = step.get("endpoint", "")
-        method = step.get("method", "GET")
+    async def _execute_api_call(self, params: Dict) -> Dict:
+        """
+        Führt einen HTTP-Aufruf über den geteilten Client aus.
 
+        Felder (ApiCallStep): endpoint (absolute URL auf einen freigegebenen Host), method, json, params,
+        headers, timeout (Sekunden pro Versuch), max_response_bytes, retries.
+        Status >= 400, Transportfehler nach allen Versuchen oder eine zu große
+        Antwort lassen den Schritt scheitern.
+        """
+        endpoint, method = params["endpoint"], params["method"]
         logger.info(f"🧙 API Call: {method} {endpoint}")
 
-        # Placeholder für API-Call
-        return {
-            "endpoint": endpoint,
-            "method": method,
-            "status_code": 200,
-            "response": {}
-        }
-
-    async def _execute_check(self, step: Dict, context: Dict) -> Dict:
+        result = await self.http.request(
+            method,
+            endpoint,
+            json=params["json"],
+            params=params["params"],
+            headers={key: str(value) for key, value in params["headers"].items()} if params["headers"] else None,
+            timeout=params["timeout"],
+            max_response_bytes=params["max_response_bytes"],
+            retries=params["retries"],
+        )
+        return {"endpoint": endpoint, "method": method, **result}
+
+    async def _execute_check(self, params: Dict) -> Dict:
         """Führt eine Überprüfung aus."""
-        check_type = step.get("check_type", "status")
+        check_type = params["check_type"]
 
         logger.info(f"🧙 Check: {check_type}")
 
@@ -252,7 +656,15 @@ class WizardService:
             "service": "wizard",
             "status": "active" if self.is_running else "idle",
             "workflows_registered": len(self.workflows),
-            "tasks_queued": len(self.task_queue),
+            "tasks_queued": self.task_queue.qsize() if self.task_queue is not None else 0,
+            "runs": {
+                "workers": len(self._workers),
+                "running": sum(1 for run in self.runs.values() if run.status == "running"),
+                "tracked": len(self.runs),
+            },
+            "commands": self.runner.stats(),
+            "http": self.http.stats(),
+            "step_cache": self.step_cache.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
 
@@ -268,6 +680,31 @@ class WizardService:
             for name, workflow in self.workflows.items()
         ]
 
+    def _workflows_changed(self) -> None:
+        self._workflows_body = None
+        resource_versions.bump("workflows")
+
+    def workflows_etag(self) -> str:
+        """ETag der Workflow-Liste, ändert sich mit jedem register/execute."""
+        return resource_versions.etag("workflows")
+
+    async def list_workflows_body(self) -> bytes:
+        """Workflow-Liste als fertiges JSON, neu serialisiert nur nach Änderungen."""
+        if self._workflows_body is None:
+            self._workflows_body = orjson.dumps(await self.list_workflows())
+        return self._workflows_body
+
 
 # Singleton-Instanz
-wizard_service = WizardService()
+wizard_service = WizardService(
+    max_concurrency=settings.WIZARD_MAX_CONCURRENCY,
+    runner=command_runner,
+    output_lines=settings.WIZARD_OUTPUT_LINES,
+    http=http_pool,
+    run_workers=settings.WIZARD_RUN_WORKERS,
+    max_queued_runs=settings.WIZARD_RUN_QUEUE,
+    max_runs=settings.WIZARD_RUN_HISTORY,
+    max_run_events=settings.WIZARD_RUN_EVENTS,
+    step_cache=StepCache(settings.WIZARD_STEP_CACHE_SIZE),
+    commands_enabled=settings.WIZARD_COMMANDS_ENABLED,
+)
@@ -0,0 +1,355 @@
+"""
+NOVA v3 - Workflow-Pläne
+Übersetzt Workflow-Definitionen beim Registrieren in einen unveränderlichen Plan
+
+Beim Registrieren wird jeder Schritt gegen das Schema seines Typs geprüft
+(Pydantic, Defaults und Zahlen wie timeout werden dabei einmal aufgelöst),
+der Handler aus der Registry gebunden und {{ pfad }}-Platzhalter in Strings
+vorab zerlegt. Fehlerhafte Workflows scheitern damit bei der Registrierung statt
+mitten in einer Ausführung, und pro Schritt bleibt zur Laufzeit nur noch das
+Einsetzen der Kontextwerte und ein direkter Handler-Aufruf.
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Literal, Mapping, Optional, Tuple, Type, Union
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+# Fehlerbehandlung: fail_fast bricht laufende Schritte ab, continue lässt
+# unabhängige Zweige weiterlaufen; abhängige Schritte werden in beiden Fällen übersprungen
+ON_ERROR_POLICIES = ("fail_fast", "continue")
+
+# Felder, die der Plan selbst auswertet; alles andere gehört zum Schritt-Typ
+COMMON_FIELDS = frozenset({"id", "name", "type", "depends_on", "description", "cache_ttl"})
+
+DEFAULT_STEP_TYPE = "generic"
+
+# cache_ttl nur für Schritte ohne Nebenwirkungen: Befehle und Wartezeiten
+# müssen jedes Mal laufen, api_call nur mit sicheren Methoden (RFC 9110, 9.2.1)
+UNCACHEABLE_STEP_TYPES = frozenset({"command", "wait"})
+CACHEABLE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+TEMPLATE_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][\w-]*(?:\.[\w-]+)*)\s*\}\}")
+
+# Handler bekommt die Parameter des Schritts mit eingesetzten Kontextwerten
+StepHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class InvalidWorkflow(ValueError):
+    """Workflow-Definition ist ungültig (Schema, unbekannter Typ, Abhängigkeit, Zyklus, doppelte id)"""
+
+
+# ===== Templates =====
+
+class Template:
+    """String mit {{ pfad }}-Platzhaltern, beim Registrieren in Text und Pfade zerlegt"""
+
+    __slots__ = ("source", "parts", "refs")
+
+    def __init__(self, source: str):
+        parts: List[Union[str, Tuple[str, ...]]] = []
+        position = 0
+        for match in TEMPLATE_PATTERN.finditer(source):
+            if match.start() > position:
+                parts.append(source[position:match.start()])
+            parts.append(tuple(match.group(1).split(".")))
+            position = match.end()
+        if position < len(source):
+            parts.append(source[position:])
+        self.source = source
+        self.parts = tuple(parts)
+        self.refs = frozenset(".".join(part) for part in parts if isinstance(part, tuple))
+
+    def render(self, context: Mapping[str, Any]) -> Any:
+        if len(self.parts) == 1 and isinstance(self.parts[0], tuple):
+            # Nur ein Platzhalter: Wert mit seinem Typ übernehmen (z. B. Zahl im JSON-Body)
+            return lookup(context, self.parts[0])
+        return "".join([part if part.__class__ is str else str(lookup(context, part)) for part in self.parts])
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r})"
+
+
+def lookup(context: Mapping[str, Any], path: Tuple[str, ...]) -> Any:
+    value: Any = context
+    for key in path:
+        try:
+            value = value[key]
+        except (KeyError, TypeError, IndexError):
+            raise ValueError(f"Unknown template variable '{'.'.join(path)}'") from None
+    return value
+
+
+def compile_templates(value: Any) -> Any:
+    """Ersetzt Strings mit Platzhaltern (auch verschachtelt) durch Template-Objekte"""
+    if isinstance(value, str):
+        return Template(value) if TEMPLATE_PATTERN.search(value) else value
+    if isinstance(value, dict):
+        return {key: compile_templates(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [compile_templates(item) for item in value]
+    return value
+
+
+def render_templates(value: Any, context: Mapping[str, Any]) -> Any:
+    if isinstance(value, Template):
+        return value.render(context)
+    if isinstance(value, dict):
+        return {key: render_templates(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render_templates(item, context) for item in value]
+    return value
+
+
+def template_refs(value: Any) -> FrozenSet[str]:
+    if isinstance(value, Template):
+        return value.refs
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return frozenset()
+    return frozenset().union(*(template_refs(item) for item in value))
+
+
+# ===== Schemas der Schritt-Typen =====
+
+class StepSchema(BaseModel):
+    """Parameter eines Schritt-Typs; unbekannte Felder sind meist Tippfehler"""
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class CommandStep(StepSchema):
+    command: Union[str, List[str]] = Field(min_length=1)
+    timeout: Optional[float] = Field(None, gt=0)
+    env: Optional[Dict[str, str]] = None
+    cwd: Optional[str] = None
+
+
+class ApiCallStep(StepSchema):
+    endpoint: str = Field(min_length=1)
+    method: Literal["GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    body: Any = Field(None, alias="json")
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    timeout: Optional[float] = Field(None, gt=0)
+    max_response_bytes: Optional[int] = Field(None, gt=0)
+    retries: Optional[int] = Field(None, ge=0, le=10)
+
+    @field_validator("method", mode="before")
+    @classmethod
+    def _upper(cls, value: Any) -> Any:
+        return value.upper() if isinstance(value, str) else value
+
+
+class CheckStep(StepSchema):
+    check_type: str = "status"
+
+
+class WaitStep(StepSchema):
+    duration: float = Field(1.0, ge=0)
+
+
+@dataclass(frozen=True)
+class StepType:
+    """Eintrag der Handler-Registry; ohne Schema bekommt der Handler den ganzen Schritt"""
+
+    name: str
+    handler: StepHandler
+    schema: Optional[Type[StepSchema]] = None
+
+
+# ===== Plan =====
+
+@dataclass(frozen=True, slots=True)
+class CompiledStep:
+    """Validierter Schritt mit gebundenem Handler"""
+
+    id: str
+    index: int  # Position in der Definition (für die Ergebnisliste)
+    name: str
+    type: str
+    handler: StepHandler
+    params: Dict[str, Any]  # Parameter mit Template-Objekten an Stelle der Platzhalter
+    templated: Tuple[str, ...]  # Parameter, die Platzhalter enthalten
+    refs: FrozenSet[str]  # referenzierte Kontextpfade
+    depends_on: Tuple[str, ...]
+    dependents: Tuple[int, ...]  # Indizes der abhängigen Schritte
+    # Länge der längsten Kette ab dem Schritt; bereite Schritte mit hohem Rang starten zuerst
+    rank: int
+    cache_ttl: Optional[float] = None  # Sekunden; None = Ergebnis nicht cachen
+    definition_key: bytes = b""  # Hash aus Typ und Parametern, unabhängig von id und Workflow
+
+    def cache_key(self, context: Mapping[str, Any]) -> bytes:
+        """Schlüssel für den Ergebnis-Cache: Definition plus referenzierte Kontextwerte"""
+        if not self.refs:
+            return self.definition_key
+        values = [lookup(context, tuple(path.split("."))) for path in sorted(self.refs)]
+        return self.definition_key + orjson.dumps(values, default=str, option=orjson.OPT_SORT_KEYS)
+
+    def render(self, context: Mapping[str, Any]) -> Dict[str, Any]:
+        if not self.templated:
+            return self.params
+        # Nur Parameter mit Platzhaltern neu aufbauen, der Rest wird geteilt
+        params = dict(self.params)
+        for key in self.templated:
+            params[key] = render_templates(params[key], context)
+        return params
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPlan:
+    """Unveränderlicher Ausführungsplan eines Workflows (DAG)"""
+
+    steps: Tuple[CompiledStep, ...]  # in Definitionsreihenfolge
+    order: Tuple[str, ...]  # topologische Reihenfolge
+    max_concurrency: int
+    on_error: str
+
+
+def _compile_params(step_id: str, step: Dict, step_type: StepType) -> Dict[str, Any]:
+    if step_type.schema is None:
+        return {key: value for key, value in step.items() if key != "depends_on"}
+    fields = {key: value for key, value in step.items() if key not in COMMON_FIELDS}
+    try:
+        validated = step_type.schema.model_validate(fields)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'step'}: {error['msg']}" for error in e.errors()
+        )
+        raise InvalidWorkflow(f"Step '{step_id}' ({step_type.name}): {problems}") from None
+    return validated.model_dump(by_alias=True)
+
+
+def _definition_key(type_name: str, params: Dict[str, Any]) -> bytes:
+    canonical = orjson.dumps(
+        [type_name, params],
+        default=lambda value: {"$template": value.source} if isinstance(value, Template) else str(value),
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(canonical).digest()
+
+
+def _cache_ttl(step_id: str, step: Dict, type_name: str, params: Dict[str, Any]) -> Optional[float]:
+    ttl = step.get("cache_ttl")
+    if ttl is None:
+        return None
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0:
+        raise InvalidWorkflow(f"Step '{step_id}': cache_ttl must be a positive number of seconds")
+    if type_name in UNCACHEABLE_STEP_TYPES:
+        raise InvalidWorkflow(f"Step '{step_id}': cache_ttl is not allowed on {type_name} steps")
+    if type_name == "api_call" and params["method"] not in CACHEABLE_METHODS:
+        raise InvalidWorkflow(
+            f"Step '{step_id}': cache_ttl needs a safe method ({', '.join(sorted(CACHEABLE_METHODS))}), "
+            f"got {params['method']}"
+        )
+    return float(ttl)
+
+
+def compile_plan(
+    steps: List[Dict],
+    step_types: Mapping[str, StepType],
+    max_concurrency: int,
+    on_error: str,
+) -> CompiledPlan:
+    """
+    Prüft Schritte und Abhängigkeiten und sortiert topologisch (Kahn).
+
+    Schritte ohne `id` heißen step1, step2, ... Deklariert kein Schritt
+    `depends_on`, bleibt die bisherige Semantik: jeder Schritt hängt vom
+    vorherigen ab.
+    """
+    if on_error not in ON_ERROR_POLICIES:
+        raise InvalidWorkflow(f"on_error must be one of {ON_ERROR_POLICIES}")
+    if max_concurrency < 1:
+        raise InvalidWorkflow("max_concurrency must be at least 1")
+
+    ids: List[str] = []
+    for i, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise InvalidWorkflow(f"Step {i + 1} must be an object")
+        step_id = step.get("id") or f"step{i + 1}"
+        if not isinstance(step_id, str):
+            raise InvalidWorkflow(f"Step {i + 1}: id must be a string")
+        if step_id in ids:
+            raise InvalidWorkflow(f"Duplicate step id '{step_id}'")
+        ids.append(step_id)
+
+    explicit = any("depends_on" in step for step in steps)
+    depends_on: Dict[str, Tuple[str, ...]] = {}
+    for i, (step_id, step) in enumerate(zip(ids, steps)):
+        if not explicit:
+            depends_on[step_id] = (ids[i - 1],) if i else ()
+            continue
+        deps = step.get("depends_on") or []
+        if isinstance(deps, str):
+            deps = [deps]
+        if not isinstance(deps, list) or not all(isinstance(dep, str) for dep in deps):
+            raise InvalidWorkflow(f"Step '{step_id}': depends_on must be a step id or a list of ids")
+        unknown = [dep for dep in deps if dep not in ids]
+        if unknown:
+            raise InvalidWorkflow(f"Step '{step_id}' depends on unknown steps {unknown}")
+        depends_on[step_id] = tuple(dict.fromkeys(deps))
+
+    dependents: Dict[str, List[str]] = {step_id: [] for step_id in ids}
+    for step_id, deps in depends_on.items():
+        for dep in deps:
+            dependents[dep].append(step_id)
+
+    remaining = {step_id: len(deps) for step_id, deps in depends_on.items()}
+    ready = [step_id for step_id in ids if not remaining[step_id]]
+    order: List[str] = []
+    while ready:
+        step_id = ready.pop()
+        order.append(step_id)
+        for child in dependents[step_id]:
+            remaining[child] -= 1
+            if not remaining[child]:
+                ready.append(child)
+    if len(order) != len(ids):
+        cycle = sorted(step_id for step_id, count in remaining.items() if count)
+        raise InvalidWorkflow(f"Dependency cycle between steps {cycle}")
+
+    rank: Dict[str, int] = {}
+    for step_id in reversed(order):
+        rank[step_id] = 1 + max((rank[child] for child in dependents[step_id]), default=0)
+
+    index = {step_id: i for i, step_id in enumerate(ids)}
+    compiled = []
+    for step_id, step in zip(ids, steps):
+        type_name = step.get("type") or DEFAULT_STEP_TYPE
+        step_type = step_types.get(type_name)
+        if step_type is None:
+            raise InvalidWorkflow(f"Step '{step_id}': unknown type '{type_name}', expected one of {sorted(step_types)}")
+        params = compile_templates(_compile_params(step_id, step, step_type))
+        refs = {key: template_refs(value) for key, value in params.items()}
+        cache_ttl = _cache_ttl(step_id, step, type_name, params)
+        if cache_ttl is not None and step_type.schema is None:
+            # Bei generischen Schritten gehören id und name zu den Parametern
+            params_for_key = {key: value for key, value in params.items() if key not in COMMON_FIELDS}
+        else:
+            params_for_key = params
+        compiled.append(CompiledStep(
+            id=step_id,
+            index=index[step_id],
+            name=step.get("name", "Unnamed"),
+            type=type_name,
+            handler=step_type.handler,
+            params=params,
+            templated=tuple(key for key, keys in refs.items() if keys),
+            refs=frozenset().union(*refs.values()),
+            depends_on=depends_on[step_id],
+            dependents=tuple(index[child] for child in dependents[step_id]),
+            rank=rank[step_id],
+            cache_ttl=cache_ttl,
+            definition_key=_definition_key(type_name, params_for_key) if cache_ttl is not None else b"",
+        ))
+
+    return CompiledPlan(
+        steps=tuple(compiled),
+        order=tuple(order),
+        max_concurrency=max_concurrency,
+        on_error=on_error,
+    )
@@ -1,17 +1,29 @@
 """
 🧪 NOVA v3 - Pytest Configuration and Shared Fixtures
 """
+import os
 import pytest
 import asyncio
 from typing import Generator
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.main import app
-from app.database import Base, get_db
-from app.config import settings
+# No LISTEN/NOTIFY connection to the configured Postgres during tests
+os.environ.setdefault("DB_LISTEN_NOTIFY", "false")
+# Test runs saturate the CPU; admission control is covered by its own unit tests
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+# /api/v1/admin stays closed without an admin secret
+os.environ.setdefault("ADMIN_TOKEN", "test-admin-token")
+
+from app.main import app  # noqa: E402
+from app.database import Base, get_async_db, get_db, get_read_db  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.services.agent_registry import agent_registry  # noqa: E402
+from app.services.audit import audit_log  # noqa: E402
+from app.services.auth import token_service  # noqa: E402
 
 
 # Test database setup
@@ -24,6 +36,16 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+# The audit writer inserts through the engine directly, not through get_async_db
+audit_log.engine = async_engine
+token_service.session_factory = TestingAsyncSessionLocal
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -46,20 +68,62 @@ def db_session() -> Generator:
 
 
 @pytest.fixture(scope="function")
-def client(db_session) -> Generator:
-    """Create a test client with database override."""
+async def async_tables():
+    """Create all tables in the async test database for each test."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture(scope="function")
+async def async_db_session(async_tables):
+    """Create a fresh async database session for each test."""
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture(scope="function")
+async def seeded_agents(async_tables):
+    """Insert the four default agents from the seeder."""
+    from app.models import Agent
+    from app.seed import AGENTS
+
+    async with TestingAsyncSessionLocal() as session:
+        session.add_all([Agent(**agent) for agent in AGENTS])
+        await session.commit()
+    agent_registry.invalidate()
+    return AGENTS
+
+
+@pytest.fixture(scope="function")
+def client(db_session, seeded_agents) -> Generator:
+    """Create a test client with database override (default agents seeded)."""
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def admin_headers():
+    """Headers accepted by the /api/v1/admin guard."""
+    return {"X-Admin-Token": settings.ADMIN_TOKEN}
+
+
 @pytest.fixture(scope="session")
 def nova_config():
     """NOVA v3 configuration for tests."""
@@ -0,0 +1,54 @@
+"""
+🧪 NOVA v3 - Integration Tests for the Async Database Layer
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import to_async_url
+from app.models.meta import Migration
+from app.repositories import AsyncRepository
+
+
+@pytest.mark.unit
+class TestAsyncUrl:
+    """Test mapping sync URLs to async drivers."""
+
+    def test_postgres_uses_asyncpg(self):
+        url = to_async_url("postgresql://nova:secret@db:5432/nova_v3")
+        assert url == "postgresql+asyncpg://nova:secret@db:5432/nova_v3"
+
+    def test_psycopg2_uses_asyncpg(self):
+        assert to_async_url("postgresql+psycopg2://db/nova").startswith("postgresql+asyncpg://")
+
+    def test_sqlite_uses_aiosqlite(self):
+        assert to_async_url("sqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+class TestAsyncRepository:
+    """Test async repository helpers against an async session."""
+
+    async def test_session_executes(self, async_db_session: AsyncSession):
+        assert await async_db_session.scalar(text("SELECT 1")) == 1
+
+    async def test_add_get_list_count(self, async_db_session: AsyncSession):
+        repo = AsyncRepository(async_db_session, Migration)
+
+        created = await repo.add(Migration(name="0001_initial"))
+        await repo.add(Migration(name="0002_tasks"))
+        await repo.commit()
+
+        assert created.id is not None
+        assert (await repo.get(created.id)).name == "0001_initial"
+        assert await repo.count() == 2
+        names = [m.name for m in await repo.list(order_by=[Migration.name.desc()], limit=1)]
+        assert names == ["0002_tasks"]
+
+    async def test_delete(self, async_db_session: AsyncSession):
+        repo = AsyncRepository(async_db_session, Migration)
+        await repo.add(Migration(name="obsolete"))
+
+        assert await repo.delete(Migration.name == "obsolete") == 1
+        assert await repo.count(Migration.name == "obsolete") == 0
@@ -0,0 +1,116 @@
+"""
+🧪 NOVA v3 - Integration Tests for Alembic Migrations
+"""
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.models import Agent, Task
+from app.seed import AGENTS, load_synthetic_tasks, run_migrations, seed_agents
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'migrations.db'}"
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+class TestMigrations:
+    """Test the schema is managed by Alembic."""
+
+    def test_upgrade_creates_tables_and_indexes(self, database_url):
+        run_migrations(database_url)
+
+        inspector = inspect(create_engine(database_url))
+        assert {"agents", "tasks", "alembic_version"} <= set(inspector.get_table_names())
+        indexes = {ix["name"] for ix in inspector.get_indexes("tasks")}
+        assert indexes == {
+            "ix_tasks_agent_id_created_at",
+            "ix_tasks_status_created_at",
+            "ix_tasks_created_at",
+            "ix_tasks_active_agent_id",
+        }
+
+    def test_models_match_migrations(self, database_url):
+        run_migrations(database_url)
+
+        with create_engine(database_url).connect() as conn:
+            diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+        # the legacy 'migrations' test table is not part of the Alembic schema
+        diff = [d for d in diff if not (d[0] == "add_table" and d[1].name == "migrations")
+                and not (d[0] == "add_index" and d[1].table.name == "migrations")]
+        assert diff == []
+
+    def test_active_partial_index_is_used(self, database_url):
+        run_migrations(database_url)
+
+        with create_engine(database_url).connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT task_id FROM tasks "
+                "WHERE agent_id = 'forge' AND status IN ('pending', 'in_progress', 'running') "
+                "ORDER BY created_at"
+            )).fetchall()
+        assert any("ix_tasks_" in row[-1] for row in plan)
+
+    def test_adopts_tables_created_by_old_seeder(self, database_url):
+        engine = create_engine(database_url)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE agents (id VARCHAR(50) PRIMARY KEY, name VARCHAR(100) NOT NULL)"))
+            conn.execute(text("INSERT INTO agents (id, name) VALUES ('core', 'CORE')"))
+
+        run_migrations(database_url)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT name FROM agents")).scalar() == "CORE"
+        assert "tasks" in inspect(engine).get_table_names()
+
+    def test_downgrade_to_base(self, database_url):
+        from alembic import command
+        from alembic.config import Config
+        from app.seed import BACKEND_DIR
+
+        run_migrations(database_url)
+        config = Config(str(BACKEND_DIR / "alembic.ini"))
+        config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+        config.set_main_option("sqlalchemy.url", database_url)
+        config.attributes["configure_logger"] = False
+        command.downgrade(config, "base")
+
+        assert set(inspect(create_engine(database_url)).get_table_names()) == {"alembic_version"}
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+class TestSeeding:
+    """Test the bulk seeder against a migrated database."""
+
+    def test_seed_agents_is_idempotent_upsert(self, database_url):
+        run_migrations(database_url)
+        engine = create_engine(database_url)
+        seed_agents(engine)
+        with engine.begin() as conn:
+            conn.execute(Agent.__table__.update().where(Agent.id == "forge").values(enabled=False, role="old"))
+
+        seed_agents(engine)
+
+        with engine.connect() as conn:
+            rows = {r.id: r for r in conn.execute(Agent.__table__.select())}
+        assert set(rows) == {a["id"] for a in AGENTS}
+        assert rows["forge"].role == "Development & Deployment"
+        assert rows["forge"].enabled is False
+        assert rows["core"].capabilities == AGENTS[0]["capabilities"]
+
+    def test_load_synthetic_tasks_in_chunks(self, database_url):
+        run_migrations(database_url)
+        engine = create_engine(database_url)
+        seed_agents(engine)
+
+        assert load_synthetic_tasks(engine, 250, days=7, chunk_size=100, seed=1) == 250
+
+        with engine.connect() as conn:
+            assert conn.scalar(text("SELECT COUNT(*) FROM tasks")) == 250
+            task = conn.execute(Task.__table__.select().where(Task.status == "completed").limit(1)).first()
+        assert "duration_ms" in task.result
@@ -0,0 +1,120 @@
+"""
+🧪 NOVA v3 - Integration Tests for Read-Replica Routing
+Primary und Replicas sind getrennte SQLite-Dateien mit unterschiedlichem Inhalt
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.db_routing import ReplicaRouter, RoutingSession
+
+
+async def make_engine(path, label):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE origin (label VARCHAR(20))"))
+        await conn.execute(text("INSERT INTO origin VALUES (:label)"), {"label": label})
+    return engine
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    primary = await make_engine(tmp_path / "primary.db", "primary")
+    replicas = [
+        await make_engine(tmp_path / "replica0.db", "replica0"),
+        await make_engine(tmp_path / "replica1.db", "replica1"),
+    ]
+    yield primary, replicas
+    for engine in [primary, *replicas]:
+        await engine.dispose()
+
+
+def session_factory(router, **info):
+    return async_sessionmaker(
+        router.primary,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        info={"router": router, **info},
+    )
+
+
+async def read_origin(session):
+    return await session.scalar(text("SELECT label FROM origin LIMIT 1"))
+
+
+@pytest.mark.integration
+class TestReplicaRouting:
+    """Test routing reads to replicas and writes to the primary."""
+
+    async def test_reads_round_robin_across_replicas(self, databases):
+        primary, replicas = databases
+        factory = session_factory(ReplicaRouter(primary, replicas))
+
+        seen = []
+        for _ in range(4):
+            async with factory() as session:
+                seen.append(await read_origin(session))
+        assert seen == ["replica0", "replica1", "replica0", "replica1"]
+
+    async def test_writes_go_to_primary(self, databases):
+        primary, replicas = databases
+        factory = session_factory(ReplicaRouter(primary, replicas, read_your_writes=False))
+
+        async with factory() as session:
+            await session.execute(text("INSERT INTO origin VALUES ('written')"))
+            await session.commit()
+
+        async with primary.connect() as conn:
+            count = await conn.scalar(text("SELECT COUNT(*) FROM origin WHERE label = 'written'"))
+        assert count == 1
+
+    async def test_session_stays_on_primary_after_write(self, databases):
+        primary, replicas = databases
+        factory = session_factory(ReplicaRouter(primary, replicas, read_your_writes=False))
+
+        async with factory() as session:
+            await session.execute(text("UPDATE origin SET label = 'updated'"))
+            assert await read_origin(session) == "updated"
+
+    async def test_read_your_writes_pins_client(self, databases):
+        primary, replicas = databases
+        router = ReplicaRouter(primary, replicas, pin_seconds=60)
+        factory = session_factory(router)
+
+        async with factory(info={"pin_key": "10.0.0.5"}) as session:
+            await session.execute(text("UPDATE origin SET label = 'fresh'"))
+            await session.commit()
+
+        async with factory(info={"pin_key": "10.0.0.5"}) as session:
+            assert await read_origin(session) == "fresh"
+        async with factory(info={"pin_key": "10.0.0.6"}) as session:
+            assert await read_origin(session) in {"replica0", "replica1"}
+
+    async def test_primary_sessions_never_read_from_replicas(self, databases):
+        primary, replicas = databases
+        factory = session_factory(ReplicaRouter(primary, replicas), primary=True)
+
+        async with factory() as session:
+            assert await read_origin(session) == "primary"
+
+    async def test_unhealthy_replica_is_skipped(self, databases, tmp_path):
+        primary, replicas = databases
+        broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router = ReplicaRouter(primary, [broken, replicas[1]])
+
+        assert await router.check_replicas() == {0: False, 1: True}
+        factory = session_factory(router)
+        for _ in range(3):
+            async with factory() as session:
+                assert await read_origin(session) == "replica1"
+        assert [r["healthy"] for r in router.status()] == [False, True]
+        await broken.dispose()
+
+    async def test_falls_back_to_primary_without_healthy_replicas(self, databases):
+        primary, replicas = databases
+        router = ReplicaRouter(primary, replicas)
+        router.mark_unhealthy(0)
+        router.mark_unhealthy(1)
+
+        async with session_factory(router)() as session:
+            assert await read_origin(session) == "primary"
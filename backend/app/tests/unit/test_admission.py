@@ -0,0 +1,224 @@
+"""
+🧪 NOVA v3 - Unit Tests for Admission Control
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.middleware import AdmissionControlMiddleware
+from app.services.guardian import GuardianService
+from app.services.admission import (
+    CRITICAL,
+    LOW,
+    NORMAL,
+    AdmissionController,
+    GradientLimit,
+    Rejected,
+    classify,
+    is_stream,
+)
+
+
+def make_controller(limit: int = 2, pressure=None, **kwargs) -> AdmissionController:
+    return AdmissionController(
+        limit=GradientLimit(initial=limit, min_limit=1, max_limit=100),
+        pressure_source=(lambda: pressure) if pressure else None,
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+class TestClassify:
+    """Test priority classes by path."""
+
+    def test_critical_paths(self):
+        assert classify("GET", "/health") == CRITICAL
+        assert classify("GET", "/metrics") == CRITICAL
+        assert classify("POST", "/api/v1/admin/profile") == CRITICAL
+        assert classify("POST", "/api/v1/agents/phoenix/execute") == CRITICAL
+
+    def test_dashboard_reads_are_low(self):
+        assert classify("GET", "/api/v1/guardian/metrics") == LOW
+        assert classify("GET", "/api/v1/tasks") == LOW
+        assert classify("GET", "/api/wizard/workflows") == LOW
+
+    def test_writes_are_normal(self):
+        assert classify("POST", "/api/v1/tasks") == NORMAL
+        assert classify("POST", "/api/wizard/workflows/execute") == NORMAL
+        assert classify("GET", "/api/v1/agents") == NORMAL
+
+    def test_event_streams_are_not_admitted(self):
+        assert is_stream("/api/wizard/runs/abc123/events")
+        assert not is_stream("/api/wizard/runs/abc123")
+
+
+@pytest.mark.unit
+class TestGradientLimit:
+    """Test the latency-driven limit."""
+
+    def test_grows_while_latency_is_stable(self):
+        limit = GradientLimit(initial=10, max_limit=100)
+        for _ in range(50):
+            limit.update(0.01, in_flight=10)
+        assert limit.limit > 10
+
+    def test_shrinks_when_latency_rises(self):
+        limit = GradientLimit(initial=50, min_limit=4)
+        for _ in range(20):
+            limit.update(0.01, in_flight=50)
+        grown = limit.limit
+        for _ in range(50):
+            limit.update(0.2, in_flight=int(limit.limit))
+        assert limit.limit < grown
+        assert limit.limit >= 4
+
+    def test_does_not_grow_when_underused(self):
+        limit = GradientLimit(initial=10)
+        for _ in range(50):
+            limit.update(0.01, in_flight=1)
+        assert limit.limit == 10
+
+
+@pytest.mark.unit
+class TestAdmissionController:
+    """Test slot handling, queueing and shedding."""
+
+    async def test_admits_up_to_limit_then_queues(self):
+        controller = make_controller(limit=1, max_wait={NORMAL: 1.0, LOW: 0.0})
+        started = await controller.acquire(NORMAL)
+
+        waiter = asyncio.create_task(controller.acquire(NORMAL))
+        await asyncio.sleep(0)
+        assert controller.status()["queued"][NORMAL] == 1
+
+        controller.release(NORMAL, started)
+        await waiter
+        assert controller.in_flight == 1
+        assert controller.admitted[NORMAL] == 2
+
+    async def test_low_priority_is_shed_when_saturated(self):
+        controller = make_controller(limit=1, max_wait={NORMAL: 1.0, LOW: 0.0})
+        await controller.acquire(NORMAL)
+
+        with pytest.raises(Rejected) as exc:
+            await controller.acquire(LOW)
+        assert exc.value.retry_after == 1
+        assert controller.shed[LOW] == 1
+
+    async def test_queue_timeout_rejects(self):
+        controller = make_controller(limit=1, max_wait={NORMAL: 0.01, LOW: 0.0})
+        await controller.acquire(NORMAL)
+
+        with pytest.raises(Rejected, match="queue timeout"):
+            await controller.acquire(NORMAL)
+        assert controller.in_flight == 1
+
+    async def test_normal_waiters_are_served_before_low(self):
+        controller = make_controller(limit=1, max_wait={NORMAL: 1.0, LOW: 1.0})
+        started = await controller.acquire(NORMAL)
+        order = []
+
+        async def request(priority):
+            await controller.acquire(priority)
+            order.append(priority)
+
+        low = asyncio.create_task(request(LOW))
+        await asyncio.sleep(0)
+        normal = asyncio.create_task(request(NORMAL))
+        await asyncio.sleep(0)
+
+        controller.release(NORMAL, started)
+        await normal
+        assert order == [NORMAL]
+        low.cancel()
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        controller = make_controller(limit=1)
+        started = await controller.acquire(NORMAL)
+        waiter = asyncio.create_task(controller.acquire(NORMAL))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release(NORMAL, started)
+        assert controller.in_flight == 0
+        assert controller.status()["queued"][NORMAL] == 0
+
+    async def test_critical_bypasses_limit(self):
+        controller = make_controller(limit=1, max_wait={NORMAL: 0.0, LOW: 0.0})
+        await controller.acquire(NORMAL)
+        started = await controller.acquire(CRITICAL)
+        controller.release(CRITICAL, started)
+        assert controller.in_flight == 1
+
+    async def test_low_priority_shed_under_pressure(self):
+        controller = make_controller(limit=10, pressure={"cpu": 99.0, "memory": 40.0}, cpu_shed=90.0)
+        with pytest.raises(Rejected, match="pressure"):
+            await controller.acquire(LOW)
+        await controller.acquire(NORMAL)
+
+
+@pytest.mark.unit
+class TestGuardianPressure:
+    """Test the cached, smoothed pressure signal."""
+
+    def test_cached_within_ttl(self):
+        guardian = GuardianService()
+        first = guardian.get_pressure()
+        assert set(first) == {"cpu", "memory"}
+        assert guardian.get_pressure() is first
+
+    def test_cpu_is_smoothed(self, monkeypatch):
+        from collections import namedtuple
+        import app.services.guardian as guardian_module
+
+        CpuTimes = namedtuple("CpuTimes", "user system idle iowait")
+        samples = iter([CpuTimes(0, 0, 0, 0), CpuTimes(100, 0, 0, 0)])
+        monkeypatch.setattr(guardian_module.psutil, "cpu_times", lambda: next(samples))
+        guardian = GuardianService()
+        guardian.pressure_ttl = 0.0
+
+        assert guardian.get_pressure()["cpu"] == 0.0
+        # A single saturated sample only moves the value by alpha
+        assert guardian.get_pressure()["cpu"] == pytest.approx(100 * guardian.pressure_alpha)
+
+
+@pytest.mark.unit
+class TestAdmissionControlMiddleware:
+    """Test 503 + Retry-After through the ASGI middleware."""
+
+    async def test_overload_returns_503_but_health_passes(self):
+        controller = make_controller(limit=1, max_wait={NORMAL: 0.0, LOW: 0.0})
+        release = asyncio.Event()
+        app = FastAPI()
+        app.add_middleware(AdmissionControlMiddleware, controller=controller)
+
+        @app.post("/work")
+        async def work():
+            await release.wait()
+            return {"done": True}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            busy = asyncio.create_task(client.post("/work"))
+            while controller.in_flight == 0:
+                await asyncio.sleep(0.001)
+
+            rejected = await client.post("/work")
+            assert rejected.status_code == 503
+            assert rejected.headers["Retry-After"] == "1"
+
+            assert (await client.get("/health")).status_code == 200
+
+            release.set()
+            assert (await busy).status_code == 200
+
+        assert controller.in_flight == 0
+        assert controller.shed[NORMAL] == 1
@@ -0,0 +1,96 @@
+"""
+🧪 NOVA v3 - Unit Tests for the Agent Registry
+"""
+import json
+
+import pytest
+from sqlalchemy import update
+
+from app.models import Agent
+from app.services import agent_registry as registry_module
+from app.services.agent_registry import AgentRegistry
+from app.services.notifications import NotificationListener
+
+
+@pytest.fixture
+async def registry(seeded_agents):
+    return AgentRegistry(ttl=60.0)
+
+
+async def disable(session, agent_id):
+    await session.execute(update(Agent).where(Agent.id == agent_id).values(enabled=False))
+    await session.commit()
+
+
+@pytest.mark.unit
+class TestAgentRegistry:
+    """Test the in-process agent cache."""
+
+    async def test_loads_agents_with_precomputed_bodies(self, registry, async_db_session):
+        snapshot = await registry.get_snapshot(async_db_session)
+
+        assert snapshot.version == 1
+        assert set(snapshot.agents) == {"core", "forge", "phoenix", "guardian"}
+        listed = json.loads(snapshot.list_body)
+        assert [a["id"] for a in listed] == ["core", "forge", "guardian", "phoenix"]
+        assert json.loads(snapshot.detail_bodies["core"])["status"] == "active"
+        assert "🧠".encode() in snapshot.detail_bodies["core"]
+
+    async def test_snapshot_is_immutable(self, registry, async_db_session):
+        snapshot = await registry.get_snapshot(async_db_session)
+        with pytest.raises(TypeError):
+            snapshot.agents["core"]["enabled"] = False
+        with pytest.raises(TypeError):
+            snapshot.agents["new"] = {}
+
+    async def test_serves_cache_until_invalidated(self, registry, async_db_session):
+        first = await registry.get_snapshot(async_db_session)
+        await disable(async_db_session, "forge")
+
+        assert await registry.get_snapshot(async_db_session) is first
+
+        registry.invalidate()
+        second = await registry.get_snapshot(async_db_session)
+        assert second.version == 2
+        assert second.get("forge")["enabled"] is False
+        # the old snapshot is untouched for requests still using it
+        assert first.get("forge")["enabled"] is True
+
+    async def test_notification_invalidates(self, registry, async_db_session):
+        await registry.get_snapshot(async_db_session)
+        assert not registry.is_stale()
+
+        listener = NotificationListener()
+        listener.subscribe("agents_changed", lambda payload: registry.invalidate())
+        listener._on_notify(None, 1234, "agents_changed", "UPDATE")
+        assert registry.is_stale()
+
+    async def test_ttl_expiry_reloads(self, async_db_session, seeded_agents):
+        registry = AgentRegistry(ttl=0.0)
+        first = await registry.get_snapshot(async_db_session)
+        assert (await registry.get_snapshot(async_db_session)).version == first.version + 1
+
+    async def test_settings_switch_disables_agent(self, registry, async_db_session, monkeypatch):
+        monkeypatch.setattr(registry_module.settings, "AGENT_GUARDIAN_ENABLED", False)
+        snapshot = await registry.get_snapshot(async_db_session)
+        assert snapshot.get("guardian")["enabled"] is False
+        assert snapshot.get("core")["enabled"] is True
+
+    async def test_failed_reload_keeps_previous_snapshot(self, registry, async_db_session):
+        snapshot = await registry.get_snapshot(async_db_session)
+
+        class BrokenSession:
+            async def scalars(self, stmt):
+                raise ConnectionError("database down")
+
+        registry.invalidate()
+        assert await registry.get_snapshot(BrokenSession()) is snapshot
+        assert registry.is_stale()
+
+    async def test_first_load_failure_raises(self):
+        class BrokenSession:
+            async def scalars(self, stmt):
+                raise ConnectionError("database down")
+
+        with pytest.raises(ConnectionError):
+            await AgentRegistry().get_snapshot(BrokenSession())
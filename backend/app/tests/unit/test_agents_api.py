@@ -41,3 +41,43 @@ class TestAgentsAPI:
             data = response.json()
             assert "status" in data
             assert data["status"] in ["active", "inactive", "error"]
+
+
+@pytest.mark.unit
+class TestAgentsRegistryAPI:
+    """Test agents served from the database-backed registry."""
+
+    def test_list_agents_from_database(self, client: TestClient, seeded_agents):
+        response = client.get("/api/v1/agents")
+        assert response.status_code == 200
+        data = response.json()
+        assert [a["name"] for a in data] == ["core", "forge", "guardian", "phoenix"]
+        assert data[0]["display_name"] == "CORE"
+        assert data[0]["capabilities"] == seeded_agents[0]["capabilities"]
+
+    def test_get_agent_details(self, client: TestClient, seeded_agents):
+        response = client.get("/api/agents/forge")
+        assert response.status_code == 200
+        assert response.json()["status"] == "active"
+        assert response.headers["content-type"] == "application/json"
+
+    def test_disable_agent_without_restart(self, client: TestClient, seeded_agents):
+        response = client.patch("/api/v1/agents/phoenix", json={"enabled": False})
+        assert response.status_code == 200
+        assert response.json()["status"] == "inactive"
+
+        assert client.get("/api/v1/agents/phoenix").status_code == 503
+        assert client.post("/api/v1/agents/phoenix/execute", json={}).status_code == 503
+        assert client.get("/api/v1/agents/phoenix/status").json()["status"] == "inactive"
+
+        client.patch("/api/v1/agents/phoenix", json={"enabled": True})
+        assert client.get("/api/v1/agents/phoenix").status_code == 200
+
+    def test_update_unknown_agent(self, client: TestClient, seeded_agents):
+        response = client.patch("/api/v1/agents/nonexistent", json={"enabled": False})
+        assert response.status_code == 404
+
+    def test_execute_task(self, client: TestClient, seeded_agents):
+        response = client.post("/api/v1/agents/guardian/execute", json={"action": "scan"})
+        assert response.status_code == 200
+        assert response.json()["agent_name"] == "GUARDIAN"
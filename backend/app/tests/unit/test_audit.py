@@ -0,0 +1,155 @@
+"""
+🧪 NOVA v3 - Unit Tests for the batched audit log
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.models import AuditEvent
+from app.services.audit import AuditLog, audit_log
+from app.tests.conftest import TestingAsyncSessionLocal, async_engine
+
+
+async def count_events() -> int:
+    async with TestingAsyncSessionLocal() as session:
+        return await session.scalar(select(func.count()).select_from(AuditEvent))
+
+
+async def wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+class FailingEngine:
+    def begin(self):
+        raise ConnectionError("database unavailable")
+
+
+@pytest.mark.unit
+class TestAuditLog:
+    """Test queueing, batching and shutdown of the audit writer."""
+
+    async def test_writes_in_multi_row_batches(self, async_tables):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO audit_events"):
+                statements.append(executemany)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        log = AuditLog(async_engine, batch_size=3, flush_interval=0.05)
+        log.start()
+        try:
+            for i in range(7):
+                assert await log.record("task.created", "task", f"t{i}", "127.0.0.1", {"i": i})
+            await wait_for(lambda: log.written == 7)
+        finally:
+            await log.stop()
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+        assert await count_events() == 7
+        assert log.batches == 3
+        # One multi-row VALUES statement per batch, not executemany
+        assert statements == [False, False, False]
+
+    async def test_stop_flushes_queued_events(self, async_tables):
+        log = AuditLog(async_engine, batch_size=100, flush_interval=60)
+        log.start()
+        for i in range(5):
+            await log.record("workflow.registered", "workflow", f"w{i}")
+        await log.stop()
+
+        assert await count_events() == 5
+        assert log.stats()["queued"] == 0
+
+    async def test_backpressure_then_drop(self):
+        log = AuditLog(async_engine, max_queue=2, enqueue_timeout=0.02)
+        log._queue = asyncio.Queue(maxsize=2)
+
+        assert await log.record("a", "task")
+        assert await log.record("b", "task")
+        assert not await log.record("c", "task")
+        assert log.backpressure_waits == 1
+        assert log.dropped == 1
+
+    async def test_backpressure_waits_for_space(self):
+        log = AuditLog(async_engine, max_queue=1, enqueue_timeout=1.0)
+        log._queue = asyncio.Queue(maxsize=1)
+        await log.record("a", "task")
+
+        waiting = asyncio.create_task(log.record("b", "task"))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        log._queue.get_nowait()
+        assert await waiting
+        assert log.dropped == 0
+
+    async def test_failed_batch_is_retried_then_dropped(self):
+        log = AuditLog(FailingEngine(), flush_interval=0.001, max_retries=2)
+        log._queue = asyncio.Queue()
+        await log.record("a", "task")
+        await log.flush()
+
+        assert log.failures == 2
+        assert log.dropped == 1
+        assert log.written == 0
+
+    async def test_record_without_writer_is_dropped(self):
+        log = AuditLog(async_engine)
+        assert not await log.record("a", "task")
+        assert log.dropped == 1
+
+
+@pytest.mark.unit
+class TestAuditAPI:
+    """Test audit hooks on mutations and the query endpoint."""
+
+    def test_task_mutations_are_audited(self, client, admin_headers, monkeypatch):
+        # Flush explicitly on the app loop instead of racing the writer against requests
+        monkeypatch.setattr(audit_log, "flush_interval", 60)
+        task_id = client.post("/api/v1/tasks", json={"agent_id": "core", "action": "deploy"}).json()["id"]
+        client.post(f"/api/v1/tasks/{task_id}/cancel")
+        assert client.portal.call(audit_log.flush) == 2
+
+        events = client.get(
+            "/api/v1/admin/audit", headers=admin_headers, params={"resource_id": task_id}
+        ).json()["events"]
+        assert [e["action"] for e in events] == ["task.cancelled", "task.created"]
+        assert events[1]["details"] == {"agent_id": "core", "action": "deploy"}
+        assert events[0]["actor"] == "testclient"
+
+        stats = client.get("/api/v1/admin/audit/stats", headers=admin_headers).json()
+        assert stats["written"] >= 2
+
+    async def test_time_range_and_pagination(self, client, admin_headers):
+        now = datetime.utcnow()
+        async with TestingAsyncSessionLocal() as session:
+            session.add_all([
+                AuditEvent(occurred_at=now - timedelta(minutes=i), action="scan.cve", resource_type="scan")
+                for i in range(5)
+            ] + [AuditEvent(occurred_at=now - timedelta(days=3), action="scan.cve", resource_type="scan")])
+            await session.commit()
+
+        page = client.get("/api/v1/admin/audit", headers=admin_headers, params={"limit": 3}).json()
+        assert len(page["events"]) == 3
+        cursor = page["next_cursor"]
+        rest = client.get("/api/v1/admin/audit", headers=admin_headers, params={"limit": 3, **cursor}).json()
+        assert len(rest["events"]) == 2
+        assert rest["next_cursor"] is None
+        ids = [e["id"] for e in page["events"] + rest["events"]]
+        assert len(set(ids)) == 5
+
+        old = client.get("/api/v1/admin/audit", headers=admin_headers, params={
+            "since": (now - timedelta(days=4)).isoformat(), "until": (now - timedelta(days=2)).isoformat(),
+        }).json()
+        assert len(old["events"]) == 1
+
+    def test_invalid_range(self, client, admin_headers):
+        now = datetime.utcnow().isoformat()
+        response = client.get("/api/v1/admin/audit", headers=admin_headers, params={"since": now, "until": now})
+        assert response.status_code == 400
@@ -0,0 +1,197 @@
+"""
+🧪 NOVA v3 - Unit Tests for JWT authentication and the verified-token cache
+"""
+import time
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.api import security
+from app.api.routes import live as live_routes
+from app.services.audit import audit_log
+from app.services.auth import InvalidToken, TokenService, token_service
+from app.tests.conftest import TestingAsyncSessionLocal
+
+
+def make_service(**kwargs) -> TokenService:
+    service = TokenService("test-secret", session_factory=TestingAsyncSessionLocal, **kwargs)
+    service.replace_revocations({})
+    return service
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.unit
+class TestTokenService:
+    """Test issuing, verifying and caching tokens."""
+
+    def test_issue_and_verify(self):
+        service = make_service()
+        token, issued = service.issue("alice", ["admin", "read"])
+
+        principal = service.verify(token)
+        assert principal == issued
+        assert principal.scopes == {"admin", "read"}
+        assert principal.expires_at > time.time() + 29 * 60
+
+    def test_repeated_token_is_served_from_cache(self):
+        service = make_service()
+        token, _ = service.issue("alice")
+
+        first = service.verify(token)
+        for _ in range(3):
+            assert service.verify(token) is first
+        assert (service.misses, service.hits) == (1, 3)
+
+    def test_invalid_tokens_are_rejected(self):
+        service = make_service()
+        token, _ = service.issue("alice")
+        forged, _ = TokenService("other-secret").issue("alice")
+
+        for bad in (token[:-2] + "xx", forged, "not-a-jwt"):
+            with pytest.raises(InvalidToken):
+                service.verify(bad)
+        assert service.stats()["cached"] == 0
+
+    def test_cache_is_bounded_lru(self):
+        service = make_service(cache_size=2)
+        a, b, c = (service.issue(name)[0] for name in "abc")
+        service.verify(a)
+        service.verify(b)
+        service.verify(a)
+        service.verify(c)
+
+        misses = service.misses
+        service.verify(a)
+        assert service.misses == misses
+        service.verify(b)
+        assert service.misses == misses + 1
+        assert service.stats()["cached"] == 2
+
+    def test_cached_token_expires(self):
+        service = make_service()
+        token, _ = service.issue("alice", expires_minutes=1)
+        service.verify(token)
+
+        service.clock = lambda: time.time() + 120
+        with pytest.raises(InvalidToken, match="expired"):
+            service.verify(token)
+        assert service.stats()["cached"] == 0
+
+    def test_revocation_applies_to_cached_tokens(self):
+        service = make_service()
+        token, principal = service.issue("alice")
+        service.verify(token)
+
+        service.on_notify(principal.token_id)
+        with pytest.raises(InvalidToken, match="revoked"):
+            service.verify(token)
+
+    def test_reconnect_marks_revocations_stale(self):
+        service = make_service()
+        service.on_notify(None)
+        assert service._stale
+
+    async def test_revocations_are_shared_through_the_database(self, async_tables):
+        service = make_service()
+        token, principal = service.issue("alice")
+        await service.revoke(principal)
+        await service.revoke(principal)
+
+        other = TokenService("test-secret", session_factory=TestingAsyncSessionLocal)
+        await other.ensure_revocations()
+        assert other.is_revoked(principal.token_id)
+        with pytest.raises(InvalidToken, match="revoked"):
+            other.verify(token)
+
+
+@pytest.mark.unit
+class TestAuthAPI:
+    """Test the authentication dependencies and token endpoints."""
+
+    def test_anonymous_access_without_auth_required(self, client):
+        assert client.get("/api/v1/tasks").status_code == 200
+        response = client.get("/api/v1/tasks", headers=bearer("garbage"))
+        assert response.status_code == 401
+
+    def test_auth_required(self, client, monkeypatch):
+        monkeypatch.setattr(token_service, "required", True)
+        token, _ = token_service.issue("dashboard")
+
+        response = client.get("/api/v1/agents")
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+        assert client.get("/api/v1/agents", headers=bearer(token)).status_code == 200
+        # health checks stay open for probes
+        assert client.get("/health").status_code == 200
+
+    def test_issue_me_and_logout(self, client, admin_headers):
+        issued = client.post(
+            "/api/v1/admin/tokens", headers=admin_headers, json={"subject": "alice", "scopes": ["read"]}
+        ).json()
+        headers = bearer(issued["access_token"])
+
+        me = client.get("/api/v1/auth/me", headers=headers).json()
+        assert me["subject"] == "alice"
+        assert me["scopes"] == ["read"]
+        assert me["jti"] == issued["jti"]
+
+        assert client.post("/api/v1/auth/logout", headers=headers).json()["revoked"]
+        response = client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token revoked"
+
+    def test_admin_revoke(self, client, admin_headers):
+        token, _ = token_service.issue("bob")
+
+        def revoke():
+            return client.post("/api/v1/admin/tokens/revoke", headers=admin_headers, json={"token": token})
+
+        assert revoke().status_code == 200
+        assert client.get("/api/v1/tasks", headers=bearer(token)).status_code == 401
+        assert revoke().status_code == 400
+
+    def test_admin_scope_grants_admin_access(self, client, monkeypatch):
+        monkeypatch.setattr(security.settings, "ADMIN_TOKEN", "s3cret")
+        admin, _ = token_service.issue("ops", ["admin"])
+        user, _ = token_service.issue("alice")
+
+        assert client.get("/api/v1/admin/auth", headers=bearer("s3cret")).status_code == 200
+        assert client.get("/api/v1/admin/auth", headers=bearer(admin)).status_code == 200
+        assert client.get("/api/v1/admin/auth", headers=bearer(user)).status_code == 403
+        assert client.get("/api/v1/admin/auth", headers={"X-Admin-Token": admin}).status_code == 401
+
+    def test_admin_closed_without_admin_token(self, client, monkeypatch):
+        monkeypatch.setattr(security.settings, "ADMIN_TOKEN", "")
+        admin, _ = token_service.issue("ops", ["admin"])
+
+        response = client.post("/api/v1/admin/tokens", json={"subject": "mallory", "scopes": ["admin"]})
+        assert response.status_code == 503
+        assert client.get("/api/v1/admin/auth", headers={"X-Admin-Token": ""}).status_code == 503
+        assert client.get("/api/v1/admin/auth", headers={"X-Admin-Token": "guess"}).status_code == 503
+        # admin-scoped JWTs keep working
+        assert client.get("/api/v1/admin/auth", headers=bearer(admin)).status_code == 200
+
+    def test_mutations_are_audited_with_token_subject(self, client, admin_headers, monkeypatch):
+        monkeypatch.setattr(audit_log, "flush_interval", 60)
+        token, _ = token_service.issue("alice")
+        client.post("/api/v1/tasks", json={"agent_id": "core", "action": "deploy"}, headers=bearer(token))
+        client.portal.call(audit_log.flush)
+
+        events = client.get(
+            "/api/v1/admin/audit", headers=admin_headers, params={"action": "task.created"}
+        ).json()["events"]
+        assert events[0]["actor"] == "alice"
+
+    def test_live_channel_requires_token(self, client, monkeypatch):
+        monkeypatch.setattr(token_service, "required", True)
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect("/api/v1/ws/live"):
+                pass
+        assert exc.value.code == live_routes.CLOSE_POLICY_VIOLATION
+
+        token, _ = token_service.issue("dashboard")
+        with client.websocket_connect(f"/api/v1/ws/live?token={token}"):
+            pass
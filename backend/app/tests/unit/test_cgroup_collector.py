@@ -0,0 +1,151 @@
+"""
+🧪 NOVA v3 - Unit Tests for cgroup v2 Container Metrics
+"""
+import json
+
+import pytest
+
+from app.services.cgroups import CgroupCollector
+import app.services.guardian as guardian_module
+from app.services.guardian import GuardianService
+
+N8N_ID = "a" * 64
+PAPERLESS_ID = "b" * 64
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def write_scope(path, usage_usec, memory, memory_max="max", rbytes=0, wbytes=0, pids=1):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "cpu.stat").write_text(f"usage_usec {usage_usec}\nuser_usec {usage_usec}\nsystem_usec 0\n")
+    (path / "memory.current").write_text(f"{memory}\n")
+    (path / "memory.max").write_text(f"{memory_max}\n")
+    (path / "io.stat").write_text(f"8:0 rbytes={rbytes} wbytes={wbytes} rios=1 wios=1 dbytes=0 dios=0\n")
+    (path / "pids.current").write_text(f"{pids}\n")
+
+
+def write_container_config(root, container_id, name, service):
+    directory = root / container_id
+    directory.mkdir(parents=True)
+    (directory / "config.v2.json").write_text(json.dumps({
+        "Name": f"/{name}",
+        "Config": {"Labels": {"com.docker.compose.service": service}},
+    }))
+
+
+@pytest.fixture
+def cgroup_tree(tmp_path):
+    cgroup_root = tmp_path / "cgroup"
+    containers_root = tmp_path / "containers"
+    (cgroup_root).mkdir()
+    (cgroup_root / "cgroup.controllers").write_text("cpu io memory pids\n")
+
+    # systemd driver for n8n, cgroupfs driver for paperless
+    write_scope(cgroup_root / "system.slice" / f"docker-{N8N_ID}.scope", 0, 100 * 1024 ** 2, 200 * 1024 ** 2)
+    write_scope(cgroup_root / "docker" / PAPERLESS_ID, 0, 50 * 1024 ** 2)
+    # unrelated scope must be ignored
+    write_scope(cgroup_root / "system.slice" / "ssh.service", 0, 1024)
+
+    write_container_config(containers_root, N8N_ID, "nova-v3-n8n", "n8n")
+    return cgroup_root, containers_root
+
+
+@pytest.mark.unit
+class TestCgroupCollector:
+    """Test per-container metrics read from a fake cgroup tree."""
+
+    def test_discovers_container_scopes(self, cgroup_tree):
+        cgroup_root, containers_root = cgroup_tree
+        collector = CgroupCollector(str(cgroup_root), str(containers_root))
+
+        assert collector.available()
+        assert set(collector.discover()) == {N8N_ID, PAPERLESS_ID}
+
+    def test_maps_names_and_falls_back_to_short_id(self, cgroup_tree):
+        cgroup_root, containers_root = cgroup_tree
+        collector = CgroupCollector(str(cgroup_root), str(containers_root))
+
+        by_id = {c["id"]: c for c in collector.collect()}
+        assert by_id[N8N_ID[:12]]["name"] == "nova-v3-n8n"
+        assert by_id[N8N_ID[:12]]["service"] == "n8n"
+        assert by_id[PAPERLESS_ID[:12]]["name"] == PAPERLESS_ID[:12]
+
+    def test_first_sample_has_no_rates(self, cgroup_tree):
+        cgroup_root, containers_root = cgroup_tree
+        collector = CgroupCollector(str(cgroup_root), str(containers_root))
+
+        for container in collector.collect():
+            assert container["cpu_percent"] is None
+            assert container["io"]["read_bytes_per_sec"] is None
+
+    def test_rates_between_ticks(self, cgroup_tree):
+        cgroup_root, containers_root = cgroup_tree
+        clock = FakeClock()
+        collector = CgroupCollector(str(cgroup_root), str(containers_root), clock=clock, cpu_count=4)
+        collector.collect()
+
+        # 2 CPU-seconds over 1 second on a 4-core host -> 50 %
+        write_scope(cgroup_root / "system.slice" / f"docker-{N8N_ID}.scope", 2_000_000,
+                    100 * 1024 ** 2, 200 * 1024 ** 2, rbytes=4096, wbytes=8192, pids=7)
+        clock.now += 1.0
+
+        n8n = next(c for c in collector.collect() if c["service"] == "n8n")
+        assert n8n["cpu_percent"] == pytest.approx(50.0)
+        assert n8n["io"]["read_bytes_per_sec"] == pytest.approx(4096)
+        assert n8n["io"]["write_bytes_per_sec"] == pytest.approx(8192)
+        assert n8n["memory"]["percent"] == pytest.approx(50.0)
+        assert n8n["pids"] == 7
+
+    def test_unlimited_memory_has_no_percent(self, cgroup_tree):
+        cgroup_root, containers_root = cgroup_tree
+        collector = CgroupCollector(str(cgroup_root), str(containers_root))
+
+        paperless = next(c for c in collector.collect() if c["id"] == PAPERLESS_ID[:12])
+        assert paperless["memory"]["limit"] is None
+        assert paperless["memory"]["percent"] is None
+
+    def test_missing_cgroup_root(self, tmp_path):
+        collector = CgroupCollector(str(tmp_path / "missing"), str(tmp_path))
+
+        assert not collector.available()
+        assert collector.collect() == []
+
+    def test_guardian_container_alerts(self, cgroup_tree, monkeypatch):
+        cgroup_root, containers_root = cgroup_tree
+        clock = FakeClock()
+        guardian = GuardianService(CgroupCollector(str(cgroup_root), str(containers_root), clock=clock, cpu_count=1))
+        monkeypatch.setattr(guardian_module.psutil, "cpu_percent", lambda interval=None: 10.0)
+        guardian.sample()
+
+        write_scope(cgroup_root / "system.slice" / f"docker-{N8N_ID}.scope", 900_000,
+                    195 * 1024 ** 2, 200 * 1024 ** 2)
+        clock.now += 1.0
+        guardian.sample()
+
+        alerts = guardian._evaluate_container_alerts(guardian.get_container_metrics())
+        assert {a["type"] for a in alerts} == {"container_cpu", "container_memory"}
+        assert all(a["container"] == "nova-v3-n8n" for a in alerts)
+
+    def test_readers_do_not_reset_rate_baseline(self, cgroup_tree, monkeypatch):
+        cgroup_root, containers_root = cgroup_tree
+        clock = FakeClock()
+        guardian = GuardianService(CgroupCollector(str(cgroup_root), str(containers_root), clock=clock, cpu_count=1))
+        monkeypatch.setattr(guardian_module.psutil, "cpu_percent", lambda interval=None: 10.0)
+        guardian.sample()
+        write_scope(cgroup_root / "system.slice" / f"docker-{N8N_ID}.scope", 400_000, 100 * 1024 ** 2)
+        clock.now += 1.0
+        guardian.sample()
+
+        # Endpoints, alerts and the live channel read the last sample instead of collecting again
+        clock.now += 0.001
+        for _ in range(3):
+            n8n = next(c for c in guardian.get_container_metrics() if c["id"] == N8N_ID[:12])
+            assert n8n["cpu_percent"] == pytest.approx(40.0)
+            guardian.get_alerts()
+        assert len(guardian.metrics_history) == 2
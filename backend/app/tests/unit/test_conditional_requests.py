@@ -0,0 +1,127 @@
+"""
+🧪 NOVA v3 - Unit Tests for ETag / If-None-Match Support
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.notifications import NotificationListener
+from app.services.versions import ResourceVersions, resource_versions
+
+
+def revalidate(client: TestClient, url: str):
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+    return etag, client.get(url, headers={"If-None-Match": etag})
+
+
+@pytest.mark.unit
+class TestConditionalRequests:
+    """Test 304 answers for unchanged dashboard resources."""
+
+    def test_agents_not_modified(self, client: TestClient):
+        etag, response = revalidate(client, "/api/v1/agents")
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_agents_etag_changes_on_update(self, client: TestClient):
+        etag, _ = revalidate(client, "/api/v1/agents")
+        client.patch("/api/v1/agents/forge", json={"enabled": False})
+
+        response = client.get("/api/v1/agents", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_agent_detail_not_modified(self, client: TestClient):
+        _, response = revalidate(client, "/api/v1/agents/core")
+        assert response.status_code == 304
+
+    def test_tasks_not_modified_until_write(self, client: TestClient):
+        etag, response = revalidate(client, "/api/v1/tasks")
+        assert response.status_code == 304
+
+        client.post("/api/v1/tasks", json={"agent_id": "forge", "action": "build"})
+        response = client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+
+    def test_tasks_etag_depends_on_query(self, client: TestClient):
+        client.post("/api/v1/tasks", json={"agent_id": "forge", "action": "build"})
+        etag, _ = revalidate(client, "/api/v1/tasks?agent_id=forge")
+        response = client.get("/api/v1/tasks?agent_id=core", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_tasks_etag_follows_content_not_local_version(self, client: TestClient, monkeypatch):
+        etag, _ = revalidate(client, "/api/v1/tasks")
+        # A write from another worker without a working LISTEN/NOTIFY never bumps our counter
+        monkeypatch.setattr(resource_versions, "bump", lambda resource: 0)
+        client.post("/api/v1/tasks", json={"agent_id": "forge", "action": "build"})
+
+        response = client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+
+    def test_task_detail_revalidates_after_cancel(self, client: TestClient):
+        task_id = client.post("/api/v1/tasks", json={"agent_id": "forge", "action": "build"}).json()["id"]
+        etag, response = revalidate(client, f"/api/v1/tasks/{task_id}")
+        assert response.status_code == 304
+
+        client.post(f"/api/v1/tasks/{task_id}/cancel")
+        response = client.get(f"/api/v1/tasks/{task_id}", headers={"If-None-Match": etag})
+        assert response.json()["status"] == "cancelled"
+
+    def test_workflows_not_modified_until_register(self, client: TestClient):
+        etag, response = revalidate(client, "/api/wizard/workflows")
+        assert response.status_code == 304
+
+        client.post("/api/wizard/workflows", json={"name": "etag_check", "steps": []})
+        response = client.get("/api/wizard/workflows", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_if_none_match_list_and_wildcard(self, client: TestClient):
+        etag, _ = revalidate(client, "/api/v1/agents")
+        strong = etag.removeprefix("W/")
+        response = client.get("/api/v1/agents", headers={"If-None-Match": f'"other", {strong}'})
+        assert response.status_code == 304
+        assert client.get("/api/v1/agents", headers={"If-None-Match": "*"}).status_code == 304
+
+
+@pytest.mark.unit
+class TestResourceVersions:
+    """Test the version counters behind the ETags."""
+
+    def test_bump_changes_etag(self):
+        versions = ResourceVersions()
+        before = versions.etag("tasks")
+        versions.bump("tasks")
+        assert versions.etag("tasks") != before
+        assert versions.get("tasks") == 1
+
+    def test_epoch_differs_per_process(self):
+        assert ResourceVersions().etag("tasks") != ResourceVersions().etag("tasks")
+
+    def test_variants(self):
+        versions = ResourceVersions()
+        assert versions.etag("tasks", "forge", 100) != versions.etag("tasks", "core", 100)
+        assert versions.etag("tasks", "forge", 100) == versions.etag("tasks", "forge", 100)
+
+    def test_tasks_notification_bumps_version(self):
+        listener = NotificationListener()
+        listener.subscribe("tasks_changed", lambda payload: resource_versions.bump("tasks"))
+        before = resource_versions.get("tasks")
+        listener._on_notify(None, 42, "tasks_changed", "INSERT")
+        assert resource_versions.get("tasks") == before + 1
+
+    def test_failing_callback_does_not_block_others(self):
+        listener = NotificationListener()
+        seen = []
+
+        def broken(payload):
+            raise RuntimeError("boom")
+
+        listener.subscribe("agents_changed", broken)
+        listener.subscribe("agents_changed", seen.append)
+        listener.dispatch("agents_changed", "UPDATE")
+        assert seen == ["UPDATE"]
@@ -0,0 +1,83 @@
+"""
+🧪 NOVA v3 - Unit Tests for CORE Routing API
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.agent_load import agent_load
+from app.services.core_router import core_router
+
+
+@pytest.fixture(autouse=True)
+def reset_routing():
+    agent_load.reset()
+    core_router.decisions.clear()
+    core_router.routed.clear()
+    core_router.unroutable.clear()
+
+
+@pytest.mark.unit
+class TestCoreRouteAPI:
+    """Test POST /api/v1/core/route."""
+
+    def test_route_by_capability(self, client: TestClient):
+        response = client.post("/api/v1/core/route", json={"capabilities": ["docker", "ansible"]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["agent_id"] == "forge"
+        assert data["agent_name"] == "FORGE"
+        assert data["task_id"] is None
+
+    def test_route_uses_queue_depth(self, client: TestClient):
+        # monitoring: phoenix and guardian; load up guardian
+        for _ in range(2):
+            client.post("/api/v1/tasks", json={"agent_id": "guardian", "action": "scan"})
+
+        data = client.post("/api/v1/core/route", json={"capabilities": ["monitoring"]}).json()
+        assert data["agent_id"] == "phoenix"
+        depths = {c["agent_id"]: c["queue_depth"] for c in data["candidates"]}
+        assert depths == {"phoenix": 0, "guardian": 2}
+
+    def test_dispatch_creates_task(self, client: TestClient):
+        response = client.post("/api/v1/core/route", json={
+            "capabilities": ["backup"], "action": "backup", "parameters": {"target": "db"}, "dispatch": True,
+        })
+        task_id = response.json()["task_id"]
+        task = client.get(f"/api/v1/tasks/{task_id}").json()
+        assert task["agent"] == "phoenix"
+        assert task["parameters"] == {"target": "db"}
+
+    def test_dispatch_requires_action(self, client: TestClient):
+        response = client.post("/api/v1/core/route", json={"capabilities": ["backup"], "dispatch": True})
+        assert response.status_code == 400
+        # Rejected before routing: no orphaned decision
+        assert core_router.stats()["total"] == 0
+        assert not core_router.decisions
+
+    def test_deleting_active_task_releases_load(self, client: TestClient):
+        task_ids = [
+            client.post("/api/v1/tasks", json={"agent_id": "guardian", "action": "scan"}).json()["id"]
+            for _ in range(2)
+        ]
+        client.patch(f"/api/v1/tasks/{task_ids[1]}", json={"status": "completed"})
+        assert agent_load.depth("guardian") == 1
+
+        client.delete(f"/api/v1/tasks/{task_ids[1]}")
+        assert agent_load.depth("guardian") == 1
+        client.delete(f"/api/v1/tasks/{task_ids[0]}")
+        assert agent_load.depth("guardian") == 0
+
+    def test_disabled_agents_are_skipped(self, client: TestClient):
+        client.patch("/api/v1/agents/forge", json={"enabled": False})
+        response = client.post("/api/v1/core/route", json={"capabilities": ["coding"]})
+        assert response.status_code == 503
+
+    def test_requires_capabilities(self, client: TestClient):
+        assert client.post("/api/v1/core/route", json={"capabilities": []}).status_code == 422
+
+    def test_decisions_endpoint(self, client: TestClient):
+        client.post("/api/v1/core/route", json={"capabilities": ["security"]})
+        data = client.get("/api/v1/core/route/decisions").json()
+        assert data["total"] == 1
+        assert data["recent"][0]["agent_id"] == "guardian"
+        assert "load" in data
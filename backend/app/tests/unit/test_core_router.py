@@ -0,0 +1,87 @@
+"""
+🧪 NOVA v3 - Unit Tests for CORE Capability Routing
+"""
+import pytest
+
+from app.services.agent_load import AgentLoadTracker
+from app.services.agent_registry import AgentRegistry, AgentSnapshot
+from app.services.core_router import CoreRouter, NoAgentAvailable
+
+
+def make_snapshot(**agents):
+    """agents: id -> (capabilities, enabled)"""
+    data = {
+        agent_id: {"id": agent_id, "name": agent_id.upper(), "capabilities": tuple(caps), "enabled": enabled}
+        for agent_id, (caps, enabled) in agents.items()
+    }
+    return AgentSnapshot(version=3, agents=data, capability_index=AgentRegistry()._index(data))
+
+
+SNAPSHOT = make_snapshot(
+    forge=(["coding", "docker", "deployment"], True),
+    phoenix=(["docker", "backup", "monitoring"], True),
+    guardian=(["monitoring", "security"], True),
+    legacy=(["coding", "docker"], False),
+)
+
+
+@pytest.mark.unit
+class TestCoreRouter:
+    """Test routing tasks by capability and load."""
+
+    def test_index_only_contains_enabled_agents(self):
+        assert SNAPSHOT.capability_index["docker"] == {"forge", "phoenix"}
+        assert SNAPSHOT.capability_index["coding"] == {"forge"}
+
+    def test_candidates_are_intersection(self):
+        router = CoreRouter()
+        assert router.candidates(SNAPSHOT, ["docker", "monitoring"]) == ["phoenix"]
+        assert router.candidates(SNAPSHOT, ["docker"]) == ["forge", "phoenix"]
+        assert router.candidates(SNAPSHOT, ["coding", "security"]) == []
+        assert router.candidates(SNAPSHOT, ["unknown"]) == []
+
+    def test_prefers_less_loaded_agent(self):
+        load = AgentLoadTracker()
+        for _ in range(3):
+            load.task_queued("forge")
+
+        decision = CoreRouter().route(SNAPSHOT, ["docker"], load)
+
+        assert decision["agent_id"] == "phoenix"
+        assert [c["agent_id"] for c in decision["candidates"]] == ["phoenix", "forge"]
+        assert decision["registry_version"] == 3
+
+    def test_latency_weighs_into_score(self):
+        load = AgentLoadTracker()
+        load.task_queued("phoenix")
+        load.task_finished("phoenix", duration=0.1)
+        load.task_queued("forge")
+        load.task_finished("forge", duration=5.0)
+        load.task_queued("forge")
+
+        assert CoreRouter().route(SNAPSHOT, ["docker"], load)["agent_id"] == "phoenix"
+        assert load.depth("forge") == 1
+        assert load.latency_ms("forge") == pytest.approx(5000)
+
+    def test_tie_prefers_specialist(self):
+        snapshot = make_snapshot(
+            general=(["monitoring", "security", "backup"], True),
+            watcher=(["monitoring"], True),
+        )
+        assert CoreRouter().route(snapshot, ["monitoring"], AgentLoadTracker())["agent_id"] == "watcher"
+
+    def test_unroutable_is_recorded(self):
+        router = CoreRouter()
+        with pytest.raises(NoAgentAvailable):
+            router.route(SNAPSHOT, ["coding", "security"], AgentLoadTracker())
+        assert router.stats()["unroutable"] == {"coding,security": 1}
+
+    def test_decisions_are_recorded(self):
+        router = CoreRouter(history_size=2)
+        for _ in range(3):
+            router.route(SNAPSHOT, ["security"], AgentLoadTracker())
+
+        stats = router.stats()
+        assert stats["total"] == 3
+        assert stats["by_agent"] == {"guardian": 3}
+        assert [d["decision_id"] for d in stats["recent"]] == [3, 2]
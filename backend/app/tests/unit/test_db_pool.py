@@ -0,0 +1,117 @@
+"""
+🧪 NOVA v3 - Unit Tests for Connection Pool Instrumentation
+"""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.services.db_pool import InstrumentedQueuePool, PoolAutoscaler, PoolMonitor
+
+
+@pytest.fixture
+def monitored_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+    monitor = PoolMonitor()
+    yield engine, monitor
+    engine.dispose()
+
+
+@pytest.mark.unit
+class TestPoolInstrumentation:
+    """Test pool event listeners and snapshots."""
+
+    def test_counts_checkouts_and_connections(self, monitored_engine):
+        engine, monitor = monitored_engine
+        monitor.attach(engine, "test")
+
+        for _ in range(5):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        snapshot = monitor.snapshot()["test"]
+        assert snapshot["checkouts"] == 5
+        assert snapshot["connections_opened"] == 1
+        assert snapshot["size"] == 2
+        assert snapshot["checked_out"] == 0
+        assert snapshot["wait_ms"]["max"] >= snapshot["wait_ms"]["p50"] >= 0
+
+    def test_records_wait_when_pool_is_exhausted(self, monitored_engine):
+        engine, monitor = monitored_engine
+        monitor.attach(engine, "test")
+        held = [engine.connect(), engine.connect()]
+
+        def release():
+            time.sleep(0.2)
+            held[0].close()
+
+        threading.Thread(target=release).start()
+        with engine.connect():
+            pass
+        held[1].close()
+
+        assert monitor.snapshot()["test"]["wait_ms"]["max"] >= 150
+
+    def test_resize_allows_more_connections(self, monitored_engine):
+        engine, _ = monitored_engine
+        held = [engine.connect(), engine.connect()]
+
+        engine.pool.resize(3)
+        held.append(engine.connect())
+        assert engine.pool.checkedout() == 3
+
+        for conn in held:
+            conn.close()
+        engine.pool.resize(1)
+        assert engine.pool.size() == 1
+        assert engine.pool.checkedin() == 1
+
+
+@pytest.mark.unit
+class TestPoolAutoscaler:
+    """Test adaptive pool sizing decisions."""
+
+    def test_grows_when_waits_exceed_target(self):
+        scaler = PoolAutoscaler(min_size=2, max_size=10, target_wait_ms=5)
+        assert scaler.decide(4, [0.05] * 20, peak_checked_out=4) == 6
+
+    def test_respects_max_size(self):
+        scaler = PoolAutoscaler(min_size=2, max_size=5, target_wait_ms=5)
+        assert scaler.decide(5, [0.05] * 20, peak_checked_out=5) == 5
+
+    def test_shrinks_when_underused(self):
+        scaler = PoolAutoscaler(min_size=2, max_size=10, target_wait_ms=5)
+        assert scaler.decide(8, [0.0001] * 20, peak_checked_out=2) == 7
+        assert scaler.decide(2, [0.0001] * 20, peak_checked_out=0) == 2
+
+    def test_adaptive_pool_resizes(self, monitored_engine):
+        engine, monitor = monitored_engine
+        scaler = PoolAutoscaler(min_size=1, max_size=2, target_wait_ms=5, interval=0)
+        monitor.attach(engine, "test", scaler)
+
+        with engine.connect():
+            pass
+
+        assert engine.pool.size() == 1
+        assert monitor.snapshot()["test"]["adaptive"]["resizes"][0]["to"] == 1
+
+
+@pytest.mark.unit
+class TestPoolEndpoint:
+    """Test the pool metrics admin endpoint."""
+
+    def test_pool_metrics(self, client: TestClient, admin_headers):
+        response = client.get("/api/v1/admin/db/pool", headers=admin_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"sync", "async"}
+        assert "wait_ms" in data["async"]
@@ -0,0 +1,125 @@
+"""
+🧪 NOVA v3 - Unit Tests for the Health Check Service
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.health import HealthService, health_service
+
+
+class FakeSession:
+    """Minimal session stand-in counting executed statements."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def execute(self, statement):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("connection refused")
+
+
+@pytest.fixture(autouse=True)
+def fresh_health_cache():
+    health_service.invalidate()
+    yield
+    health_service.invalidate()
+
+
+@pytest.mark.unit
+class TestHealthService:
+    """Test concurrent, cached dependency checks."""
+
+    async def test_checks_run_concurrently(self):
+        service = HealthService(timeout=1.0, cache_ttl=0)
+
+        async def slow_check():
+            await asyncio.sleep(0.2)
+
+        service.check_redis = slow_check
+        service.check_ai_service = slow_check
+        service.redis_url = "redis://redis:6379/0"
+        service.ai_service_url = "http://ai-service:8000"
+
+        started = time.perf_counter()
+        checks = await service.run_checks(FakeSession(delay=0.2))
+        elapsed = time.perf_counter() - started
+
+        assert set(checks) == {"database", "redis", "ai_service"}
+        assert all(c["status"] == "healthy" for c in checks.values())
+        assert all(c["latency_ms"] >= 150 for c in checks.values())
+        assert elapsed < 0.5
+
+    async def test_timeout_marks_dependency_unhealthy(self):
+        service = HealthService(timeout=0.05, cache_ttl=0)
+
+        async def hanging_check():
+            await asyncio.sleep(5)
+
+        service.check_redis = hanging_check
+        service.redis_url = "redis://redis:6379/0"
+
+        checks = await service.run_checks(FakeSession())
+        assert checks["database"]["status"] == "healthy"
+        assert checks["redis"]["status"] == "unhealthy"
+        assert "timeout" in checks["redis"]["error"]
+
+    async def test_results_are_cached(self):
+        service = HealthService(cache_ttl=60)
+        session = FakeSession()
+
+        await service.run_checks(session)
+        await service.run_checks(session)
+        await asyncio.gather(*(service.run_checks(session) for _ in range(10)))
+        assert session.calls == 1
+
+        service.invalidate()
+        await service.run_checks(session)
+        assert session.calls == 2
+
+    async def test_database_failure(self):
+        service = HealthService(cache_ttl=0)
+        checks = await service.run_checks(FakeSession(fail=True))
+        assert checks["database"]["status"] == "unhealthy"
+        assert "connection refused" in checks["database"]["error"]
+
+    async def test_unconfigured_dependencies_are_skipped(self):
+        service = HealthService(cache_ttl=0)
+        checks = await service.run_checks(FakeSession())
+        assert set(checks) == {"database"}
+
+
+@pytest.mark.unit
+class TestProbeEndpoints:
+    """Test /health, /ready and /live reflect real state."""
+
+    def test_health_reports_latency(self, client: TestClient):
+        data = client.get("/health").json()
+        assert data["checks"]["database"]["status"] == "healthy"
+        assert "latency_ms" in data["checks"]["database"]
+
+    def test_ready(self, client: TestClient):
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    def test_not_ready_when_database_down(self, client: TestClient):
+        from app.database import get_async_db
+        from app.main import app
+
+        app.dependency_overrides[get_async_db] = lambda: FakeSession(fail=True)
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+
+    def test_live(self, client: TestClient):
+        data = client.get("/live").json()
+        assert data["alive"] is True
+        assert data["uptime_seconds"] >= 0
+        assert "event_loop_lag_ms" in data
@@ -0,0 +1,203 @@
+"""
+🧪 NOVA v3 - Unit Tests for the live dashboard channel
+"""
+import contextlib
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from app.api.routes import live as live_routes
+from app.models import Task
+from app.services import live as live_service
+from app.services.guardian import GuardianService
+from app.services.live import LiveBroadcaster, TaskSource, guardian_source, merge_patch
+from app.services.versions import resource_versions
+
+
+class FakeSource:
+    def __init__(self, **states):
+        self.states = states
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return {topic: dict(state) for topic, state in self.states.items()}
+
+
+def frames(client):
+    result = []
+    while not client.queue.empty():
+        result.append(json.loads(client.queue.get_nowait()))
+    return result
+
+
+@pytest.mark.unit
+class TestMergePatch:
+    """Test the RFC 7386 diff."""
+
+    def test_changed_added_and_removed(self):
+        old = {"cpu": 10, "containers": {"a": {"cpu": 1, "mem": 2}, "b": {"cpu": 3}}, "gone": 1}
+        new = {"cpu": 12, "containers": {"a": {"cpu": 1, "mem": 5}}, "new": [1, 2]}
+
+        assert merge_patch(old, new) == {
+            "cpu": 12,
+            "containers": {"a": {"mem": 5}, "b": None},
+            "new": [1, 2],
+            "gone": None,
+        }
+
+    def test_unchanged_is_empty(self):
+        state = {"cpu": 1, "nested": {"x": [1]}}
+        assert merge_patch(state, dict(state)) == {}
+
+
+@pytest.mark.unit
+class TestLiveBroadcaster:
+    """Test subscription, delta encoding and fan-out."""
+
+    async def test_full_frame_then_deltas(self):
+        source = FakeSource(demo={"cpu": 10, "memory": 50})
+        broadcaster = LiveBroadcaster(interval=60)
+        broadcaster.register(source, "demo")
+        client = broadcaster.connect()
+        broadcaster.subscribe(client, ["demo"])
+
+        await broadcaster.tick()
+        assert frames(client) == [{"type": "full", "topic": "demo", "seq": 1, "data": {"cpu": 10, "memory": 50}}]
+
+        await broadcaster.tick()
+        assert frames(client) == []
+
+        source.states["demo"]["cpu"] = 20
+        await broadcaster.tick()
+        assert frames(client) == [{"type": "delta", "topic": "demo", "seq": 2, "patch": {"cpu": 20}}]
+        broadcaster.disconnect(client)
+
+    async def test_late_subscriber_gets_cached_full_frame(self):
+        broadcaster = LiveBroadcaster(interval=60)
+        broadcaster.register(FakeSource(demo={"cpu": 10}), "demo")
+        first = broadcaster.connect()
+        broadcaster.subscribe(first, ["demo"])
+        await broadcaster.tick()
+
+        second = broadcaster.connect()
+        assert broadcaster.subscribe(second, ["demo", "nope"]) == ["nope"]
+        assert frames(second) == [{"type": "full", "topic": "demo", "seq": 1, "data": {"cpu": 10}}]
+
+    async def test_frames_are_encoded_once(self):
+        broadcaster = LiveBroadcaster(interval=60)
+        source = FakeSource(demo={"cpu": 10})
+        broadcaster.register(source, "demo")
+        clients = [broadcaster.connect() for _ in range(3)]
+        for client in clients:
+            broadcaster.subscribe(client, ["demo"])
+        await broadcaster.tick()
+        source.states["demo"]["cpu"] = 11
+        await broadcaster.tick()
+
+        deltas = [client.queue._queue[-1] for client in clients]
+        assert all(delta is deltas[0] for delta in deltas)
+
+    async def test_unsubscribed_sources_are_not_polled(self):
+        broadcaster = LiveBroadcaster(interval=60)
+        polled, idle = FakeSource(a={"x": 1}), FakeSource(b={"y": 1})
+        broadcaster.register(polled, "a")
+        broadcaster.register(idle, "b")
+        client = broadcaster.connect()
+        broadcaster.subscribe(client, ["a"])
+
+        await broadcaster.tick()
+        assert (polled.calls, idle.calls) == (1, 0)
+
+    async def test_slow_consumer_is_dropped(self):
+        source = FakeSource(demo={"n": 0})
+        broadcaster = LiveBroadcaster(interval=60, queue_size=2)
+        broadcaster.register(source, "demo")
+        slow = broadcaster.connect()
+        broadcaster.subscribe(slow, ["demo"])
+
+        for n in range(4):
+            source.states["demo"]["n"] = n
+            await broadcaster.tick()
+
+        assert slow.dropped
+        assert slow not in broadcaster.clients
+        assert broadcaster.status()["dropped_total"] == 1
+        assert await slow.next_frame() is None
+
+
+@pytest.mark.unit
+class TestTaskSource:
+    """Test the task topic source."""
+
+    async def test_reloads_only_after_change(self, async_db_session):
+        source = TaskSource(session_factory=lambda: contextlib.nullcontext(async_db_session))
+        now = datetime.utcnow()
+        async_db_session.add(Task(task_id="t1", agent_id="core", action="deploy", status="pending",
+                                  created_at=now, updated_at=now))
+        await async_db_session.commit()
+
+        state = await source()
+        assert state["tasks"]["t1"]["status"] == "pending"
+
+        task = await async_db_session.get(Task, "t1")
+        task.status = "completed"
+        await async_db_session.commit()
+        assert (await source())["tasks"]["t1"]["status"] == "pending"
+
+        resource_versions.bump("tasks")
+        assert (await source())["tasks"]["t1"]["status"] == "completed"
+
+
+@pytest.mark.unit
+class TestGuardianSource:
+    """Test that the guardian topic reads the sampler instead of sampling."""
+
+    async def test_reads_latest_sample_only(self, monkeypatch):
+        service = GuardianService()
+        monkeypatch.setattr(live_service, "guardian", service)
+
+        def fail():
+            raise AssertionError("the broadcaster must not sample")
+        monkeypatch.setattr(service, "_sample_system_metrics", fail)
+        assert await guardian_source() == {}
+
+        service._latest_at = time.monotonic()
+        service._latest = {
+            "timestamp": "2026-01-01T00:00:00",
+            "cpu": {"percent": 12.0}, "memory": {"percent": 40.0}, "disk": {"percent": 95.0},
+            "containers": [], "anomalies": [],
+        }
+        for _ in range(3):
+            state = await guardian_source()
+        assert state["guardian"]["cpu"] == 12.0
+        assert list(state["alerts"]) == ["disk:"]
+        assert service.metrics_history == []
+
+
+@pytest.mark.unit
+class TestLiveWebSocket:
+    """Test the /api/v1/ws/live endpoint."""
+
+    def test_subscribe_and_receive(self, client, monkeypatch):
+        broadcaster = LiveBroadcaster(interval=0.01)
+        source = FakeSource(demo={"cpu": 10})
+        broadcaster.register(source, "demo")
+        monkeypatch.setattr(live_routes, "live_broadcaster", broadcaster)
+
+        with client.websocket_connect("/api/v1/ws/live?topics=demo") as ws:
+            assert ws.receive_json() == {"type": "full", "topic": "demo", "seq": 1, "data": {"cpu": 10}}
+            source.states["demo"]["cpu"] = 30
+            assert ws.receive_json()["patch"] == {"cpu": 30}
+
+            ws.send_json({"action": "subscribe", "topics": ["unknown"]})
+            error = ws.receive_json()
+            assert error["type"] == "error"
+            assert "unknown" in error["detail"]
+
+            ws.send_text("not json")
+            assert ws.receive_json() == {"type": "error", "detail": "Invalid JSON"}
+
+        assert broadcaster.clients == set()
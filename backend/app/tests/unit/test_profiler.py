@@ -0,0 +1,120 @@
+"""
+🧪 NOVA v3 - Unit Tests for the Sampling Profiler
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import security
+from app.services.profiler import ProfilerBusy, ProfilerService, StackSampler, profiler_service
+
+
+def busy_worker(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.unit
+class TestStackSampler:
+    """Test collapsed stack sampling."""
+
+    def test_samples_other_threads(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_worker, args=(stop,), name="busy")
+        worker.start()
+        try:
+            sampler = StackSampler(interval=0.001, duration=1.0)
+            for _ in range(20):
+                sampler.sample()
+        finally:
+            stop.set()
+            worker.join()
+
+        assert sampler.samples == 20
+        busy = [stack for stack in sampler.stacks if stack.startswith("thread:busy;")]
+        assert busy and all("busy_worker (" in stack for stack in busy)
+
+    async def test_samples_waiting_tasks(self):
+        async def waiting_for_io():
+            await asyncio.sleep(1)
+
+        task = asyncio.create_task(waiting_for_io())
+        await asyncio.sleep(0)
+        sampler = StackSampler(interval=0.001, duration=1.0, loop=asyncio.get_running_loop())
+        sampler.sample()
+        task.cancel()
+
+        assert any(s.startswith("asyncio;") and "waiting_for_io" in s for s in sampler.stacks)
+
+    def test_stops_at_deadline(self):
+        sampler = StackSampler(interval=0.001, duration=0.02)
+        sampler.start()
+        time.sleep(0.1)
+        assert not sampler._thread.is_alive()
+        assert sampler.samples > 0
+
+
+@pytest.mark.unit
+class TestProfilerService:
+    """Test profiling sessions."""
+
+    async def test_profile_returns_collapsed_stacks(self):
+        result = await ProfilerService().profile(0.05, interval_ms=2)
+        assert result["samples"] > 0
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in result["collapsed"])
+        assert result["allocations"] is None
+
+    async def test_only_one_session(self):
+        service = ProfilerService()
+        first = asyncio.create_task(service.profile(0.1))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ProfilerBusy):
+            await service.profile(0.1)
+        await first
+        assert not service.running
+
+    async def test_memory_snapshot(self):
+        result = await ProfilerService().profile(0.02, memory=True, memory_top=5)
+        assert isinstance(result["allocations"], list)
+        assert len(result["allocations"]) <= 5
+
+    async def test_duration_is_capped(self):
+        service = ProfilerService(max_seconds=0.02)
+        result = await service.profile(30)
+        assert result["seconds"] < 1
+
+
+@pytest.mark.unit
+class TestProfileEndpoint:
+    """Test POST /api/v1/admin/profile."""
+
+    def test_collapsed_format(self, client: TestClient, admin_headers):
+        response = client.post(
+            "/api/v1/admin/profile?seconds=0.05&interval_ms=5&format=collapsed", headers=admin_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "thread:" in response.text
+
+    def test_limits_duration(self, client: TestClient, admin_headers):
+        assert client.post("/api/v1/admin/profile?seconds=600", headers=admin_headers).status_code == 422
+
+    def test_admin_token_required_when_configured(self, client: TestClient, monkeypatch):
+        monkeypatch.setattr(security.settings, "ADMIN_TOKEN", "s3cret")
+
+        assert client.get("/api/v1/admin/requests").status_code == 401
+        assert client.get("/api/v1/admin/requests", headers={"X-Admin-Token": "wrong"}).status_code == 401
+        assert client.get("/api/v1/admin/requests", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+        assert client.get("/api/v1/admin/requests", headers={"X-Admin-Token": "s3cret"}).status_code == 200
+
+    @pytest.mark.parametrize("admin_token,status", [("", 503), ("s3cret", 401)])
+    def test_anonymous_callers_cannot_profile(self, client: TestClient, monkeypatch, admin_token, status):
+        monkeypatch.setattr(security.settings, "ADMIN_TOKEN", admin_token)
+        started = []
+        monkeypatch.setattr(profiler_service, "profile", lambda *args, **kwargs: started.append(args))
+
+        assert client.post("/api/v1/admin/profile?seconds=60&memory=true").status_code == status
+        assert started == []
@@ -0,0 +1,168 @@
+"""
+🧪 NOVA v3 - Unit Tests for Request Metrics
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import RequestMetricsMiddleware
+from app.services.request_metrics import UNMATCHED_ROUTE, Histogram, RequestMetrics, request_metrics
+
+
+def make_app(metrics: RequestMetrics) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.05)
+        return {"slow": True}
+
+    @app.get("/blocking")
+    def blocking():
+        time.sleep(0.03)
+        return {}
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return app
+
+
+@pytest.mark.unit
+class TestHistogram:
+    """Test the fixed-bucket histogram."""
+
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram((0.01, 0.1, 1.0))
+        for value in [0.005] * 50 + [0.05] * 45 + [0.5] * 5:
+            histogram.observe(value)
+
+        assert histogram.counts == [50, 45, 5, 0]
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) == pytest.approx(0.01)
+        assert 0.01 < histogram.quantile(0.9) < 0.1
+        assert 0.1 < histogram.quantile(0.99) <= 1.0
+
+    def test_empty(self):
+        assert Histogram((1.0,)).quantile(0.99) == 0.0
+
+
+@pytest.mark.unit
+class TestRequestMetricsMiddleware:
+    """Test per-route recording through the middleware."""
+
+    def test_records_route_template(self):
+        metrics = RequestMetrics()
+        client = TestClient(make_app(metrics))
+        for item_id in range(3):
+            client.get(f"/items/{item_id}")
+
+        routes = {(r["method"], r["route"]): r for r in metrics.snapshot()["routes"]}
+        stats = routes[("GET", "/items/{item_id}")]
+        assert stats["count"] == 3
+        assert stats["statuses"] == {200: 3}
+        assert stats["avg_size_bytes"] == len(b'{"id":0}')
+
+    def test_unmatched_and_errors(self):
+        metrics = RequestMetrics()
+        client = TestClient(make_app(metrics), raise_server_exceptions=False)
+        client.get("/does/not/exist/1")
+        client.get("/does/not/exist/2")
+        client.get("/fail")
+
+        routes = {(r["method"], r["route"]): r for r in metrics.snapshot()["routes"]}
+        assert routes[("GET", UNMATCHED_ROUTE)]["statuses"] == {404: 2}
+        assert routes[("GET", "/fail")]["errors"] == 1
+        assert metrics.snapshot()["in_flight"] == 0
+
+    def test_slow_request_log_with_stack(self):
+        metrics = RequestMetrics(slow_threshold_ms=20, sample_interval=0.002)
+        client = TestClient(make_app(metrics))
+        metrics.start_sampler()
+        try:
+            client.get("/items/1")
+            client.get("/slow")
+        finally:
+            metrics.stop_sampler()
+
+        slow = metrics.slow_requests()
+        assert len(slow) == 1
+        entry = slow[0]
+        assert entry["route"] == "/slow"
+        assert entry["duration_ms"] >= 20
+        assert any("asyncio.sleep" in line for line in entry["stack"]["task"])
+
+    def test_slow_log_is_bounded(self):
+        metrics = RequestMetrics(slow_threshold_ms=0, slow_log_size=2)
+        client = TestClient(make_app(metrics))
+        for item_id in range(5):
+            client.get(f"/items/{item_id}")
+        assert metrics.slow_total == 5
+        assert len(metrics.slow_requests()) == 2
+
+    def test_sampler_thread_captures_blocked_code(self):
+        metrics = RequestMetrics(slow_threshold_ms=5, sample_interval=0.002)
+        app = FastAPI()
+        app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+
+        @app.get("/block-loop")
+        async def block_loop():
+            time.sleep(0.05)  # blocks the event loop on purpose
+            return {}
+
+        @app.on_event("startup")
+        async def startup():
+            metrics.start_sampler()
+
+        @app.on_event("shutdown")
+        async def shutdown():
+            metrics.stop_sampler()
+
+        with TestClient(app) as client:
+            client.get("/block-loop")
+
+        stack = metrics.slow_requests()[0]["stack"]
+        assert any("block_loop" in line for line in stack["loop_thread"])
+
+    def test_prometheus_format(self):
+        metrics = RequestMetrics()
+        client = TestClient(make_app(metrics))
+        client.get("/items/1")
+
+        text = metrics.prometheus()
+        assert '# TYPE nova_http_request_duration_seconds histogram' in text
+        assert 'nova_http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",le="+Inf"} 1' in text
+        assert 'nova_http_requests_total{method="GET",route="/items/{item_id}",status="200"} 1' in text
+        assert "nova_http_requests_in_flight 0" in text
+
+
+@pytest.mark.unit
+class TestMetricsEndpoints:
+    """Test /metrics and the admin endpoints on the real app."""
+
+    def test_metrics_endpoint(self, client: TestClient):
+        request_metrics.reset()
+        client.get("/api/v1/agents")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'route="/api/v1/agents"' in response.text
+
+    def test_admin_request_metrics(self, client: TestClient, admin_headers):
+        request_metrics.reset()
+        client.get("/api/v1/agents/core")
+
+        data = client.get("/api/v1/admin/requests", headers=admin_headers).json()
+        routes = {r["route"]: r for r in data["routes"]}
+        assert routes["/api/v1/agents/{agent_id}"]["count"] == 1
+        assert client.get("/api/v1/admin/requests/slow", headers=admin_headers).status_code == 200
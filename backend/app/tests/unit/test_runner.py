@@ -0,0 +1,222 @@
+"""
+🧪 NOVA v3 - Unit Tests for the Wizard command runner
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from app.services.runner import CommandError, CommandRunner, OutputBuffer, parse_command
+from app.services.wizard import WizardService
+from app.services.workflow_plan import InvalidWorkflow
+
+
+def python(code: str) -> list:
+    return [sys.executable, "-c", code]
+
+
+def make_runner(**kwargs) -> CommandRunner:
+    """Runner that may start the test interpreter (and true/echo)."""
+    kwargs.setdefault("allowed", [sys.executable, "true", "echo"])
+    return CommandRunner(**kwargs)
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Orphaned grandchildren may linger as zombies if nothing reaps them
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return stat.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+async def wait_for_file(path, timeout: float = 5.0) -> str:
+    deadline = time.monotonic() + timeout
+    while not (path.exists() and path.read_text()):
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+    return path.read_text()
+
+
+@pytest.mark.unit
+class TestCommandRunner:
+    """Test streaming, failure handling, timeouts and the process pool."""
+
+    def test_parse_command(self):
+        assert parse_command("echo 'a b' c") == ["echo", "a b", "c"]
+        assert parse_command(["ls", "-l"]) == ["ls", "-l"]
+        for bad in ("", [], ["ls", 1]):
+            with pytest.raises(CommandError):
+                parse_command(bad)
+
+    async def test_output_is_streamed_line_by_line(self):
+        output = OutputBuffer()
+        seen = []
+        output.listeners.append(lambda stream, line: seen.append((stream, line, time.monotonic())))
+
+        result = await make_runner().run(python(
+            "import sys, time\n"
+            "print('one', flush=True)\n"
+            "print('oops', file=sys.stderr, flush=True)\n"
+            "time.sleep(0.2)\n"
+            "print('two')"
+        ), output=output)
+
+        assert result["exit_code"] == 0
+        assert sorted((stream, line) for stream, line, _ in seen) == [
+            ("stderr", "oops"), ("stdout", "one"), ("stdout", "two"),
+        ]
+        # The first line arrived while the process was still running
+        first = next(at for stream, line, at in seen if line == "one")
+        last = next(at for stream, line, at in seen if line == "two")
+        assert last - first >= 0.15
+
+    async def test_output_buffer_keeps_last_lines(self):
+        output = OutputBuffer(max_lines=3, max_line_length=5)
+        await make_runner().run(python("for i in range(10): print(str(i) * 8)"), output=output)
+
+        assert [entry["line"] for entry in output.lines] == ["77777…", "88888…", "99999…"]
+        assert output.truncated == 7
+
+    async def test_failing_command_raises(self):
+        runner = make_runner()
+        output = OutputBuffer()
+        with pytest.raises(CommandError, match="exited with code 3"):
+            await runner.run(python("print('partial'); raise SystemExit(3)"), output=output)
+        assert output.lines[0]["line"] == "partial"
+        assert runner.failed == 1
+
+        runner.allowed = frozenset({"/nonexistent/binary"})
+        with pytest.raises(CommandError, match="Cannot start"):
+            await runner.run(["/nonexistent/binary"])
+
+    async def test_environment_and_working_directory(self, tmp_path):
+        runner = make_runner(allowed_env=["NOVA_STEP"], workdirs=[str(tmp_path)])
+        output = OutputBuffer()
+        await runner.run(
+            python("import os; print(os.getcwd()); print(os.environ['NOVA_STEP'])"),
+            env={"NOVA_STEP": "build"}, cwd=str(tmp_path), output=output,
+        )
+        assert [entry["line"] for entry in output.lines] == [str(tmp_path.resolve()), "build"]
+
+        with pytest.raises(CommandError, match="does not exist"):
+            await runner.run(["true"], cwd=str(tmp_path / "missing"))
+
+    async def test_environment_and_working_directory_are_restricted(self, tmp_path):
+        runner = make_runner(allowed_env=["NOVA_STEP"], workdirs=[str(tmp_path / "builds")])
+        (tmp_path / "builds").mkdir()
+        with pytest.raises(CommandError, match="LD_PRELOAD, PATH"):
+            await runner.run(["true"], env={"NOVA_STEP": "x", "PATH": "/tmp", "LD_PRELOAD": "/tmp/x.so"})
+        for cwd in ("/", str(tmp_path), str(tmp_path / "builds" / ".."), str(tmp_path / "builds-other")):
+            with pytest.raises(CommandError, match="not allowed"):
+                await runner.run(["true"], cwd=cwd)
+        # Without configured directories no cwd is accepted at all
+        with pytest.raises(CommandError, match="not allowed"):
+            await make_runner().run(["true"], cwd=str(tmp_path))
+
+    async def test_allowlist(self):
+        runner = CommandRunner(allowed=["echo"])
+        await runner.run("echo ok")
+        for denied in (python("print('no')"), ["/tmp/evil/echo", "ok"], ["./echo", "ok"]):
+            with pytest.raises(CommandError, match="not allowed"):
+                await runner.run(denied)
+
+    async def test_empty_allowlist_denies_everything(self):
+        with pytest.raises(CommandError, match="not allowed"):
+            await CommandRunner().run("echo ok")
+
+    async def test_timeout_kills_process_group(self, tmp_path):
+        pidfile = tmp_path / "child.pid"
+        runner = make_runner(kill_grace=0.5)
+        # The grandchild holds stdout open; only a group kill ends it
+        code = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            f"open({str(pidfile)!r}, 'w').write(str(child.pid))\n"
+            "time.sleep(60)"
+        )
+
+        started = time.monotonic()
+        with pytest.raises(CommandError, match="timed out"):
+            await runner.run(python(code), timeout=0.5)
+        assert time.monotonic() - started < 5
+        assert runner.timed_out == 1
+
+        child = int(pidfile.read_text())
+        await asyncio.sleep(0.1)
+        assert not pid_alive(child)
+
+    async def test_cancellation_terminates_process(self, tmp_path):
+        pidfile = tmp_path / "pid"
+        runner = make_runner(kill_grace=0.5)
+        task = asyncio.create_task(runner.run(python(
+            f"import os, time; open({str(pidfile)!r}, 'w').write(str(os.getpid())); time.sleep(60)"
+        )))
+        pid = int(await wait_for_file(pidfile))
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not pid_alive(pid)
+        assert runner.cancelled == 1
+        assert runner.stats()["running"] == 0
+
+    async def test_pool_limits_concurrent_processes(self):
+        runner = make_runner(max_processes=2)
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, runner.running)
+                await asyncio.sleep(0.01)
+
+        watcher = asyncio.create_task(watch())
+        started = time.monotonic()
+        await asyncio.gather(*(runner.run(python("import time; time.sleep(0.3)")) for _ in range(4)))
+        elapsed = time.monotonic() - started
+        watcher.cancel()
+
+        assert peak == 2
+        assert elapsed >= 0.55
+        assert runner.completed == 4
+
+
+@pytest.mark.unit
+class TestWizardCommandSteps:
+    """Test command steps inside Wizard workflows."""
+
+    async def test_command_step_output_in_results(self):
+        wizard = WizardService(runner=make_runner(), output_lines=2, commands_enabled=True)
+        await wizard.register_workflow("build", [
+            {"id": "compile", "type": "command", "command": python("for i in range(3): print(f'line {i}')")},
+            {"id": "test", "type": "command", "command": python("raise SystemExit(1)"), "depends_on": ["compile"]},
+        ], on_error="continue")
+
+        result = await wizard.execute_workflow("build")
+        compile_step, test_step = result["results"]
+
+        assert compile_step["status"] == "success"
+        assert compile_step["result"]["exit_code"] == 0
+        assert [entry["line"] for entry in compile_step["output"]] == ["line 1", "line 2"]
+        assert compile_step["output_truncated"] == 1
+        assert test_step["status"] == "error"
+        assert "exited with code 1" in test_step["error"]
+
+    async def test_invalid_env_is_rejected_at_registration(self):
+        wizard = WizardService(runner=make_runner(), commands_enabled=True)
+        with pytest.raises(InvalidWorkflow, match="env"):
+            await wizard.register_workflow("bad", [{"type": "command", "command": "true", "env": ["X=1"]}])
+        assert "bad" not in wizard.workflows
+
+    async def test_command_steps_disabled_by_default(self):
+        wizard = WizardService(runner=make_runner())
+        with pytest.raises(InvalidWorkflow, match="disabled"):
+            await wizard.register_workflow("shell", [{"type": "command", "command": "echo hi"}])
+        assert "shell" not in wizard.workflows
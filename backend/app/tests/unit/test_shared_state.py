@@ -0,0 +1,225 @@
+"""
+🧪 NOVA v3 - Unit Tests for the shared Guardian state segment
+"""
+import multiprocessing
+import uuid
+
+import orjson
+import pytest
+
+from app.services.guardian import GuardianService, MetricsUnavailable
+from app.services.shared_state import (
+    SEQ,
+    SEQ_OFFSET,
+    LeaderLock,
+    SeqlockSegment,
+    SharedSampler,
+    unlink_segment,
+)
+
+
+@pytest.fixture
+def segment_name():
+    name = f"nova_test_{uuid.uuid4().hex[:12]}"
+    yield name
+    unlink_segment(name)
+
+
+def _write_many(name: str, count: int) -> None:
+    segment = SeqlockSegment(name, 64 * 1024)
+    for i in range(count):
+        # Payload-Länge variiert, damit ein zerrissener Read auffallen würde
+        segment.write(orjson.dumps({"n": i, "fill": [i] * (i % 500)}))
+    segment.close()
+
+
+@pytest.mark.unit
+class TestSeqlockSegment:
+    """Test the single-writer, lock-free-reader segment."""
+
+    def test_empty_segment_reads_none(self, segment_name):
+        segment = SeqlockSegment(segment_name, 1024)
+        assert segment.read() is None
+        segment.close()
+
+    def test_roundtrip_and_sequence(self, segment_name):
+        writer = SeqlockSegment(segment_name, 1024)
+        reader = SeqlockSegment(segment_name, 1024)
+
+        assert writer.write(b'{"a":1}') == 2
+        assert writer.write(b'{"a":2}') == 4
+        seq, written_at, payload = reader.read()
+        assert seq == 4
+        assert payload == b'{"a":2}'
+        assert written_at > 0
+
+        writer.close()
+        reader.close()
+
+    def test_reader_skips_write_in_progress(self, segment_name):
+        segment = SeqlockSegment(segment_name, 1024)
+        segment.write(b"{}")
+        SEQ.pack_into(segment._buf, SEQ_OFFSET, 3)
+        assert segment.read(retries=3) is None
+
+        # A writer that died mid-write is recovered by the next one
+        assert segment.write(b'{"ok":true}') == 6
+        assert segment.read()[2] == b'{"ok":true}'
+        segment.close()
+
+    def test_payload_too_large(self, segment_name):
+        segment = SeqlockSegment(segment_name, 16)
+        with pytest.raises(ValueError):
+            segment.write(b"x" * 17)
+        segment.close()
+
+    def test_concurrent_writer_process(self, segment_name):
+        reader = SeqlockSegment(segment_name, 64 * 1024)
+        writer = multiprocessing.get_context("fork").Process(target=_write_many, args=(segment_name, 3000))
+        writer.start()
+
+        last = -1
+        while writer.is_alive() or last < 2999:
+            result = reader.read()
+            if result is None:
+                continue
+            data = orjson.loads(result[2])
+            assert data["fill"] == [data["n"]] * (data["n"] % 500)
+            assert data["n"] >= last
+            last = data["n"]
+            if not writer.is_alive() and last == 2999:
+                break
+
+        writer.join()
+        assert writer.exitcode == 0
+        reader.close()
+
+
+@pytest.mark.unit
+class TestLeaderLock:
+    """Test sampler election via flock."""
+
+    def test_only_one_leader(self, tmp_path):
+        path = str(tmp_path / "leader.lock")
+        first, second = LeaderLock(path), LeaderLock(path)
+
+        assert first.try_acquire()
+        assert not second.try_acquire()
+
+        first.release()
+        assert second.try_acquire()
+        second.release()
+
+
+@pytest.mark.unit
+class TestSharedGuardian:
+    """Test Guardian reading the shared snapshot instead of sampling."""
+
+    def test_follower_uses_leader_sample(self, segment_name, tmp_path, monkeypatch):
+        lock_path = str(tmp_path / "leader.lock")
+        leader = GuardianService()
+        leader.shared = SharedSampler(SeqlockSegment(segment_name), LeaderLock(lock_path))
+        follower = GuardianService()
+        follower.shared = SharedSampler(SeqlockSegment(segment_name), LeaderLock(lock_path))
+
+        metrics = {
+            "timestamp": "2026-01-01T00:00:00",
+            "cpu": {"percent": 42.0}, "memory": {"percent": 50.0}, "disk": {"percent": 95.0},
+            "containers": [], "anomalies": [],
+        }
+        monkeypatch.setattr(leader, "_sample_system_metrics", lambda: metrics)
+        leader.metrics_history = [metrics] * 12
+        leader.shared.publish(leader.shared_snapshot())
+
+        def fail():
+            raise AssertionError("follower must not sample the host")
+        monkeypatch.setattr(follower, "_sample_system_metrics", fail)
+
+        assert follower.get_system_metrics()["cpu"]["percent"] == 42.0
+        assert follower.get_alerts()[0]["type"] == "disk"
+        assert follower.predict_resource_usage()["predicted"]["cpu"] == 42.0
+        assert set(follower.get_pressure()) == {"cpu", "memory"}
+
+    def test_follower_never_samples_without_snapshot(self, segment_name, tmp_path, monkeypatch):
+        guardian = GuardianService()
+        guardian.shared = SharedSampler(SeqlockSegment(segment_name), LeaderLock(str(tmp_path / "l")), interval=0.01)
+
+        def fail():
+            raise AssertionError("follower must not sample the host")
+        monkeypatch.setattr(guardian, "_sample_system_metrics", fail)
+
+        assert guardian.latest_metrics() is None
+        with pytest.raises(MetricsUnavailable):
+            guardian.get_system_metrics()
+        assert guardian.metrics_history == []
+
+    def test_stale_snapshot_is_served_marked_stale(self, segment_name, tmp_path, monkeypatch):
+        guardian = GuardianService()
+        guardian.shared = SharedSampler(SeqlockSegment(segment_name), LeaderLock(str(tmp_path / "l")), interval=0.01)
+        history = [{"cpu": {"percent": 1.0}, "memory": {"percent": 2.0}, "disk": {"percent": 3.0}}]
+        guardian.shared.publish({"metrics": {"cpu": {"percent": 1.0}}, "history": history, "pressure": {}})
+        guardian.shared.stale_after = -1
+
+        def fail():
+            raise AssertionError("follower must not sample the host")
+        monkeypatch.setattr(guardian, "_sample_system_metrics", fail)
+
+        metrics = guardian.get_system_metrics()
+        assert metrics["cpu"]["percent"] == 1.0
+        assert metrics["stale"] is True
+        assert guardian._history() == history
+        assert guardian.metrics_history == []
+
+    def test_local_sample_is_served_stale(self, monkeypatch):
+        guardian = GuardianService()
+        guardian.sample_interval = 0.01
+        monkeypatch.setattr(guardian, "_sample_system_metrics", lambda: {"cpu": {"percent": 1.0}})
+        guardian.sample()
+        guardian._latest_at -= 1
+
+        def fail():
+            raise AssertionError("readers must not sample when an old sample exists")
+        monkeypatch.setattr(guardian, "_sample_system_metrics", fail)
+
+        metrics = guardian.get_system_metrics()
+        assert metrics["cpu"]["percent"] == 1.0
+        assert metrics["stale"] is True
+        assert metrics["age_seconds"] >= 1
+
+    def test_metrics_route_returns_503_without_sample(self, client, monkeypatch):
+        from app.services.guardian import guardian
+
+        def unavailable():
+            raise MetricsUnavailable("No Guardian sample published yet")
+        monkeypatch.setattr(guardian, "get_system_metrics", unavailable)
+
+        response = client.get("/api/guardian/metrics")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+
+    def test_last_keeps_snapshot_past_staleness(self, segment_name, tmp_path):
+        sampler = SharedSampler(SeqlockSegment(segment_name), LeaderLock(str(tmp_path / "l")), interval=0.01)
+        assert sampler.last() is None
+
+        sampler.publish({"value": 1})
+        sampler.stale_after = -1
+        assert sampler.read() is None
+        data, age = sampler.last()
+        assert data == {"value": 1}
+        assert age >= 0
+
+    async def test_sampler_loop_elects_and_publishes(self, segment_name, tmp_path):
+        import asyncio
+
+        sampler = SharedSampler(SeqlockSegment(segment_name), LeaderLock(str(tmp_path / "l")), interval=0.01)
+        sampler.start(lambda: {"value": 1})
+        for _ in range(200):
+            if sampler.read() is not None:
+                break
+            await asyncio.sleep(0.01)
+        await sampler.stop()
+
+        assert sampler.read() == {"value": 1}
+        status = sampler.status()
+        assert status["seq"] >= 2
+        assert not status["leader"]
@@ -0,0 +1,169 @@
+"""
+🧪 NOVA v3 - Unit Tests for the Wizard step-result cache
+"""
+import asyncio
+
+import pytest
+
+from app.services.step_cache import StepCache
+from app.services.wizard import WizardService
+from app.services.workflow_plan import InvalidWorkflow
+
+
+class Probe:
+    """Step handler counting its calls; optionally slow or failing."""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, params=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"call": self.calls}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+class TestStepCache:
+    """Test TTL, single-flight and eviction of the step cache."""
+
+    async def test_hit_until_ttl_expires(self):
+        clock = Clock()
+        cache = StepCache(clock=clock)
+        probe = Probe()
+
+        assert await cache.get_or_run("k", 10, probe) == ({"call": 1}, "miss")
+        clock.now += 9
+        assert await cache.get_or_run("k", 10, probe) == ({"call": 1}, "hit")
+        clock.now += 2
+        assert await cache.get_or_run("k", 10, probe) == ({"call": 2}, "miss")
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    async def test_concurrent_calls_are_coalesced(self):
+        cache = StepCache()
+        probe = Probe(delay=0.05)
+
+        results = await asyncio.gather(*(cache.get_or_run("k", 10, probe) for _ in range(5)))
+        assert probe.calls == 1
+        assert sorted(status for _, status in results) == ["coalesced"] * 4 + ["miss"]
+        assert all(value == {"call": 1} for value, _ in results)
+
+    async def test_errors_are_shared_but_not_cached(self):
+        cache = StepCache()
+        probe = Probe(delay=0.02, error=ConnectionError("probe failed"))
+
+        results = await asyncio.gather(*(cache.get_or_run("k", 10, probe) for _ in range(2)), return_exceptions=True)
+        assert [type(r) for r in results] == [ConnectionError, ConnectionError]
+        assert probe.calls == 1
+
+        probe.error = None
+        assert (await cache.get_or_run("k", 10, probe))[1] == "miss"
+        assert cache.stats()["in_flight"] == 0
+
+    async def test_waiter_takes_over_when_leader_is_cancelled(self):
+        cache = StepCache()
+        probe = Probe(delay=0.05)
+        leader = asyncio.create_task(cache.get_or_run("k", 10, probe))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_run("k", 10, probe))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        assert await waiter == ({"call": 2}, "miss")
+        assert leader.cancelled()
+
+    async def test_bounded_lru(self):
+        cache = StepCache(max_entries=2)
+        for key in "abc":
+            await cache.get_or_run(key, 10, Probe())
+        assert cache.stats()["entries"] == 2
+        assert (await cache.get_or_run("a", 10, Probe()))[1] == "miss"
+
+
+@pytest.mark.unit
+class TestCachedSteps:
+    """Test cache_ttl on workflow steps."""
+
+    async def test_identical_steps_share_results_across_workflows(self):
+        wizard = WizardService()
+        probe = Probe()
+        wizard.register_step_type("probe", probe)
+        for name in ("deploy", "nightly"):
+            await wizard.register_workflow(name, [
+                {"id": f"{name}-health", "name": name, "type": "probe", "target": "backend", "cache_ttl": 30},
+                {"id": "uncached", "type": "probe", "target": "backend"},
+            ])
+
+        first = await wizard.execute_workflow("deploy")
+        second = await wizard.execute_workflow("nightly")
+
+        assert probe.calls == 3
+        assert first["results"][0]["cache"] == "miss"
+        assert second["results"][0]["cache"] == "hit"
+        assert "cache" not in second["results"][1]
+        assert second["cache"] == {"hit": 1, "miss": 0, "coalesced": 0}
+        assert (await wizard.get_status())["step_cache"]["hits"] == 1
+
+    async def test_referenced_context_is_part_of_the_key(self):
+        wizard = WizardService()
+        probe = Probe()
+        wizard.register_step_type("probe", probe)
+        await wizard.register_workflow("check", [
+            {"type": "probe", "url": "http://{{ host }}/health", "cache_ttl": 30},
+        ])
+
+        await wizard.execute_workflow("check", {"host": "backend", "unrelated": 1})
+        hit = await wizard.execute_workflow("check", {"host": "backend", "unrelated": 2})
+        miss = await wizard.execute_workflow("check", {"host": "ai-service"})
+
+        assert hit["results"][0]["cache"] == "hit"
+        assert miss["results"][0]["cache"] == "miss"
+        assert probe.calls == 2
+
+    async def test_parallel_identical_steps_run_once(self):
+        wizard = WizardService()
+        probe = Probe(delay=0.05)
+        wizard.register_step_type("probe", probe)
+        await wizard.register_workflow("fanout", [
+            {"id": f"check{i}", "type": "probe", "cache_ttl": 5, "depends_on": []} for i in range(4)
+        ])
+
+        result = await wizard.execute_workflow("fanout")
+        assert probe.calls == 1
+        assert result["cache"] == {"hit": 0, "miss": 1, "coalesced": 3}
+
+    async def test_invalid_ttl(self):
+        wizard = WizardService()
+        for ttl in (0, -5, "soon", True):
+            with pytest.raises(InvalidWorkflow, match="cache_ttl"):
+                await wizard.register_workflow("bad", [{"type": "check", "cache_ttl": ttl}])
+
+    @pytest.mark.parametrize("step", [
+        {"type": "command", "command": "systemctl restart n8n"},
+        {"type": "wait", "duration": 1},
+        {"type": "api_call", "endpoint": "http://n8n:5678/hook", "method": "post"},
+        {"type": "api_call", "endpoint": "http://n8n:5678/hook", "method": "DELETE"},
+    ])
+    async def test_steps_with_side_effects_cannot_be_cached(self, step):
+        wizard = WizardService(commands_enabled=True)
+        with pytest.raises(InvalidWorkflow, match="cache_ttl"):
+            await wizard.register_workflow("bad", [{**step, "cache_ttl": 30}])
+        assert "bad" not in wizard.workflows
+
+    async def test_safe_api_calls_can_be_cached(self):
+        wizard = WizardService()
+        await wizard.register_workflow("status", [
+            {"type": "api_call", "endpoint": "http://n8n:5678/healthz", "method": "get", "cache_ttl": 30},
+        ])
+        assert wizard._plans["status"].steps[0].cache_ttl == 30.0
@@ -1,9 +1,61 @@
 """
 🧪 NOVA v3 - Unit Tests for Wizard Service
 """
+import asyncio
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.services.wizard import RunQueueFull, WizardService, wizard_service
+from app.services.workflow_plan import InvalidWorkflow
+
+
+class StepRecorder:
+    """Generic step handler: sleeps for `duration`, fails on `fail`, records start order."""
+
+    def __init__(self):
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, step):
+        step_id = step.get("id") or step.get("name")
+        self.started.append(step_id)
+        try:
+            await asyncio.sleep(step.get("duration", 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(step_id)
+            raise
+        if step.get("fail"):
+            raise RuntimeError(f"{step_id} failed")
+        return {"id": step_id}
+
+
+def make_wizard() -> tuple:
+    wizard = WizardService()
+    recorder = StepRecorder()
+    wizard.register_step_type("generic", recorder)
+    return wizard, recorder
+
+
+def statuses(result) -> dict:
+    return {r["id"]: r["status"] for r in result["results"]}
+
+
+async def until_finished(run) -> None:
+    while not run.finished:
+        assert await run.wait_for_event(run.seq, 2), "timed out"
+
+
+def wait_for_run(client: TestClient, run_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        run = client.get(f"/api/wizard/runs/{run_id}").json()
+        if run["status"] in ("completed", "failed", "cancelled"):
+            return run
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
 
 @pytest.mark.unit
 class TestWizardService:
@@ -28,13 +80,26 @@ class TestWizardService:
         data = response.json()
         assert isinstance(data, list)
 
+    def test_list_workflows_reflects_changes(self, client: TestClient):
+        """Test the cached workflow list is refreshed after register/execute."""
+        client.get("/api/wizard/workflows")
+        client.post("/api/wizard/workflows", json={"name": "cache_check", "steps": [{"type": "check"}]})
+
+        listed = {w["name"]: w for w in client.get("/api/wizard/workflows").json()}
+        assert listed["cache_check"]["executions"] == 0
+
+        run_id = client.post("/api/wizard/workflows/execute", json={"name": "cache_check"}).json()["run_id"]
+        wait_for_run(client, run_id)
+        listed = {w["name"]: w for w in client.get("/api/wizard/workflows").json()}
+        assert listed["cache_check"]["executions"] == 1
+
     def test_create_workflow(self, client: TestClient):
         """Test creating a new workflow."""
         workflow = {
             "name": "test_workflow",
             "steps": [
                 {"type": "check", "name": "Check status"},
-                {"type": "command", "name": "Run command", "command": "echo test"}
+                {"type": "wait", "name": "Settle", "duration": 0}
             ]
         }
 
@@ -45,6 +110,31 @@ class TestWizardService:
         assert data["name"] == "test_workflow"
         assert len(data["steps"]) == 2
 
+    def test_command_workflows_need_admin_and_flag(self, client: TestClient, admin_headers, monkeypatch):
+        workflow = {"name": "shell", "steps": [{"type": "command", "command": "echo test"}]}
+
+        assert client.post("/api/wizard/workflows", json=workflow).status_code == 401
+        response = client.post("/api/wizard/workflows", json=workflow, headers=admin_headers)
+        assert response.status_code == 400
+        assert "disabled" in response.json()["detail"]
+
+        monkeypatch.setattr(wizard_service, "commands_enabled", True)
+        assert client.post("/api/wizard/workflows", json=workflow, headers=admin_headers).status_code == 200
+
+    def test_command_workflows_cannot_be_replaced_anonymously(self, client: TestClient, admin_headers, monkeypatch):
+        monkeypatch.setattr(wizard_service, "commands_enabled", True)
+        admin_workflow = {"name": "restart", "steps": [{"type": "command", "command": "echo restart"}]}
+        assert client.post("/api/wizard/workflows", json=admin_workflow, headers=admin_headers).status_code == 200
+
+        hijack = {"name": "restart", "steps": [{"type": "api_call", "endpoint": "http://attacker/"}]}
+        assert client.post("/api/wizard/workflows", json=hijack).status_code == 401
+        assert wizard_service.workflows["restart"]["steps"] == admin_workflow["steps"]
+
+        replacement = {"name": "restart", "steps": [{"type": "check"}]}
+        assert client.post("/api/wizard/workflows", json=replacement, headers=admin_headers).status_code == 200
+        # No command steps left: later updates no longer need admin credentials
+        assert client.post("/api/wizard/workflows", json=replacement).status_code == 200
+
     def test_execute_workflow(self, client: TestClient):
         """Test executing a workflow."""
         # Create workflow first
@@ -63,12 +153,23 @@ class TestWizardService:
         }
 
         response = client.post("/api/wizard/workflows/execute", json=execution)
-        assert response.status_code == 200
+        assert response.status_code == 202
 
         data = response.json()
         assert data["workflow"] == "test_exec_workflow"
-        assert "status" in data
-        assert "results" in data
+        assert data["status"] in ("queued", "running")
+        assert response.headers["location"] == data["status_url"]
+
+        run = wait_for_run(client, data["run_id"])
+        assert run["status"] == "completed"
+        assert run["result"]["workflow"] == "test_exec_workflow"
+        assert "results" in run["result"]
+
+    def test_execute_unknown_workflow(self, client: TestClient):
+        """Test executing an unregistered workflow returns 404."""
+        response = client.post("/api/wizard/workflows/execute", json={"name": "missing"})
+        assert response.status_code == 404
+        assert client.get("/api/wizard/runs/unknown").status_code == 404
 
     def test_assist_forge(self, client: TestClient):
         """Test Wizard assistance for FORGE agent."""
@@ -133,3 +234,213 @@ class TestWizardService:
 
         response = client.post("/api/wizard/assist", json=request)
         assert response.status_code == 400
+
+
+@pytest.mark.unit
+class TestWorkflowDag:
+    """Test dependency planning and concurrent execution of workflow steps."""
+
+    async def test_rejects_invalid_graphs(self):
+        wizard = WizardService()
+        with pytest.raises(InvalidWorkflow, match="cycle"):
+            await wizard.register_workflow("cycle", [
+                {"id": "a", "depends_on": ["c"]}, {"id": "b", "depends_on": ["a"]}, {"id": "c", "depends_on": ["b"]},
+            ])
+        with pytest.raises(InvalidWorkflow, match="unknown"):
+            await wizard.register_workflow("unknown", [{"id": "a", "depends_on": "missing"}])
+        with pytest.raises(InvalidWorkflow, match="Duplicate"):
+            await wizard.register_workflow("dup", [{"id": "a"}, {"id": "a"}])
+        assert wizard.workflows == {}
+
+    async def test_steps_without_dependencies_stay_sequential(self):
+        wizard, recorder = make_wizard()
+        workflow = await wizard.register_workflow("legacy", [{"id": "a"}, {"id": "b"}, {"name": "third"}])
+        assert workflow["order"] == ["a", "b", "step3"]
+
+        result = await wizard.execute_workflow("legacy")
+        assert recorder.started == ["a", "b", "third"]
+        assert [r["step"] for r in result["results"]] == [1, 2, 3]
+
+    async def test_wide_workflow_runs_in_critical_path_time(self):
+        wizard, recorder = make_wizard()
+        await wizard.register_workflow("wide", [
+            {"id": "checkout", "duration": 0.05},
+            *({"id": f"check{i}", "duration": 0.1, "depends_on": ["checkout"]} for i in range(6)),
+            {"id": "report", "depends_on": [f"check{i}" for i in range(6)]},
+        ])
+
+        started = time.perf_counter()
+        result = await wizard.execute_workflow("wide")
+        elapsed = time.perf_counter() - started
+
+        assert result["status"] == "completed"
+        assert result["steps_executed"] == 8
+        assert recorder.started[0] == "checkout" and recorder.started[-1] == "report"
+        # critical path 0.15s instead of 0.65s sequentially
+        assert elapsed < 0.4
+
+    async def test_concurrency_limit(self):
+        wizard, _ = make_wizard()
+        await wizard.register_workflow("limited", [
+            {"id": f"s{i}", "duration": 0.05, "depends_on": []} for i in range(4)
+        ], max_concurrency=2)
+
+        started = time.perf_counter()
+        await wizard.execute_workflow("limited")
+        assert time.perf_counter() - started >= 0.1
+
+    async def test_longest_chain_starts_first(self):
+        wizard, recorder = make_wizard()
+        await wizard.register_workflow("ranked", [
+            {"id": "short", "depends_on": []},
+            {"id": "long1", "depends_on": []},
+            {"id": "long2", "depends_on": ["long1"]},
+        ], max_concurrency=1)
+
+        await wizard.execute_workflow("ranked")
+        assert recorder.started[0] == "long1"
+
+    async def test_fail_fast_cancels_running_steps(self):
+        wizard, recorder = make_wizard()
+        await wizard.register_workflow("ff", [
+            {"id": "broken", "fail": True, "depends_on": []},
+            {"id": "slow", "duration": 5, "depends_on": []},
+            {"id": "after", "depends_on": ["slow"]},
+        ])
+
+        result = await wizard.execute_workflow("ff")
+        assert result["status"] == "failed"
+        assert statuses(result) == {"broken": "error", "slow": "cancelled", "after": "skipped"}
+        assert recorder.cancelled == ["slow"]
+
+    async def test_continue_runs_independent_branches(self):
+        wizard, _ = make_wizard()
+        await wizard.register_workflow("cont", [
+            {"id": "broken", "fail": True, "depends_on": []},
+            {"id": "child", "depends_on": ["broken"]},
+            {"id": "other", "duration": 0.01, "depends_on": []},
+            {"id": "other_child", "depends_on": ["other"]},
+        ], on_error="continue")
+
+        result = await wizard.execute_workflow("cont")
+        assert statuses(result) == {
+            "broken": "error", "child": "skipped", "other": "success", "other_child": "success",
+        }
+        assert result["steps_executed"] == 3
+
+    def test_invalid_workflow_is_rejected_by_api(self, client: TestClient):
+        response = client.post("/api/wizard/workflows", json={
+            "name": "bad", "steps": [{"id": "a", "depends_on": ["a"]}],
+        })
+        assert response.status_code == 400
+        assert "cycle" in response.json()["detail"]
+
+
+@pytest.mark.unit
+class TestWorkflowRuns:
+    """Test background runs, cancellation and progress events."""
+
+    async def test_run_returns_immediately_and_records_events(self):
+        wizard, _ = make_wizard()
+        await wizard.register_workflow("bg", [
+            {"id": "a", "duration": 0.05},
+            {"id": "b", "depends_on": ["a"], "fail": True},
+            {"id": "c", "depends_on": ["b"]},
+        ])
+        wizard.start()
+        try:
+            run = wizard.submit_workflow("bg", {"env": "test"})
+            assert run.status == "queued"
+            assert run.id in wizard.runs
+            await until_finished(run)
+        finally:
+            await wizard.stop()
+
+        assert run.status == "failed"
+        assert run.steps_done == run.steps_total == 3
+        assert statuses(run.result) == {"a": "success", "b": "error", "c": "skipped"}
+        events = [(e["event"], e["data"].get("id")) for e in run.events]
+        assert events == [
+            ("run_started", None),
+            ("step_started", "a"), ("step_finished", "a"),
+            ("step_started", "b"), ("step_finished", "b"),
+            ("step_finished", "c"),
+            ("run_finished", None),
+        ]
+        assert [e["seq"] for e in run.events] == list(range(1, 8))
+        assert run.events_after(6)[0]["data"]["status"] == "failed"
+
+    async def test_cancel_running_and_queued_runs(self):
+        wizard, recorder = make_wizard()
+        wizard.run_workers = 1
+        await wizard.register_workflow("slow", [{"id": "sleep", "duration": 10}])
+        wizard.start()
+        try:
+            first = wizard.submit_workflow("slow")
+            second = wizard.submit_workflow("slow")
+            while first.status != "running" or not recorder.started:
+                await asyncio.sleep(0.005)
+
+            wizard.cancel_run(second.id)
+            assert second.status == "cancelled"
+            wizard.cancel_run(first.id)
+            await asyncio.wait_for(first._task, 1)
+        finally:
+            await wizard.stop()
+
+        assert first.status == "cancelled"
+        assert recorder.cancelled == ["sleep"]
+        assert recorder.started == ["sleep"]
+
+    async def test_queue_limit_and_history(self):
+        wizard, _ = make_wizard()
+        wizard.max_queued_runs = 2
+        wizard.max_runs = 2
+        await wizard.register_workflow("quick", [{"id": "a"}])
+        with pytest.raises(RunQueueFull):
+            wizard.submit_workflow("quick")
+
+        wizard.start()
+        wizard.cancel_run(wizard.submit_workflow("quick").id)
+        wizard.submit_workflow("quick")
+        with pytest.raises(RunQueueFull):
+            wizard.submit_workflow("quick")
+        await wizard.stop()
+
+        wizard.start()
+        try:
+            runs = [wizard.submit_workflow("quick") for _ in range(2)]
+            await asyncio.gather(*(until_finished(run) for run in runs))
+        finally:
+            await wizard.stop()
+        # Only the newest finished runs are kept
+        assert list(wizard.runs) == [run.id for run in runs]
+
+    def test_event_stream(self, client: TestClient):
+        client.post("/api/wizard/workflows", json={"name": "streamed", "steps": [
+            {"id": "one", "type": "wait", "duration": 0.05}, {"id": "two", "type": "wait", "duration": 0.01},
+        ]})
+        run_id = client.post("/api/wizard/workflows/execute", json={"name": "streamed"}).json()["run_id"]
+
+        with client.stream("GET", f"/api/wizard/runs/{run_id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = response.read().decode()
+        frames = [frame for frame in body.split("\n\n") if frame]
+        names = [line.split(": ", 1)[1] for frame in frames for line in frame.split("\n") if line.startswith("event:")]
+        assert names == [
+            "run_started", "step_started", "step_finished", "step_started", "step_finished", "run_finished",
+        ]
+        assert '"status":"completed"' in frames[-1]
+
+        # Reconnecting with Last-Event-ID only replays later events
+        with client.stream("GET", f"/api/wizard/runs/{run_id}/events", headers={"Last-Event-ID": "5"}) as response:
+            replay = response.read().decode()
+        assert replay.startswith("id: 6\nevent: run_finished\n")
+
+    def test_cancel_via_api(self, client: TestClient):
+        client.post("/api/wizard/workflows", json={"name": "long", "steps": [{"type": "wait", "duration": 30}]})
+        run_id = client.post("/api/wizard/workflows/execute", json={"name": "long"}).json()["run_id"]
+
+        assert client.post(f"/api/wizard/runs/{run_id}/cancel").status_code == 200
+        assert wait_for_run(client, run_id)["status"] == "cancelled"
+        assert client.post(f"/api/wizard/runs/{run_id}/cancel").status_code == 409
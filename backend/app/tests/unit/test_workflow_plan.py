@@ -0,0 +1,120 @@
+"""
+🧪 NOVA v3 - Unit Tests for compiled workflow plans
+"""
+import dataclasses
+
+import pytest
+
+from app.services.wizard import WizardService
+from app.services.workflow_plan import InvalidWorkflow, Template, compile_templates, render_templates
+
+
+class Echo:
+    """Step handler returning the parameters it was called with."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, params):
+        self.calls.append(params)
+        return params
+
+
+@pytest.mark.unit
+class TestTemplates:
+    """Test pre-parsed {{ path }} placeholders."""
+
+    def test_parse_and_render(self):
+        template = Template("http://{{ host }}:{{service.port}}/health")
+        assert template.refs == {"host", "service.port"}
+        assert template.render({"host": "ai-service", "service": {"port": 8000}}) == "http://ai-service:8000/health"
+
+    def test_single_placeholder_keeps_type(self):
+        assert Template("{{ replicas }}").render({"replicas": 3}) == 3
+        assert Template("n={{ replicas }}").render({"replicas": 3}) == "n=3"
+
+    def test_nested_values(self):
+        compiled = compile_templates({"argv": ["deploy", "{{ env }}"], "static": "plain", "count": 2})
+        assert compiled["static"] == "plain"
+        assert isinstance(compiled["argv"][1], Template)
+        rendered = render_templates(compiled, {"env": "prod"})
+        assert rendered == {"argv": ["deploy", "prod"], "static": "plain", "count": 2}
+
+    def test_missing_variable(self):
+        with pytest.raises(ValueError, match="Unknown template variable 'service.port'"):
+            Template("{{ service.port }}").render({"service": {}})
+
+
+@pytest.mark.unit
+class TestCompiledPlan:
+    """Test schema validation and handler binding at registration."""
+
+    @pytest.mark.parametrize("step, message", [
+        ({"type": "command"}, "command: Field required"),
+        ({"type": "command", "command": "ls", "timeout": -1}, "timeout"),
+        ({"type": "command", "command": "ls", "comand": "typo"}, "comand: Extra inputs"),
+        ({"type": "api_call", "endpoint": "http://n8n/hook", "method": "FETCH"}, "method"),
+        ({"type": "api_call", "endpoint": "http://n8n/hook", "retries": 99}, "retries"),
+        ({"type": "wait", "duration": "soon"}, "duration"),
+        ({"type": "deploy"}, "unknown type 'deploy'"),
+    ])
+    async def test_invalid_steps_are_rejected(self, step, message):
+        wizard = WizardService()
+        with pytest.raises(InvalidWorkflow, match=message):
+            await wizard.register_workflow("bad", [{"id": "s", **step}])
+        assert "bad" not in wizard.workflows
+
+    async def test_defaults_are_resolved_once(self):
+        wizard = WizardService()
+        await wizard.register_workflow("typed", [
+            {"id": "call", "type": "api_call", "endpoint": "http://n8n/hook", "method": "post",
+             "description": "notify"},
+            {"id": "pause", "type": "wait", "duration": "0.5"},
+        ])
+        call, pause = wizard._plans["typed"].steps
+
+        assert call.params == {
+            "endpoint": "http://n8n/hook", "method": "POST", "json": None, "params": None, "headers": None,
+            "timeout": None, "max_response_bytes": None, "retries": None,
+        }
+        assert pause.params == {"duration": 0.5}
+        assert not call.templated
+
+    async def test_plan_is_immutable(self):
+        wizard = WizardService()
+        await wizard.register_workflow("frozen", [{"id": "a", "type": "check"}])
+        plan = wizard._plans["frozen"]
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            plan.on_error = "continue"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            plan.steps[0].handler = None
+        assert not hasattr(plan.steps[0], "__dict__")
+
+    async def test_handlers_are_bound_at_registration(self):
+        wizard = WizardService()
+        first, second = Echo(), Echo()
+        wizard.register_step_type("echo", first)
+        await wizard.register_workflow("bound", [{"id": "a", "type": "echo", "value": 1}])
+        wizard.register_step_type("echo", second)
+
+        await wizard.execute_workflow("bound")
+        assert len(first.calls) == 1
+        assert not second.calls
+
+    async def test_context_is_rendered_per_run(self):
+        wizard = WizardService()
+        echo = Echo()
+        wizard.register_step_type("echo", echo)
+        await wizard.register_workflow("templated", [
+            {"id": "a", "type": "echo", "url": "http://{{ host }}/health", "replicas": "{{ scale.replicas }}"},
+        ])
+        assert wizard._plans["templated"].steps[0].refs == {"host", "scale.replicas"}
+
+        await wizard.execute_workflow("templated", {"host": "backend", "scale": {"replicas": 2}})
+        result = await wizard.execute_workflow("templated", {"host": "n8n"})
+
+        assert echo.calls[0]["url"] == "http://backend/health"
+        assert echo.calls[0]["replicas"] == 2
+        assert result["results"][0]["status"] == "error"
+        assert "scale.replicas" in result["results"][0]["error"]
@@ -0,0 +1,105 @@
+"""
+⏱️ NOVA v3 - Authentication Overhead
+Misst die Zusatzkosten der AuthenticationMiddleware pro Request
+
+    cd backend && python -m benchmarks.auth [--number 20000]
+
+Eine minimale FastAPI-Route wird direkt über ASGI aufgerufen (ohne Server
+und Netzwerk): ohne Middleware, hinter der Middleware ohne Token, mit einem
+Token aus dem Cache (Dashboard-Polling) und mit abgeschaltetem Cache, bei dem
+jeder Request die Signatur prüft.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from app.api.middleware import AuthenticationMiddleware
+from app.services.auth import TokenService
+
+SECRET = "benchmark-secret"
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/tasks")
+    async def list_tasks():
+        return {"ok": True}
+
+    return app
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def run(app, headers, number: int) -> float:
+    statuses = set()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.add(message["status"])
+
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/v1/tasks", "raw_path": b"/api/v1/tasks", "query_string": b"", "root_path": "",
+        "headers": headers, "server": ("bench", 80), "client": ("127.0.0.1", 1234),
+    }
+    started = time.perf_counter()
+    for _ in range(number):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - started
+    assert statuses == {200}, f"unexpected status {statuses}"
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NOVA v3 authentication overhead")
+    parser.add_argument("--number", type=int, default=20000, help="requests per measurement")
+    parser.add_argument("--rounds", type=int, default=3, help="measurements per variant (best is kept)")
+    args = parser.parse_args(argv)
+
+    cached = TokenService(SECRET)
+    uncached = TokenService(SECRET, cache_size=0)
+    # Widerrufsliste als geladen markieren, der Benchmark braucht keine Datenbank
+    for service in (cached, uncached):
+        service.replace_revocations({})
+        service.revocation_ttl = float("inf")
+    token, _ = cached.issue("bench", ["read"])
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    app = make_app()
+    variants = (
+        ("no middleware", app, []),
+        ("anonymous (no token)", AuthenticationMiddleware(app, cached), []),
+        ("token, cached", AuthenticationMiddleware(app, cached), headers),
+        ("token, uncached", AuthenticationMiddleware(app, uncached), headers),
+    )
+
+    async def measure():
+        results = {name: float("inf") for name, _, _ in variants}
+        for round_no in range(args.rounds + 1):
+            # Varianten abwechselnd messen, damit Drift (Takt, GC) alle gleich trifft
+            for name, wrapped, hdrs in variants:
+                elapsed = await run(wrapped, hdrs, args.number)
+                if round_no:  # Runde 0 wärmt auf
+                    results[name] = min(results[name], elapsed)
+        return results
+
+    results = asyncio.run(measure())
+    baseline = results["no middleware"] / args.number * 1e6
+    for name, elapsed in results.items():
+        per_request = elapsed / args.number * 1e6
+        print(f"{name:24} {per_request:8.2f} µs/request  (+{per_request - baseline:.2f})")
+
+    for name, service in (("verify() cache hit", cached), ("verify() signature", uncached)):
+        started = time.perf_counter()
+        for _ in range(args.number):
+            service.verify(token)
+        print(f"{name:24} {(time.perf_counter() - started) / args.number * 1e6:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+⏱️ NOVA v3 - Request Metrics Overhead
+Misst die Zusatzkosten der RequestMetricsMiddleware pro Request
+
+    cd backend && python -m benchmarks.request_metrics [--number 100000]
+
+Verglichen wird eine minimale ASGI-App direkt und hinter der Middleware,
+ohne Server und Netzwerk, damit nur der Middleware-Anteil übrig bleibt.
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.api.middleware import RequestMetricsMiddleware
+from app.services.request_metrics import RequestMetrics
+
+ROUTE = SimpleNamespace(path="/api/v1/tasks/{task_id}")
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b'{"ok":true}'}
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = ROUTE
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, number: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/tasks/42"}
+    started = time.perf_counter()
+    for _ in range(number):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NOVA v3 request metrics overhead")
+    parser.add_argument("--number", type=int, default=100000, help="requests per measurement")
+    args = parser.parse_args(argv)
+
+    metrics = RequestMetrics()
+    wrapped = RequestMetricsMiddleware(endpoint, metrics)
+
+    async def measure():
+        bare = min([await run(endpoint, args.number) for _ in range(3)])
+        instrumented = min([await run(wrapped, args.number) for _ in range(3)])
+        return bare, instrumented
+
+    bare, instrumented = asyncio.run(measure())
+    overhead = (instrumented - bare) / args.number * 1e6
+    record = metrics.begin("GET", "/x")
+    started = time.perf_counter()
+    for _ in range(args.number):
+        metrics.end(record, ROUTE.path, 200, 11)
+        metrics.in_flight[id(record)] = record
+    record_cost = (time.perf_counter() - started) / args.number * 1e6
+
+    print(f"bare ASGI app          {bare / args.number * 1e6:8.2f} µs/request")
+    print(f"with metrics           {instrumented / args.number * 1e6:8.2f} µs/request")
+    print(f"middleware overhead    {overhead:8.2f} µs/request")
+    print(f"  of which end()       {record_cost:8.2f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+⏱️ NOVA v3 - Serialization Microbenchmark
+Vergleicht die Kosten pro Request für die Antwort-Serialisierung
+
+    cd backend && python -m benchmarks.serialization [--number 2000]
+
+"before" bildet den alten Pfad nach (Dicts bauen, response_model validieren,
+jsonable_encoder, json.dumps via JSONResponse), "after" den aktuellen
+(orjson bzw. vorberechnete Bytes aus Registry und Wizard-Cache).
+"""
+import argparse
+import asyncio
+import json
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from app.api.routes.tasks import TaskResponse, _task_response
+from app.seed import AGENTS
+from app.services.agent_registry import AgentRegistry
+from app.services.wizard import WizardService
+
+
+class _Rows:
+    """Stands in for an AsyncSession returning fixed agent rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def scalars(self, stmt):
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+def _render_validated(adapter: TypeAdapter, content) -> bytes:
+    """What FastAPI does for a plain return value with a response_model"""
+    validated = adapter.validate_python(content)
+    return JSONResponse(jsonable_encoder(adapter.dump_python(validated, mode="json"))).body
+
+
+def agents_case():
+    registry = AgentRegistry()
+    rows = [SimpleNamespace(**agent) for agent in AGENTS]
+    snapshot = asyncio.run(registry.load(_Rows(rows)))
+    adapter = TypeAdapter(List[Dict])
+
+    def before():
+        # old list_agents: eight-field dicts rebuilt on every call
+        return _render_validated(adapter, [registry._list_item(registry._to_dict(row)) for row in rows])
+
+    def after():
+        return Response(content=snapshot.list_body, media_type="application/json").body
+
+    return "GET /agents", before, after
+
+
+def tasks_case(count: int = 100):
+    now = datetime.utcnow()
+    tasks = [
+        SimpleNamespace(
+            task_id=f"task-{i}", agent_id="forge", action="build", payload={"ref": "main", "priority": i % 5},
+            status="completed", created_at=now - timedelta(minutes=i), updated_at=now, result={"duration_ms": i},
+        )
+        for i in range(count)
+    ]
+    adapter = TypeAdapter(List[TaskResponse])
+
+    def before():
+        return _render_validated(adapter, [_task_response(t) for t in tasks])
+
+    def after():
+        return ORJSONResponse([_task_response(t) for t in tasks]).body
+
+    return f"GET /tasks ({count} rows)", before, after
+
+
+def workflows_case(count: int = 50):
+    service = WizardService()
+    loop = asyncio.new_event_loop()
+    for i in range(count):
+        loop.run_until_complete(service.register_workflow(f"workflow-{i}", [{"type": "check", "name": "ping"}] * 5))
+
+    def before():
+        return JSONResponse(jsonable_encoder(loop.run_until_complete(service.list_workflows()))).body
+
+    def after():
+        body = loop.run_until_complete(service.list_workflows_body())
+        return Response(content=body, media_type="application/json").body
+
+    return f"GET /api/wizard/workflows ({count})", before, after
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NOVA v3 serialization microbenchmark")
+    parser.add_argument("--number", type=int, default=2000, help="calls per measurement")
+    args = parser.parse_args(argv)
+
+    print(f"{'endpoint':<36} {'before µs':>10} {'after µs':>10} {'speedup':>8}")
+    for name, before, after in (agents_case(), tasks_case(), workflows_case()):
+        # both paths must produce the same document
+        assert json.loads(before()) == json.loads(after()), name
+        t_before = min(timeit.repeat(before, number=args.number, repeat=3)) / args.number * 1e6
+        t_after = min(timeit.repeat(after, number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{name:<36} {t_before:>10.1f} {t_after:>10.1f} {t_before / t_after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
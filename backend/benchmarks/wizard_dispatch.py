@@ -0,0 +1,132 @@
+"""
+⏱️ NOVA v3 - Wizard Step Dispatch
+Misst die Kosten pro Schritt zwischen Planer und Handler
+
+    cd backend && python -m benchmarks.wizard_dispatch [--number 20000]
+
+"before" bildet den alten Pfad nach (if/elif über step["type"], Defaults per
+dict.get und Typprüfungen bei jeder Ausführung), "after" den kompilierten Plan
+(gebundener Handler, Parameter beim Registrieren validiert; bei Templates
+zusätzlich das Einsetzen der Kontextwerte). Die Handler selbst tun nichts,
+gemessen wird nur der Weg dorthin. Zum Schluss die Kosten pro Schritt für
+einen ganzen Workflow über execute_workflow (mit Task pro Schritt).
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from app.services.wizard import WizardService
+from app.services.workflow_plan import ApiCallStep, CheckStep, CommandStep, StepType, WaitStep, compile_plan
+
+STEPS = [
+    {"id": "build", "type": "command", "command": ["make", "build"], "timeout": 600, "env": {"CI": "1"}},
+    {"id": "notify", "type": "api_call", "method": "post", "endpoint": "http://n8n:5678/webhook/deploy",
+     "json": {"stage": "build"}, "headers": {"X-Source": "wizard"}},
+    {"id": "health", "type": "check", "check_type": "health"},
+    {"id": "settle", "type": "wait", "duration": 0},
+]
+TEMPLATED = [
+    {"id": "build", "type": "command", "command": ["make", "{{ target }}"], "env": {"CI": "1"}},
+    {"id": "notify", "type": "api_call", "method": "post", "endpoint": "http://{{ hooks.host }}/webhook/deploy",
+     "json": {"stage": "{{ target }}"}},
+    {"id": "health", "type": "check", "check_type": "health"},
+    {"id": "settle", "type": "wait", "duration": 0},
+]
+CONTEXT = {"target": "build", "hooks": {"host": "n8n:5678"}}
+
+
+async def noop(params: Dict) -> Dict:
+    return params
+
+
+async def legacy_command(command, timeout, env, cwd):
+    return None
+
+
+async def legacy_api_call(method, endpoint, json, params, headers, timeout, max_response_bytes, retries):
+    return None
+
+
+async def legacy_execute_step(step: Dict, context: Dict):
+    """Alter _execute_step samt der Feldzugriffe der Handler"""
+    step_type = step.get("type", "generic")
+    if step_type == "command":
+        env = step.get("env")
+        if env is not None and not isinstance(env, dict):
+            raise ValueError("env must be an object")
+        return await legacy_command(
+            step.get("command", ""), step.get("timeout"),
+            {str(key): str(value) for key, value in env.items()} if env else None, step.get("cwd"),
+        )
+    elif step_type == "api_call":
+        for field in ("params", "headers"):
+            if step.get(field) is not None and not isinstance(step[field], dict):
+                raise ValueError(f"{field} must be an object")
+        return await legacy_api_call(
+            step.get("method", "GET").upper(), step.get("endpoint", ""), step.get("json"), step.get("params"),
+            step.get("headers"), step.get("timeout"), step.get("max_response_bytes"), step.get("retries"),
+        )
+    elif step_type == "check":
+        return {"check_type": step.get("check_type", "status"), "passed": True}
+    elif step_type == "wait":
+        return {"waited": step.get("duration", 1)}
+    else:
+        return {"type": step_type, "executed": True}
+
+
+def compiled_steps(steps):
+    step_types = {name: StepType(name, noop, schema) for name, schema in (
+        ("command", CommandStep), ("api_call", ApiCallStep), ("check", CheckStep), ("wait", WaitStep),
+    )}
+    return compile_plan(steps, step_types, max_concurrency=8, on_error="fail_fast").steps
+
+
+async def per_step(call, steps, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        for step in steps:
+            await call(step)
+    return (time.perf_counter() - started) / (number * len(steps)) * 1e6
+
+
+async def workflow_per_step(number: int, width: int = 50) -> float:
+    wizard = WizardService()
+    await wizard.register_workflow("bench", [{"id": f"s{i}", "type": "check", "depends_on": []} for i in range(width)])
+    started = time.perf_counter()
+    for _ in range(number):
+        await wizard.execute_workflow("bench")
+    return (time.perf_counter() - started) / (number * width) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NOVA v3 Wizard step dispatch")
+    parser.add_argument("--number", type=int, default=20000, help="passes over the step mix per measurement")
+    parser.add_argument("--rounds", type=int, default=3, help="measurements per variant (best is kept)")
+    args = parser.parse_args(argv)
+
+    static, templated = compiled_steps(STEPS), compiled_steps(TEMPLATED)
+    variants = (
+        ("before (if/elif, dict.get)", lambda step: legacy_execute_step(step, CONTEXT), STEPS),
+        ("after (compiled)", lambda step: step.handler(step.render(CONTEXT)), static),
+        ("after (compiled, templates)", lambda step: step.handler(step.render(CONTEXT)), templated),
+    )
+
+    async def measure():
+        results = {name: float("inf") for name, _, _ in variants}
+        for round_no in range(args.rounds + 1):
+            # Varianten abwechselnd messen, damit Drift (Takt, GC) alle gleich trifft
+            for name, call, steps in variants:
+                elapsed = await per_step(call, steps, args.number)
+                if round_no:  # Runde 0 wärmt auf
+                    results[name] = min(results[name], elapsed)
+        return results, await workflow_per_step(max(1, args.number // 100))
+
+    results, workflow = asyncio.run(measure())
+    for name, elapsed in results.items():
+        print(f"{name:30} {elapsed:8.2f} µs/step")
+    print(f"{'execute_workflow (50 steps)':30} {workflow:8.2f} µs/step")
+
+
+if __name__ == "__main__":
+    main()
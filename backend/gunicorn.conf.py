@@ -0,0 +1,25 @@
+"""
+NOVA v3 - Gunicorn-Konfiguration für den Multi-Worker-Betrieb
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Die Worker teilen sich den Guardian-Zustand über ein Shared-Memory-Segment;
+nur ein gewählter Worker sampelt den Host (siehe app/services/shared_state.py).
+"""
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+forwarded_allow_ips = "*"
+
+# Wird vom Master an alle Worker vererbt
+os.environ.setdefault("GUARDIAN_SHARED_STATE", "true")
+
+
+def on_exit(server):
+    """Segment erst entfernen, wenn alle Worker beendet sind"""
+    from app.config import get_settings
+    from app.services.shared_state import unlink_segment
+
+    unlink_segment(get_settings().GUARDIAN_SHM_NAME)
@@ -1,13 +1,21 @@
 import { useQuery } from '@tanstack/react-query'
 import { apiClient } from '../services/apiClient'
+import { useLiveChannel } from '../services/liveChannel'
 
 export default function Dashboard() {
+  const live = useLiveChannel(['guardian', 'agents'])
+
+  // Polling only as a fallback while the live channel is unavailable
   const { data: health, isLoading } = useQuery({
     queryKey: ['health'],
     queryFn: () => apiClient.get('/health'),
-    refetchInterval: 5000,
+    refetchInterval: live.connected ? false : 5000,
   })
 
+  const system = live.guardian
+    ? { cpu_percent: live.guardian.cpu, memory_percent: live.guardian.memory, disk_percent: live.guardian.disk }
+    : health?.data?.system
+
   const { data: agents } = useQuery({
     queryKey: ['agents'],
     queryFn: () => apiClient.get('/api/v1/agents'),
@@ -52,7 +60,7 @@ export default function Dashboard() {
               <div>
                 <p className="text-sm text-gray-400">CPU Usage</p>
                 <p className="mt-2 text-2xl font-bold text-white">
-                  {health?.data?.system?.cpu_percent?.toFixed(1)}%
+                  {system?.cpu_percent?.toFixed(1)}%
                 </p>
               </div>
               <div className="text-4xl">💻</div>
@@ -64,7 +72,7 @@ export default function Dashboard() {
               <div>
                 <p className="text-sm text-gray-400">Memory Usage</p>
                 <p className="mt-2 text-2xl font-bold text-white">
-                  {health?.data?.system?.memory_percent?.toFixed(1)}%
+                  {system?.memory_percent?.toFixed(1)}%
                 </p>
               </div>
               <div className="text-4xl">🧠</div>
@@ -76,7 +84,7 @@ export default function Dashboard() {
               <div>
                 <p className="text-sm text-gray-400">Disk Usage</p>
                 <p className="mt-2 text-2xl font-bold text-white">
-                  {health?.data?.system?.disk_percent?.toFixed(1)}%
+                  {system?.disk_percent?.toFixed(1)}%
                 </p>
               </div>
               <div className="text-4xl">💾</div>
@@ -98,12 +106,12 @@ export default function Dashboard() {
                 <span className="text-4xl">{agent.emoji}</span>
                 <span
                   className={`px-2 py-1 text-xs font-medium rounded ${
-                    agent.enabled
+                    (live.agents?.[agent.id]?.enabled ?? agent.enabled)
                       ? 'bg-green-500/20 text-green-400'
                       : 'bg-red-500/20 text-red-400'
                   }`}
                 >
-                  {agent.enabled ? 'Online' : 'Offline'}
+                  {(live.agents?.[agent.id]?.enabled ?? agent.enabled) ? 'Online' : 'Offline'}
                 </span>
               </div>
               <h3 className="text-lg font-bold text-white">{agent.name}</h3>
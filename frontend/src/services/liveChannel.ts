@@ -0,0 +1,76 @@
+import { useEffect, useState } from 'react'
+
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
+const LIVE_URL = `${API_BASE_URL.replace(/^http/, 'ws')}/api/v1/ws/live`
+
+export type LiveTopic = 'guardian' | 'alerts' | 'tasks' | 'agents'
+type LiveState = Partial<Record<LiveTopic, any>>
+
+type LiveFrame =
+  | { type: 'full'; topic: LiveTopic; seq: number; data: any }
+  | { type: 'delta'; topic: LiveTopic; seq: number; patch: any }
+  | { type: 'error'; detail: string }
+
+// JSON Merge Patch (RFC 7386): null removes a key, objects merge recursively
+function applyPatch(target: any, patch: any): any {
+  if (patch === null || typeof patch !== 'object' || Array.isArray(patch)) {
+    return patch
+  }
+  const result = target && typeof target === 'object' && !Array.isArray(target) ? { ...target } : {}
+  for (const [key, value] of Object.entries(patch)) {
+    if (value === null) {
+      delete result[key]
+    } else {
+      result[key] = applyPatch(result[key], value)
+    }
+  }
+  return result
+}
+
+export function useLiveChannel(topics: LiveTopic[]) {
+  const [state, setState] = useState<LiveState>({})
+  const [connected, setConnected] = useState(false)
+  const topicKey = topics.join(',')
+
+  useEffect(() => {
+    let socket: WebSocket | null = null
+    let retry: ReturnType<typeof setTimeout> | undefined
+    let attempt = 0
+    let closed = false
+
+    const connect = () => {
+      // Browsers cannot send an Authorization header on WebSockets
+      const token = localStorage.getItem('token')
+      const auth = token ? `&token=${encodeURIComponent(token)}` : ''
+      socket = new WebSocket(`${LIVE_URL}?topics=${topicKey}${auth}`)
+      socket.onopen = () => {
+        attempt = 0
+        setConnected(true)
+      }
+      socket.onmessage = (event) => {
+        const frame: LiveFrame = JSON.parse(event.data)
+        if (frame.type === 'full') {
+          setState((prev) => ({ ...prev, [frame.topic]: frame.data }))
+        } else if (frame.type === 'delta') {
+          setState((prev) => ({ ...prev, [frame.topic]: applyPatch(prev[frame.topic], frame.patch) }))
+        }
+      }
+      socket.onclose = () => {
+        setConnected(false)
+        if (!closed) {
+          // Reconnect with backoff; the server sends full frames again
+          retry = setTimeout(connect, Math.min(1000 * 2 ** attempt++, 30000))
+        }
+      }
+    }
+
+    connect()
+    return () => {
+      closed = true
+      clearTimeout(retry)
+      socket?.close()
+    }
+  }, [topicKey])
+
+  return { ...state, connected }
+}